@@ -1,26 +1,10 @@
 # arde.py
 
 from scene import Scene
-from pyglet.text import Label
-from pyglet import shapes
-import pyglet
-import os
-import random
+from crt import CRTFrame
+from console_view import ConsoleView
 
 
-# -----------------------
-# CONFIGURACIÓN DE FUENTE
-# -----------------------
-
-FONT_FILE = os.path.join(
-    os.path.dirname(__file__),
-    "assets",
-    "fonts",
-    "Glass_TTY_VT220.ttf"
-)
-
-FONT_NAME = "Glass TTY VT220"
-
 COLOR_PRESETS = {
     "green":  (0, 255, 140, 255),
     "amber":  (255, 170, 60, 255),
@@ -28,8 +12,6 @@ COLOR_PRESETS = {
     "purple": (200, 120, 255, 255),
 }
 
-SCREEN_MARGIN = 80
-
 
 
 class Arde(Scene):
@@ -37,14 +19,19 @@ class Arde(Scene):
     ARDE — Archivum Romanum de Disturbia Extraordinaria
     """
 
+    # Consola quieta: sólo se redibuja con teclas, cursor o cambios de texto
+    animated = False
+    # Rehace su estado en on_enter: al volver a la shell se descarga
+    unload_on_exit = True
+
     def __init__(self, engine):
         super().__init__(engine)
 
-        self.font_name = "Courier New"
+        self.font_name = engine.fonts.face()
         self.color_key = "green"
 
-        # Texto principal
-        self.label = None
+        # Consola persistente (buffer + prompt, separados por una línea)
+        self.console = ConsoleView(engine.screen, self.font_name, 14, COLOR_PRESETS[self.color_key], gap_lines=1)
 
         # Estados internos
         self.mode = "console"         # "console", "run_case", "photo"
@@ -60,15 +47,16 @@ class Arde(Scene):
         self.prompt = r"C:\VaticanTerminal 1982\ARDE>"
         self.current_input = ""
         self.cursor_visible = True
-        pyglet.clock.schedule_interval(self._toggle_cursor, 0.5)
 
         self._text_dirty = True
         self._last_size = (0, 0)
 
+        # Fondo + bisel del CRT (cacheado por tamaño de ventana)
+        self.crt_frame = CRTFrame(engine.screen)
+
         # Casos y fotos
         self.current_entry = None
-        self.loaded_images = {}
-        self.image_paths = {}
+        self.image_names = {}
         self.photo_texts = {}
 
         # Reconocimiento exacto de casos
@@ -88,7 +76,6 @@ class Arde(Scene):
     #              CICLO DE VIDA DE LA ESCENA
     # ------------------------------------------------------
     def on_enter(self, **kwargs):
-        self._load_custom_font()
         self._init_console_header()
         self.mode = "console"
         self.current_input = ""
@@ -97,17 +84,17 @@ class Arde(Scene):
         self._text_dirty = True
         self.current_entry = None
 
+        # Parpadeo del cursor sólo mientras la escena está activa
+        self.cursor_visible = True
+        self.schedule_interval(self._toggle_cursor, 0.5)
 
-    # ------------------------------------------------------
-    #                   FUENTE VT220
-    # ------------------------------------------------------
-    def _load_custom_font(self):
-        if os.path.exists(FONT_FILE):
-            try:
-                pyglet.font.add_file(FONT_FILE)
-                self.font_name = FONT_NAME
-            except:
-                pass
+    def on_exit(self):
+        self.unschedule(self._toggle_cursor)
+
+    def unload(self):
+        super().unload()
+        self.console.delete()
+        self.crt_frame.delete()
 
 
     # ------------------------------------------------------
@@ -213,12 +200,12 @@ class Arde(Scene):
     #                   FOTOS
     # ------------------------------------------------------
     def _setup_images(self):
-        base = os.path.join(os.path.dirname(__file__), "assets", "images")
-        self.image_paths = {
-            1: os.path.join(base, "03.png"),
-            2: os.path.join(base, "01.png"),
-            3: os.path.join(base, "02.png"),
-            4: os.path.join(base, "04.png"),
+        # Se cargan en segundo plano con engine.textures al pedirlas
+        self.image_names = {
+            1: "03.png",
+            2: "01.png",
+            3: "02.png",
+            4: "04.png",
         }
 
         self.photo_texts = {
@@ -238,86 +225,50 @@ class Arde(Scene):
         self._recalc_console_scroll()
 
 
-    # ------------------------------------------------------
-    #              CÁLCULO DE ÁREA CRT 4:3
-    # ------------------------------------------------------
-    def _get_screen_bounds(self):
-        w = self.engine.window.width
-        h = self.engine.window.height
-
-        w2 = w - SCREEN_MARGIN * 2
-        h2 = h - SCREEN_MARGIN * 2
-
-        if w2 / h2 > 4 / 3:
-            ih = h2
-            iw = int(ih * 4 / 3)
-        else:
-            iw = w2
-            ih = int(w2 * 3 / 4)
-
-        x = (w - iw) // 2
-        y = (h - ih) // 2
-        return x, y, iw, ih
-
-
     # ------------------------------------------------------
     #              TEXTO VISIBLE SEGÚN MODO
     # ------------------------------------------------------
-    def _get_full_text(self):
-        cursor = "|" if self.cursor_visible else " "
-        prompt_line = f"{self.prompt}{self.current_input}{cursor}"
-
+    def _get_visible_buffer(self):
+        """Devuelve (líneas del modo actual, primera línea visible)."""
         if self.mode == "console":
             start = max(0, min(self.scroll, max(0, len(self.console_lines) - self.max_lines)))
-            visible = self.console_lines[start:start + self.max_lines]
-            visible.append("")
-            visible.append(prompt_line)
-            return "\n".join(visible)
+            return self.console_lines, start
 
         if self.mode == "run_case":
             start = max(0, min(self.case_scroll, max(0, len(self.case_lines) - self.max_lines)))
-            visible = self.case_lines[start:start + self.max_lines]
-            visible.append("")
-            visible.append(prompt_line)
-            return "\n".join(visible)
+            return self.case_lines, start
 
         if self.mode == "photo":
             txt = self.photo_texts.get(self.current_entry, "[No photo available]")
-            visible = txt.splitlines()[:self.max_lines]
-            visible.append("")
-            visible.append(prompt_line)
-            return "\n".join(visible)
+            return txt.splitlines()[:self.max_lines], 0
 
-        return prompt_line
+        return [], 0
 
 
     # ------------------------------------------------------
-    #                LABEL / RENDER
+    #                CONSOLA / RENDER
     # ------------------------------------------------------
     def _make_label(self):
-        if not self.engine.window:
+        if not self.engine.screen:
             return
 
-        w, h = self.engine.window.width, self.engine.window.height
+        w, h = self.engine.screen.width, self.engine.screen.height
         if (w, h) == self._last_size and not self._text_dirty:
             return
 
         self._last_size = (w, h)
         self._text_dirty = False
 
-        x, y, iw, ih = self._get_screen_bounds()
-        txt = self._get_full_text()
-
-        self.label = Label(
-            txt,
-            x=x + 40,
-            y=y + ih - 60,
-            width=iw - 80,
-            multiline=True,
-            font_name=self.font_name,
-            font_size=14,
-            color=COLOR_PRESETS[self.color_key]
-        )
+        x, y, iw, ih = self.crt_frame.bounds
+        lines, start = self._get_visible_buffer()
+
+        # La consola sólo sube las celdas que cambian; el scroll elige la primera línea visible
+        self.console.set_style(font_name=self.font_name, color=COLOR_PRESETS[self.color_key])
+        self.console.set_geometry(x + 40, y + ih - 60, iw - 80, self.max_lines)
+        self.console.sync_lines(lines)
+        self.console.scroll_to_line(start)
+        self.console.set_input(f"{self.prompt}{self.current_input}")
+        self.console.set_cursor_visible(self.cursor_visible)
 
 
     def on_update(self, dt):
@@ -328,108 +279,66 @@ class Arde(Scene):
     #                     DRAW
     # ------------------------------------------------------
     def on_draw(self):
-        if not self.engine.window:
+        if not self.engine.screen:
             return
 
         self._make_label()
 
-        x, y, iw, ih = self._get_screen_bounds()
+        renderer = self.engine.renderer
+        x, y, iw, ih = self.crt_frame.bounds
 
-        # Fondo CRT
-        bg = shapes.Rectangle(x, y, iw, ih, color=(5, 5, 5))
-        bg.draw()
-
-        # Bordes CRT
-        opacity = 120
-        band = 20
-        for dx, dy, bw, bh in (
-            (x, y + ih - band, iw, band),
-            (x, y, iw, band),
-            (x, y, band, ih),
-            (x + iw - band, y, band, ih),
-        ):
-            v = shapes.Rectangle(dx, dy, bw, bh, color=(0, 0, 0))
-            v.opacity = opacity
-            v.draw()
-
-        # Scanlines
-        self._draw_scanlines(x, y, iw, ih)
+        # Fondo + bordes CRT
+        self.crt_frame.draw(renderer)
 
         # Modo PHOTO: dibujar imagen centrada
         if self.mode == "photo":
-            self._ensure_photo_loaded(self.current_entry)
-            self._draw_photo(x, y, iw, ih)
-
-        # Glow del texto
-        if self.label:
-            self._draw_glow(self.label)
-
+            self._draw_photo(renderer, x, y, iw, ih)
 
-    def _draw_scanlines(self, x, y, w, h):
-        color = (0, 30, 0)
-        base_alpha = 55
-        flick = random.uniform(-1, 1)
-        for yy in range(y, y + h, 2):
-            line = shapes.Rectangle(x, yy + flick, w, 1, color=color)
-            line.opacity = base_alpha
-            line.draw()
-
-
-    def _draw_glow(self, label):
-        ox, oy = label.x, label.y
-        r, g, b, a = label.color
-        glow = (r, g, b, int(0.35 * 255))
-
-        for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
-            label.color = glow
-            label.x = ox + dx
-            label.y = oy + dy
-            label.draw()
-
-        label.color = (r,g,b,a)
-        label.x = ox
-        label.y = oy
-        label.draw()
+        # Glow del texto: un único draw, el halo lo pone el renderer en GPU
+        with renderer.glow():
+            self.console.draw(renderer)
 
 
     # ------------------------------------------------------
     #                        FOTO
     # ------------------------------------------------------
-    def _ensure_photo_loaded(self, entry):
-        if entry in self.loaded_images:
+    def _draw_photo(self, renderer, x, y, iw, ih):
+        name = self.image_names.get(self.current_entry)
+        if not name:
             return
-        path = self.image_paths.get(entry)
-        if path and os.path.exists(path):
-            img = pyglet.image.load(path)
-            self.loaded_images[entry] = pyglet.sprite.Sprite(img)
-
-
-    def _draw_photo(self, x, y, iw, ih):
-        spr = self.loaded_images.get(self.current_entry)
-        if not spr:
+        # Mientras carga se dibuja el placeholder al tamaño final
+        handle = self.engine.textures.get(name)
+        if handle.missing:
             return
 
+        image = handle.image
         max_w = iw * 0.6
         max_h = ih * 0.4
 
-        scale_w = max_w / spr.width
-        scale_h = max_h / spr.height
+        scale_w = max_w / handle.width
+        scale_h = max_h / handle.height
         scale = min(1.0, scale_w, scale_h)
-
-        spr.update(
-            x=x + (iw - spr.width * scale) / 2,
-            y=y + (ih - spr.height * scale) / 2,
-            scale=scale
+        w = handle.width * scale
+        h = handle.height * scale
+
+        renderer.sprite(
+            self.draw_key("photo"),
+            image,
+            x + (iw - w) / 2,
+            y + (ih - h) / 2,
+            scale_x=w / image.width,
+            scale_y=h / image.height,
         )
-        spr.draw()
 
 
     # ------------------------------------------------------
     #                     CURSOR
     # ------------------------------------------------------
     def _toggle_cursor(self, dt):
+        # Parpadeo: la consola sólo cambia el atributo de la celda del cursor
         self.cursor_visible = not self.cursor_visible
-        self._text_dirty = True
+        self.console.set_cursor_visible(self.cursor_visible)
+        self.invalidate()
 
 
     # ------------------------------------------------------
@@ -1,11 +1,254 @@
+import io
+import json
+import mmap
 import os
+import struct
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 IMAGES_DIR = os.path.join(ASSETS_DIR, 'images')
 VIDEOS_DIR = os.path.join(ASSETS_DIR, 'videos')
 AUDIO_DIR = os.path.join(ASSETS_DIR, 'audio')
 FONTS_DIR = os.path.join(ASSETS_DIR, 'fonts')
+CACHE_DIR = os.path.join(ASSETS_DIR, 'cache')
+BAKED_DIR = os.path.join(ASSETS_DIR, 'baked')
+MANIFEST_FILE = os.path.join(BAKED_DIR, 'manifest.json')
+PACK_FILE = os.path.join(ASSETS_DIR, 'assets.pak')
+
+# Imagen horneada (bake.py): cabecera + niveles de mipmap RGBA de abajo arriba
+BAKED_MAGIC = b'VTEX'
+BAKED_HEADER = struct.Struct('<4sIII')  # magic, ancho, alto, niveles
+BAKED_EXTENSION = '.vtex'
+
+# Paquete (bake.py --pack): cabecera fija, índice y datos alineados
+PACK_MAGIC = b'VPAK'
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct('<4sIII')  # magic, versión, entradas, bytes del índice
+PACK_ENTRY = struct.Struct('<QQH')     # offset, tamaño, largo del nombre (sigue el nombre)
+PACK_ALIGN = 16
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+_manifest = None
+_pack = None
+
 
 def ensure_dirs():
-    for d in (ASSETS_DIR, IMAGES_DIR, VIDEOS_DIR, AUDIO_DIR, FONTS_DIR):
+    # Con paquete no se toca el disco (el caché de SDF crea su carpeta)
+    if pack() is not None:
+        return
+    for d in (ASSETS_DIR, IMAGES_DIR, VIDEOS_DIR, AUDIO_DIR, FONTS_DIR, CACHE_DIR):
         os.makedirs(d, exist_ok=True)
+
+
+# ---------------- PAQUETE ----------------
+
+class AssetPack:
+    """
+    ``assets.pak`` abierto una sola vez con mmap.
+
+    Al abrirlo sólo se lee el índice; ``view`` devuelve un slice del mapa
+    sin copiar nada (el SO trae las páginas del disco cuando se leen). El
+    mapa es copy-on-write para que ctypes pueda apuntar a él directamente.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        view = self._view = memoryview(self._map)
+
+        magic, version, count, _ = PACK_HEADER.unpack_from(view)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError('paquete no válido: %s' % path)
+
+        self.index = {}  # nombre -> (offset, tamaño)
+        offset = PACK_HEADER.size
+        for _ in range(count):
+            start, size, name_len = PACK_ENTRY.unpack_from(view, offset)
+            offset += PACK_ENTRY.size
+            name = bytes(view[offset:offset + name_len]).decode('utf-8')
+            offset += name_len
+            self.index[name] = (start, size)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def view(self, name):
+        start, size = self.index[name]
+        return self._view[start:start + size]
+
+
+def pack():
+    """El paquete si existe (se abre la primera vez); None = ficheros sueltos."""
+    global _pack
+    if _pack is None:
+        _pack = False
+        if os.path.exists(PACK_FILE):
+            try:
+                _pack = AssetPack(PACK_FILE)
+            except (OSError, ValueError) as e:
+                print('[ASSETS] No se pudo abrir el paquete:', e)
+    return _pack or None
+
+
+# ---------------- ACCESO ----------------
+# ``name`` es relativo a assets/ y con "/" ("fonts/Glass_TTY_VT220.ttf").
+# Con paquete, éste manda; sin él (desarrollo), se leen los ficheros sueltos.
+
+def path(name):
+    """Ruta del fichero suelto de ``name``."""
+    return os.path.join(ASSETS_DIR, name)
+
+
+def exists(name):
+    p = pack()
+    if p is not None:
+        return name in p
+    return os.path.exists(path(name))
+
+
+def read(name):
+    """
+    Contenido de ``name`` como buffer: un memoryview del paquete (sin
+    copia) o, suelto, un bytearray leído de una vez.
+    """
+    p = pack()
+    if p is not None:
+        return p.view(name)
+    data = bytearray(os.path.getsize(path(name)))
+    with open(path(name), 'rb') as f:
+        f.readinto(data)
+    return data
+
+
+def open_asset(name):
+    """Fichero sobre ``read(name)`` para los decoders de pyglet que piden ``file=``."""
+    return AssetReader(read(name))
+
+
+class AssetReader(io.RawIOBase):
+    """
+    Fichero de sólo lectura sobre un buffer, sin copiarlo: cada ``read``
+    copia sólo los bytes que pide el decoder (io.BytesIO copiaría el asset
+    entero antes de empezar).
+    """
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError('posición negativa')
+        self._pos = offset
+        return self._pos
+
+    def readinto(self, b):
+        chunk = self._view[self._pos:self._pos + len(b)]
+        n = len(chunk)
+        memoryview(b).cast('B')[:n] = chunk
+        self._pos += n
+        return n
+
+    def readall(self):
+        data = bytes(self._view[self._pos:])
+        self._pos += len(data)
+        return data
+
+
+# ---------------- MANIFEST ----------------
+
+def manifest():
+    """Manifest de bake.py ({} si no se ha horneado)."""
+    global _manifest
+    if _manifest is None:
+        _manifest = {}
+        name = 'baked/manifest.json'
+        if exists(name):
+            try:
+                _manifest = json.loads(bytes(read(name)).decode('utf-8'))
+            except ValueError:
+                pass
+    return _manifest
+
+
+def image_file(name):
+    """Asset de la imagen ``name``: la horneada si existe, si no el PNG."""
+    entry = manifest().get('images', {}).get(name)
+    if entry:
+        baked = 'baked/' + entry['file']
+        if exists(baked):
+            return baked
+    return 'images/' + name
+
+
+def atlas_entry(name):
+    """Entrada del manifest del atlas de animación ``name`` (None sin hornear)."""
+    entry = manifest().get('atlases', {}).get(name)
+    if entry and exists('baked/' + entry['file']):
+        return entry
+    return None
+
+
+def image_size(name):
+    """(ancho, alto) original de ``name``, para maquetar antes de cargarla."""
+    entry = manifest().get('images', {}).get(name)
+    if entry:
+        return tuple(entry['size'])
+    name = 'images/' + name
+    if not exists(name):
+        return None
+    p = pack()
+    if p is not None:
+        return png_header_size(bytes(p.view(name)[:24]))
+    with open(path(name), 'rb') as f:
+        return png_header_size(f.read(24))
+
+
+def png_header_size(head):
+    """(ancho, alto) de la cabecera IHDR de un PNG (primeros 24 bytes)."""
+    if len(head) < 24 or head[:8] != _PNG_SIGNATURE or head[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', head[16:24])
+
+
+# ---------------- IMAGEN HORNEADA ----------------
+
+def mip_sizes(width, height):
+    """Tamaños de la cadena de mipmaps, del nivel 0 hasta 1x1."""
+    sizes = [(width, height)]
+    while width > 1 or height > 1:
+        width, height = max(1, width // 2), max(1, height // 2)
+        sizes.append((width, height))
+    return sizes
+
+
+def read_baked(data):
+    """
+    Cabecera y niveles de una imagen horneada.
+    Devuelve (ancho, alto, [memoryview por nivel]) sin copiar ``data``.
+    """
+    view = memoryview(data)
+    magic, width, height, count = BAKED_HEADER.unpack_from(view)
+    if magic != BAKED_MAGIC:
+        raise ValueError('no es una imagen horneada')
+    levels = []
+    offset = BAKED_HEADER.size
+    for w, h in mip_sizes(width, height)[:count]:
+        size = w * h * 4
+        levels.append(view[offset:offset + size])
+        offset += size
+    return width, height, levels
@@ -0,0 +1,286 @@
+"""
+Horneado offline de assets.
+
+    python bake.py [--screen WxH] [--workers N] [--force] [--pack]
+
+Recorre ``assets/`` y calcula el hash de contenido de cada fichero; los
+duplicados byte a byte se hornean una sola vez. Cada imagen que muestra
+el juego (DISPLAY_BOXES) se reduce a su tamaño máximo en pantalla,
+relativo a una pantalla de ``--screen``, se le genera la cadena de
+mipmaps y se guarda como RGBA sin comprimir en ``assets/baked``:
+cargarla es leer el fichero y subirlo, sin decodificar PNG.
+
+Las imágenes se procesan en paralelo en un pool de procesos. Al final se
+escribe ``assets/baked/manifest.json``, por el que ``assets.image_file``
+resuelve los nombres; sin manifest se usan los PNG sueltos.
+
+Con ``--pack`` se escribe además ``assets/assets.pak``: fuentes, imágenes
+horneadas, audio y textos en un solo fichero (los duplicados comparten
+datos) que el juego abre una vez con mmap en lugar de los sueltos.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import assets
+from assets import BAKED_EXTENSION, BAKED_HEADER, BAKED_MAGIC, mip_sizes
+from imaging import (ATLAS_GAP, ATLASES, SCREEN, build_atlas, content_hash, mip_levels,
+                     read_png, resize, target_size)
+
+# Caja máxima en pantalla de cada imagen que usa el juego, en fracción de
+# la pantalla (ancho, alto; None = sin límite). Las que no están aquí no
+# se hornean: sólo entran en el manifest con su hash.
+DISPLAY_BOXES = {
+    # Fotos de ARDE: Arde._draw_photo las limita a 60% x 40% del CRT
+    "01.png": (0.6, 0.4),
+    "02.png": (0.6, 0.4),
+    "03.png": (0.6, 0.4),
+    "04.png": (0.6, 0.4),
+}
+
+# Lo que hay en assets/ que es salida, no fuente
+SKIP_DIRS = ("baked", "cache")
+SKIP_FILES = (os.path.basename(assets.PACK_FILE),)
+
+
+# ---------------- FICHEROS ----------------
+
+def walk_assets():
+    """Rutas relativas (con /) de todos los ficheros fuente de assets/."""
+    found = []
+    for root, dirs, files in os.walk(assets.ASSETS_DIR):
+        if root == assets.ASSETS_DIR:
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if root == assets.ASSETS_DIR and name in SKIP_FILES:
+                continue
+            path = os.path.join(root, name)
+            found.append(os.path.relpath(path, assets.ASSETS_DIR).replace(os.sep, "/"))
+    return sorted(found)
+
+
+# ---------------- IMAGEN ----------------
+
+def _write_baked(dest, width, height, levels):
+    tmp = dest + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(BAKED_HEADER.pack(BAKED_MAGIC, width, height, len(levels)))
+        for data in levels:
+            f.write(data)
+    os.replace(tmp, dest)
+
+
+def bake_image(source, dest, box, screen):
+    """Proceso de trabajo: hornea ``source`` en ``dest``. Devuelve (tamaño original, horneado, niveles)."""
+    pixels = read_png(source)
+    height, width = pixels.shape[:2]
+    base = target_size(box, width, height, screen)
+    levels = mip_levels(resize(pixels, *base))
+    _write_baked(dest, base[0], base[1], levels)
+    return (width, height), base, len(levels)
+
+
+def bake_atlas(sources, dest, box, screen):
+    """Proceso de trabajo: hornea el atlas de ``sources``. Devuelve (tamaño, horneado, niveles, regiones)."""
+    size, atlas, regions = build_atlas(sources, box, screen)
+    levels = mip_levels(atlas)
+    _write_baked(dest, atlas.shape[1], atlas.shape[0], levels)
+    return size, (atlas.shape[1], atlas.shape[0]), len(levels), regions
+
+
+# ---------------- MANIFEST ----------------
+
+def bake(screen=SCREEN, workers=None, force=False):
+    os.makedirs(assets.BAKED_DIR, exist_ok=True)
+    files = {}
+    first_of = {}
+    duplicates = {}
+    for rel in walk_assets():
+        digest = files[rel] = content_hash(os.path.join(assets.ASSETS_DIR, rel))
+        if digest in first_of:
+            duplicates[rel] = first_of[digest]
+        else:
+            first_of[digest] = rel
+
+    images = {}
+    jobs = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rel, digest in files.items():
+            folder, _, name = rel.rpartition("/")
+            box = DISPLAY_BOXES.get(name)
+            if folder != "images" or box is None:
+                continue
+            # La salida depende del contenido y de la caja: duplicados con
+            # la misma caja comparten fichero (y textura en el loader)
+            key = hashlib.sha256(repr((digest, box, tuple(screen))).encode()).hexdigest()[:16]
+            out_name = key + BAKED_EXTENSION
+            images[name] = {"file": out_name, "hash": digest}
+            dest = os.path.join(assets.BAKED_DIR, out_name)
+            if out_name not in jobs and (force or not os.path.exists(dest)):
+                source = os.path.join(assets.ASSETS_DIR, rel)
+                jobs[out_name] = pool.submit(bake_image, source, dest, box, screen)
+
+        atlases = {}
+        atlas_jobs = {}
+        for name, (frames, box) in ATLASES.items():
+            digests = [files["images/" + frame] for frame in frames]
+            key = hashlib.sha256(repr((digests, box, tuple(screen), ATLAS_GAP)).encode()).hexdigest()[:16]
+            out_name = key + BAKED_EXTENSION
+            atlases[name] = {"file": out_name, "frames": frames}
+            dest = os.path.join(assets.BAKED_DIR, out_name)
+            # Las regiones salen del propio horneado: siempre se rehace
+            # si no están en el manifest anterior
+            previous = _previous_manifest().get("atlases", {}).get(name, {})
+            if force or not os.path.exists(dest) or previous.get("file") != out_name:
+                sources = [os.path.join(assets.IMAGES_DIR, frame) for frame in frames]
+                atlas_jobs[name] = pool.submit(bake_atlas, sources, dest, box, screen)
+            else:
+                atlases[name].update(previous)
+
+        results = {out_name: job.result() for out_name, job in jobs.items()}
+        for name, job in atlas_jobs.items():
+            size, baked, levels, regions = job.result()
+            atlases[name].update(size=list(size), baked=list(baked), levels=levels, regions=regions)
+
+    for name, entry in images.items():
+        dest = os.path.join(assets.BAKED_DIR, entry["file"])
+        if entry["file"] in results:
+            size, baked, levels = results[entry["file"]]
+        else:
+            with open(os.path.join(assets.IMAGES_DIR, name), "rb") as f:
+                size = assets.png_header_size(f.read(24))
+            baked, levels = _read_header(dest)
+        entry.update(size=list(size), baked=list(baked), levels=levels)
+
+    manifest = {
+        "version": 1,
+        "screen": list(screen),
+        "images": images,
+        "atlases": atlases,
+        "files": files,
+        "duplicates": duplicates,
+    }
+    with open(assets.MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    # Horneados que ya no referencia nadie
+    used = {entry["file"] for entry in list(images.values()) + list(atlases.values())}
+    for name in os.listdir(assets.BAKED_DIR):
+        if name.endswith(BAKED_EXTENSION) and name not in used:
+            os.remove(os.path.join(assets.BAKED_DIR, name))
+
+    return manifest, len(jobs) + len(atlas_jobs)
+
+
+# ---------------- PAQUETE ----------------
+
+def _align(offset):
+    return -(-offset // assets.PACK_ALIGN) * assets.PACK_ALIGN
+
+
+def write_pack(manifest):
+    """
+    Escribe assets.pak con todo lo que necesita el juego: los ficheros de
+    assets/ salvo los PNG ya horneados, las imágenes horneadas y el
+    manifest. Entradas con el mismo contenido apuntan a los mismos datos.
+    """
+    baked = {"images/" + name for name in manifest["images"]}
+    for entry in manifest["atlases"].values():
+        baked.update("images/" + frame for frame in entry["frames"])
+    sources = {}  # nombre -> (clave de contenido, ruta)
+    for rel, digest in manifest["files"].items():
+        if rel not in baked:
+            sources[rel] = (digest, os.path.join(assets.ASSETS_DIR, rel))
+    for entry in list(manifest["images"].values()) + list(manifest["atlases"].values()):
+        rel = "baked/" + entry["file"]
+        sources[rel] = (entry["file"], os.path.join(assets.BAKED_DIR, entry["file"]))
+    sources["baked/manifest.json"] = ("manifest", assets.MANIFEST_FILE)
+
+    names = sorted(sources)
+    encoded = [name.encode("utf-8") for name in names]
+    index_size = sum(assets.PACK_ENTRY.size + len(raw) for raw in encoded)
+
+    # Offsets: un bloque alineado por contenido distinto
+    offset = _align(assets.PACK_HEADER.size + index_size)
+    blocks = {}  # clave -> (offset, tamaño, ruta)
+    for name in names:
+        key, path = sources[name]
+        if key not in blocks:
+            size = os.path.getsize(path)
+            blocks[key] = (offset, size, path)
+            offset = _align(offset + size)
+
+    tmp = assets.PACK_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(assets.PACK_HEADER.pack(assets.PACK_MAGIC, assets.PACK_VERSION, len(names), index_size))
+        for name, raw in zip(names, encoded):
+            start, size, _ = blocks[sources[name][0]]
+            f.write(assets.PACK_ENTRY.pack(start, size, len(raw)))
+            f.write(raw)
+        for start, size, path in sorted(blocks.values()):
+            f.seek(start)
+            with open(path, "rb") as src:
+                f.write(src.read())
+        f.truncate(offset)
+    os.replace(tmp, assets.PACK_FILE)
+    return len(names), len(blocks), offset
+
+
+def _previous_manifest():
+    try:
+        with open(assets.MANIFEST_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        _, width, height, levels = BAKED_HEADER.unpack(f.read(BAKED_HEADER.size))
+    return (width, height), levels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hornea assets/ para el juego")
+    parser.add_argument("--screen", metavar="WxH", default="%dx%d" % SCREEN,
+                        help="pantalla de referencia para el tamaño máximo de las imágenes")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por CPU)")
+    parser.add_argument("--force", action="store_true", help="rehornear aunque ya exista la salida")
+    parser.add_argument("--pack", action="store_true", help="escribir también assets/assets.pak")
+    args = parser.parse_args()
+
+    screen = tuple(int(n) for n in args.screen.lower().split("x"))
+    start = time.perf_counter()
+    manifest, baked = bake(screen, args.workers, args.force)
+
+    source_bytes = baked_bytes = 0
+    counted = set()
+    for name, entry in sorted(manifest["images"].items()):
+        w, h = entry["baked"]
+        source_bytes += entry["size"][0] * entry["size"][1] * 4
+        if entry["file"] not in counted:
+            counted.add(entry["file"])
+            baked_bytes += sum(mw * mh * 4 for mw, mh in mip_sizes(w, h))
+        print("[BAKE] %-42s %4dx%-4d -> %4dx%-4d %s" % (name, *entry["size"], w, h, entry["file"]))
+    for name, entry in sorted(manifest["atlases"].items()):
+        w, h = entry["baked"]
+        source_bytes += entry["size"][0] * entry["size"][1] * 4 * len(entry["frames"])
+        baked_bytes += sum(mw * mh * 4 for mw, mh in mip_sizes(w, h))
+        print("[BAKE] %-42s %d x %4dx%-4d -> atlas %4dx%-4d %s" % (
+            name, len(entry["frames"]), *entry["size"], w, h, entry["file"]))
+    for rel, original in sorted(manifest["duplicates"].items()):
+        print("[BAKE] duplicado: %s = %s" % (rel, original))
+    print("[BAKE] %d imágenes horneadas en %.1f s; texturas %.1f MB -> %.1f MB" % (
+        baked, time.perf_counter() - start, source_bytes / 2**20, baked_bytes / 2**20))
+
+    if args.pack:
+        entries, blocks, size = write_pack(manifest)
+        print("[BAKE] %s: %d entradas, %d bloques, %.1f MB" % (
+            assets.PACK_FILE, entries, blocks, size / 2**20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Benchmark headless de las escenas.
+
+    python bench.py [--frames N] [--out bench.json] [--virtual WxH] [escena ...]
+    python bench.py --check [escena ...]
+
+Crea el Engine con un contexto offscreen (EGL; en máquinas sin GPU usa GL
+por software, p. ej. llvmpipe), registra las escenas como main_refactor y
+reproduce para cada una un guion de teclas durante N frames con un reloj
+simulado (paso fijo), así que los callbacks programados con pyglet.clock
+se disparan igual en cada ejecución.
+
+Se hacen dos pasadas por escena, cada una con un Engine y escenas recién
+creados: una para tiempos y otra con tracemalloc para asignaciones
+(tracemalloc ralentiza demasiado para medir tiempos).
+El resultado es un JSON con un registro por frame y un resumen por escena.
+Si alguna escena falla, sale con código 1.
+
+Con --check no se mide nada: cada escena se ejecuta dos veces, cada una con
+un Engine nuevo (lo que rompe las cachés de GL atadas al primer contexto),
+y sale con código 1 si alguna pasada falla.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pyglet
+
+# Sin ventana real: contexto offscreen
+pyglet.options["headless"] = True
+
+from pyglet import gl  # noqa: E402
+from pyglet.window import key  # noqa: E402
+
+from engine import Engine  # noqa: E402
+from inventory import Inventory  # noqa: E402
+from main_refactor import register_scenes  # noqa: E402
+from perf_hud import FrameCounters, texture_memory  # noqa: E402
+from renderer import RENDERERS  # noqa: E402
+from save_manager import SaveManager  # noqa: E402
+
+DEFAULT_FRAMES = 300
+CHECK_FRAMES = 60
+STEP = 1 / 60.0
+WINDOW_SIZE = (1024, 720)
+
+_CHAR_KEYS = {" ": key.SPACE, "\n": key.ENTER}
+
+
+def typed(frame, text, every=2):
+    """Guion que teclea ``text`` desde ``frame`` (una tecla cada ``every`` frames)."""
+    events = []
+    for i, ch in enumerate(text):
+        if ch in _CHAR_KEYS:
+            symbol = _CHAR_KEYS[ch]
+        elif ch.isdigit():
+            symbol = getattr(key, "_" + ch)
+        else:
+            symbol = getattr(key, ch.upper())
+        events.append((frame + i * every, symbol))
+    return events
+
+
+# Guiones por escena: (frame, tecla). Ninguno sale de su escena antes de
+# tiempo salvo el glitch de la shell, que acaba en la advertencia.
+SCRIPTS = {
+    # Encendido + pantalla fija (ENTER saltaría a la shell)
+    "vatican_firmware": [],
+    # Comandos, login canónico y glitch
+    "vatican_shell": (
+        typed(30, "help\n")
+        + typed(90, "view roms\n")
+        + typed(150, "run daemonum index\n")
+        + typed(240, "1614\n")
+    ),
+    # Splash (diablito animado) -> menú -> dossier -> comandos y scroll
+    "vatican_terminal": (
+        [(40, key.ENTER), (60, key.DOWN), (70, key.UP), (80, key.ENTER)]
+        + typed(130, "help\n")
+        + [(190, key.UP), (200, key.UP), (210, key.DOWN)]
+        + typed(240, "actors\n")
+    ),
+    # Animación de la advertencia
+    "vatican_warning": [],
+    # Consola, caso y foto
+    "arde": (
+        typed(10, "help\n")
+        + typed(60, "view infestation\n")
+        + typed(120, "run 1\n")
+        + typed(180, "photo\n")
+    ),
+    # Inventario y glitch rojo de presencia
+    "case_lancaster": [(10, key.I), (30, key.S)],
+}
+
+
+class SimTime:
+    """Reloj simulado para pyglet.clock: avanza sólo cuando se le pide."""
+
+    def __init__(self):
+        self.now = time.perf_counter()
+
+    def __call__(self):
+        return self.now
+
+
+# ---------------- EJECUCIÓN ----------------
+
+def make_engine(renderer="gl", virtual_size=None):
+    # Sin GL de por medio no hace falta enseñar la ventana (el contexto sí)
+    engine = Engine(*WINDOW_SIZE, title="Incorrupta - bench", renderer=renderer,
+                    virtual_size=virtual_size, visible=(renderer == "gl"))
+    register_scenes(engine, SaveManager(), Inventory())
+    return engine
+
+
+def run_scene(name, frames, trace=False, renderer="gl", virtual_size=None):
+    """Reproduce el guion de ``name`` y devuelve (registros, error, frame de salida)."""
+    engine = make_engine(renderer, virtual_size)
+    scene = engine.get_scene(name)
+    clock = pyglet.clock.get_default()
+    sim = SimTime()
+    clock.time = sim
+
+    counters = FrameCounters()
+    counters.install()
+
+    random.seed(0)
+    np.random.seed(0)
+
+    script = {}
+    for frame, symbol in SCRIPTS.get(name, []):
+        script.setdefault(frame, []).append(symbol)
+
+    records = []
+    error = None
+    left_at = None
+    try:
+        engine.go_to(name)
+        for frame in range(frames):
+            counters.reset()
+            if trace:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+
+            start = time.perf_counter()
+            for symbol in script.get(frame, []):
+                scene.on_key(symbol, 0)
+            sim.now += STEP
+            clock.tick()
+
+            update_start = time.perf_counter()
+            scene.on_update(STEP)
+            draw_start = time.perf_counter()
+
+            if engine.current_scene is not scene:
+                left_at = frame
+                break
+
+            engine.on_draw()
+            gl.glFinish()
+            end = time.perf_counter()
+
+            record = {"frame": frame}
+            if trace:
+                current, peak = tracemalloc.get_traced_memory()
+                record["alloc_kb"] = round((peak - base) / 1024, 2)
+                record["net_kb"] = round((current - base) / 1024, 2)
+            else:
+                record.update(
+                    wall_ms=round((end - start) * 1000, 3),
+                    update_ms=round((draw_start - update_start) * 1000, 3),
+                    draw_ms=round((end - draw_start) * 1000, 3),
+                    draw_calls=counters.draw_calls,
+                    labels=counters.labels,
+                    shapes=counters.shapes,
+                    primitives=sum(engine.renderer.stats.values()),
+                )
+            records.append(record)
+    except Exception as e:
+        error = "%s: %s" % (type(e).__name__, e)
+    finally:
+        counters.uninstall()
+        clock.time = time.perf_counter
+        try:
+            engine.current_scene.on_exit()
+        except Exception:
+            pass
+        engine.current_scene = None
+        engine.window.close()
+
+    return records, error, left_at
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def summarize(frames):
+    def column(name):
+        return [f[name] for f in frames if name in f]
+
+    wall = column("wall_ms")
+    summary = {
+        "frames": len(frames),
+        "wall_ms_p50": _percentile(wall, 0.50),
+        "wall_ms_p95": _percentile(wall, 0.95),
+        "wall_ms_p99": _percentile(wall, 0.99),
+    }
+    for name in ("update_ms", "draw_ms", "draw_calls", "labels", "shapes", "primitives", "alloc_kb"):
+        values = column(name)
+        summary[name + "_mean"] = round(sum(values) / len(values), 3) if values else 0.0
+    return summary
+
+
+def run(scene_names=None, frames=DEFAULT_FRAMES, renderer="gl", virtual_size=None):
+    names = scene_names or list(SCRIPTS)
+
+    results = {}
+    for name in names:
+        if name not in SCRIPTS:
+            results[name] = {"error": "escena sin guion de benchmark"}
+            continue
+        print("[BENCH] %s (%d frames)" % (name, frames))
+
+        timing, error, left_at = run_scene(name, frames, renderer=renderer, virtual_size=virtual_size)
+        tracemalloc.start()
+        try:
+            allocs, alloc_error, _ = run_scene(name, frames, trace=True, renderer=renderer,
+                                               virtual_size=virtual_size)
+        finally:
+            tracemalloc.stop()
+
+        for record, alloc in zip(timing, allocs):
+            record.update(alloc_kb=alloc["alloc_kb"], net_kb=alloc["net_kb"])
+
+        results[name] = {
+            "summary": summarize(timing),
+            "error": error or alloc_error,
+            "left_scene_at": left_at,
+            "frames": timing,
+        }
+
+    return {
+        "meta": {
+            "frames": frames,
+            "step": STEP,
+            "window": list(WINDOW_SIZE),
+            "renderer": renderer,
+            "virtual": list(virtual_size) if virtual_size else None,
+            "python": platform.python_version(),
+            "pyglet": pyglet.version,
+            "gl_renderer": gl.gl_info.get_renderer(),
+            "texture_mb": round(texture_memory() / (1024 * 1024), 2),
+        },
+        "scenes": results,
+    }
+
+
+def check(scene_names=None, frames=CHECK_FRAMES, renderer="gl", virtual_size=None):
+    """Cada escena dos veces, cada una en un Engine nuevo; devuelve {escena: [errores]}."""
+    errors = {}
+    for name in scene_names or list(SCRIPTS):
+        if name not in SCRIPTS:
+            errors[name] = ["escena sin guion de benchmark"]
+            continue
+        for attempt in (1, 2):
+            print("[CHECK] %s (pasada %d)" % (name, attempt))
+            _, error, _ = run_scene(name, frames, renderer=renderer, virtual_size=virtual_size)
+            if error:
+                errors.setdefault(name, []).append("pasada %d: %s" % (attempt, error))
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless de escenas")
+    parser.add_argument("scenes", nargs="*", help="escenas a medir (por defecto todas)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--renderer", default="gl", choices=list(RENDERERS),
+                        help="backend de Engine.renderer (null = sólo cuenta primitivas, "
+                             "ansi = celdas de color en la terminal)")
+    parser.add_argument("--virtual", metavar="WxH",
+                        help="resolución interna fija, p. ej. 960x720 (por defecto, la de la ventana)")
+    parser.add_argument("--check", action="store_true",
+                        help="sólo comprobar: cada escena dos veces con un Engine nuevo, sin medir")
+    args = parser.parse_args()
+
+    virtual_size = tuple(int(n) for n in args.virtual.lower().split("x")) if args.virtual else None
+    if args.check:
+        errors = check(args.scenes, min(args.frames, CHECK_FRAMES), args.renderer, virtual_size)
+        for name, messages in errors.items():
+            for message in messages:
+                print("[CHECK] %-18s ERROR %s" % (name, message))
+        print("[CHECK]", "FALLOS en %d escena(s)" % len(errors) if errors else "OK")
+        sys.exit(1 if errors else 0)
+
+    report = run(args.scenes, args.frames, args.renderer, virtual_size)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+
+    for name, result in report["scenes"].items():
+        summary = result.get("summary", {})
+        print("[BENCH] %-18s p50 %6.2f ms  p95 %6.2f ms  draws %5.1f  alloc %7.1f KB%s" % (
+            name,
+            summary.get("wall_ms_p50", 0.0),
+            summary.get("wall_ms_p95", 0.0),
+            summary.get("draw_calls_mean", 0.0),
+            summary.get("alloc_kb_mean", 0.0),
+            "  ERROR " + result["error"] if result.get("error") else "",
+        ))
+    print("[BENCH] Resultados en", args.out)
+
+    # Un benchmark con escenas rotas no es una ejecución completa
+    failed = [name for name, result in report["scenes"].items() if result.get("error")]
+    if failed:
+        print("[BENCH] FALLOS en:", ", ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
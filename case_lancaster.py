@@ -1,12 +1,29 @@
 from scene import Scene
-from pyglet.text import Label
-import os
 from media_manager import MediaManager
 from effects import async_warning_flash, glitch_text_once
-import pyglet
+
+# Fondo según la paleta de la terminal de la que venimos
+PALETTE_BACKGROUNDS = {
+    'green': (3, 5, 5),
+    'amber': (10, 5, 3),
+    'white': (5, 5, 5),
+    'purple': (5, 3, 8),
+}
+
+SCENE_TEXT = (
+    'Lancaster Hill - Exterior del internado\n'
+    'El auto está estacionado al pie de la colina.\n'
+    '(Pulsa S para un glitch rojo de presencia, I para ver inventario, '
+    'ESC para volver al archivo Vaticano)'
+)
 
 
 class CaseLancasterScene(Scene):
+    # Escena sin monitor CRT: se dibuja directamente en la ventana
+    crt_postprocess = False
+    # Al volver a la terminal se descarga (música incluida)
+    unload_on_exit = True
+
     def __init__(self, engine, save_manager, inventory):
         super().__init__(engine)
         self.save_manager = save_manager
@@ -22,66 +39,47 @@ class CaseLancasterScene(Scene):
         self.from_palette = from_terminal_palette or 'green'
 
         # Música ambiental del caso (si existe)
-        audio_path = os.path.join(os.path.dirname(__file__), 'assets', 'audio', 'case_ambient.ogg')
-        if os.path.exists(audio_path):
-            self.media.play_music(audio_path, loop=True, volume=0.28)
+        self.media.play_music('audio/case_ambient.ogg', loop=True, volume=0.28)
 
         # Nivel de corrupción inicial (podemos usarlo luego)
         self.corruption_level = 0.1
 
+    def unload(self):
+        super().unload()
+        self.media.stop_music()
+
     def on_update(self, dt):
         # Aquí luego puedes subir la corrupción, manejar timers, etc.
         pass
 
     def on_draw(self):
-        from pyglet import gl
+        r = self.engine.renderer
 
         # Dimensiones de la ventana
-        w = self.engine.window.width
-        h = self.engine.window.height
+        w = self.engine.screen.width
+        h = self.engine.screen.height
 
         # Color de fondo según paleta de origen (para que se sienta como "reboot")
-        if self.from_palette == 'green':
-            gl.glClearColor(0.01, 0.02, 0.02, 1)
-        elif self.from_palette == 'amber':
-            gl.glClearColor(0.04, 0.02, 0.01, 1)
-        elif self.from_palette == 'white':
-            gl.glClearColor(0.02, 0.02, 0.02, 1)
-        elif self.from_palette == 'purple':
-            gl.glClearColor(0.02, 0.01, 0.03, 1)
-        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+        background = PALETTE_BACKGROUNDS.get(self.from_palette)
+        if background:
+            r.overlay(self.draw_key('background'), background, opacity=1.0, layer=0)
 
         # Texto descriptivo de la escena (luego aquí metemos tu narrativa real)
-        label = Label(
-            'Lancaster Hill - Exterior del internado\n'
-            'El auto está estacionado al pie de la colina.\n'
-            '(Pulsa S para un glitch rojo de presencia, I para ver inventario, '
-            'ESC para volver al archivo Vaticano)',
-            x=30,
-            y=h - 80,
+        r.text(
+            self.draw_key('scene_text'),
+            SCENE_TEXT,
+            30,
+            h - 80,
             width=w - 60,      # importante para multiline en pyglet 2.x
             multiline=True,
             font_name=self.font_name,
             font_size=16,
-            color=(220, 220, 220, 255)
+            color=(220, 220, 220, 255),
         )
-        label.draw()
 
         # Overlay rojo (glitch de presencia) si está activo
         if self.overlay_opacity > 0:
-            gl.glEnable(gl.GL_BLEND)
-            gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
-            gl.glColor4f(1.0, 0.0, 0.0, self.overlay_opacity)
-            pyglet.graphics.draw(
-                4, pyglet.gl.GL_QUADS,
-                ('v2f', [
-                    0, 0,
-                    w, 0,
-                    w, h,
-                    0, h
-                ])
-            )
-            gl.glDisable(gl.GL_BLEND)
+            r.overlay(self.draw_key('presence'), (255, 0, 0), opacity=self.overlay_opacity, layer=2)
 
     def on_key(self, symbol, modifiers):
         from pyglet.window import key
@@ -0,0 +1,333 @@
+import weakref
+
+import numpy as np
+import pyglet
+from pyglet import gl
+from pyglet.graphics.shader import Shader, ShaderProgram
+from pyglet.text import Label
+
+from crt import render_to_texture
+from fonts import PREWARM_CHARSET
+
+ATLAS_COLUMNS = 32
+PADDING = 4  # margen de cada celda del atlas (glifos más anchos que la celda)
+
+# Byte de atributos de cada celda
+COLOR_MASK = 0x07  # índice de paleta (0..7)
+DIM = 0x08         # intensidad baja
+GLITCH = 0x10      # celda corrupta: tiembla en el shader
+CURSOR = 0x20      # barra de cursor en el borde izquierdo de la celda
+
+PALETTE_SIZE = 8
+
+_VERTEX_SOURCE = """#version 150 core
+in vec2 cell;
+in vec2 corner;
+in float glyph;
+in float attr;
+
+out vec2 texture_coords;
+out vec2 local;
+flat out int cell_attr;
+
+uniform WindowBlock
+{
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform vec2 origin;        // esquina superior izquierda de la rejilla
+uniform vec2 cell_size;
+uniform vec2 atlas_size;
+uniform int atlas_columns;
+uniform float padding;
+uniform float time;
+
+float hash(vec2 p)
+{
+    return fract(sin(dot(p, vec2(12.9898, 78.233))) * 43758.5453);
+}
+
+void main()
+{
+    int a = int(attr + 0.5);
+    // El quad cubre la celda más el margen: los glifos anchos pisan a sus vecinas
+    vec2 stride = cell_size + 2.0 * padding;
+    vec2 pos = origin + vec2(cell.x, -cell.y - 1.0) * cell_size + corner * stride - padding;
+    if ((a & 16) != 0) {
+        float t = floor(time * 24.0);
+        pos += (vec2(hash(cell + t), hash(cell.yx - t)) - 0.5) * cell_size * vec2(0.6, 0.3);
+    }
+
+    int slot = int(glyph + 0.5);
+    vec2 atlas_cell = vec2(slot % atlas_columns, slot / atlas_columns);
+    texture_coords = (atlas_cell + corner) * stride / atlas_size;
+
+    local = corner * stride - padding;
+    cell_attr = a;
+    gl_Position = window.projection * window.view * vec4(pos, 0.0, 1.0);
+}
+"""
+
+_FRAGMENT_SOURCE = """#version 150 core
+in vec2 texture_coords;
+in vec2 local;
+flat in int cell_attr;
+out vec4 final_colors;
+
+uniform sampler2D atlas;
+uniform vec4 palette[8];
+uniform float cursor_width;
+uniform float cell_height;
+
+void main()
+{
+    vec4 color = palette[cell_attr & 7];
+    // Atlas blanco premultiplicado: el rojo es la cobertura del glifo
+    float coverage = texture(atlas, texture_coords).r;
+    if ((cell_attr & 32) != 0 && local.x >= 0.0 && local.x < cursor_width
+            && local.y >= 0.0 && local.y < cell_height) {
+        coverage = 1.0;
+    }
+    if ((cell_attr & 8) != 0) {
+        color.rgb *= 0.55;
+    }
+    final_colors = vec4(color.rgb, color.a * coverage);
+}
+"""
+
+# Programas y atlas por espacio de objetos de GL (como la caché de fuentes de
+# pyglet): un Engine nuevo sin contexto compartido no hereda ids ajenos
+_programs = weakref.WeakKeyDictionary()
+
+
+def _get_program():
+    object_space = gl.current_context.object_space
+    program = _programs.get(object_space)
+    if program is None:
+        program = _programs[object_space] = ShaderProgram(
+            Shader(_VERTEX_SOURCE, "vertex"),
+            Shader(_FRAGMENT_SOURCE, "fragment"),
+        )
+    return program
+
+
+# ---------------- ATLAS ----------------
+
+class CellAtlas:
+    """
+    Atlas monoespaciado de una fuente: un glifo por celda de tamaño fijo
+    (avance x alto de línea), blanco sobre transparente.
+
+    El ancho de celda es el avance mediano del ASCII imprimible (la VT220
+    trae avances proporcionales); cada glifo se centra en su celda.
+
+    Arranca con el juego de caracteres precalentado; los puntos de código
+    nuevos reciben el siguiente hueco y el atlas se re-hornea en el próximo
+    ``ensure``. Los huecos nunca cambian, así que las rejillas no tienen que
+    volver a subir nada cuando el atlas crece.
+    """
+
+    def __init__(self, font_name, font_size, charset=PREWARM_CHARSET):
+        self.font_name = font_name
+        self.font_size = font_size
+
+        font = pyglet.font.load(font_name, font_size)
+        self.descent = font.descent
+        glyphs, _ = font.get_glyphs("".join(chr(c) for c in range(33, 127)))
+        advances = sorted(glyph.advance for glyph in glyphs)
+        self.cell_width = max(1, int(round(advances[len(advances) // 2])))
+        self.cell_height = font.ascent - font.descent
+
+        self.slots = {" ": 0}
+        self.chars = [" "]
+        for ch in charset:
+            self.slot(ch)
+
+        self.texture = None
+        self._baked = 0
+
+    def slot(self, ch):
+        """Hueco de ``ch`` en el atlas (lo reserva si es nuevo)."""
+        index = self.slots.get(ch)
+        if index is None:
+            index = self.slots[ch] = len(self.chars)
+            self.chars.append(ch)
+        return index
+
+    def ensure(self, window):
+        """Hornea el atlas si hay caracteres nuevos desde la última vez."""
+        if self.texture is not None and self._baked == len(self.chars):
+            return
+
+        stride_x = self.cell_width + 2 * PADDING
+        stride_y = self.cell_height + 2 * PADDING
+        rows = -(-len(self.chars) // ATLAS_COLUMNS)
+
+        if self.texture is not None:
+            self.texture.delete()
+        self.texture = pyglet.image.Texture.create(
+            ATLAS_COLUMNS * stride_x, rows * stride_y,
+            min_filter=gl.GL_NEAREST,
+            mag_filter=gl.GL_NEAREST,
+        )
+
+        batch = pyglet.graphics.Batch()
+        labels = []
+        for i, ch in enumerate(self.chars):
+            if ch == " ":
+                continue
+            col, row = i % ATLAS_COLUMNS, i // ATLAS_COLUMNS
+            labels.append(Label(
+                ch, font_name=self.font_name, font_size=self.font_size,
+                x=col * stride_x + PADDING + self.cell_width / 2,
+                y=row * stride_y + PADDING - self.descent,
+                anchor_x="center", color=(255, 255, 255, 255), batch=batch,
+            ))
+        render_to_texture(self.texture, window, batch.draw)
+        for label in labels:
+            label.delete()
+        self._baked = len(self.chars)
+
+
+_atlases = weakref.WeakKeyDictionary()
+
+
+def get_atlas(font_name, font_size):
+    """Atlas compartido por todas las rejillas con la misma fuente."""
+    atlases = _atlases.setdefault(gl.current_context.object_space, {})
+    key = (font_name, font_size)
+    atlas = atlases.get(key)
+    if atlas is None:
+        atlas = atlases[key] = CellAtlas(font_name, font_size)
+    return atlas
+
+
+# ---------------- REJILLA ----------------
+
+class CellGrid:
+    """
+    Pantalla de texto de ``cols`` x ``rows`` celdas.
+
+    El contenido vive en dos arrays compactos: puntos de código (uint32) y
+    atributos (uint8: paleta, intensidad, glitch, cursor). Toda la rejilla
+    es una sola vertex list indexada que muestrea el atlas, así que se
+    dibuja con un único draw call. ``write`` compara con lo que ya hay y
+    sólo sube el tramo de celdas que cambió en cada fila; color, posición y
+    temblor son uniforms y no tocan los vértices.
+    """
+
+    def __init__(self, atlas, cols, rows):
+        self.atlas = atlas
+        self.cols = cols
+        self.rows = rows
+
+        self.codes = np.full((rows, cols), 32, dtype=np.uint32)
+        self.attrs = np.zeros((rows, cols), dtype=np.uint8)
+        self.palette = [(255, 255, 255, 255)] * PALETTE_SIZE
+        self.cursor = None  # (fila, columna) con el bit CURSOR, o None
+        self.uploaded = 0  # celdas subidas en el último write
+
+        count = rows * cols
+        index = np.arange(count)
+        cells = np.stack([index % cols, index // cols], axis=1).astype(np.float32)
+        corners = np.tile(np.array([0, 0, 1, 0, 1, 1, 0, 1], dtype=np.float32), count)
+        base = (index * 4)[:, None]
+        indices = (base + np.array([0, 1, 2, 0, 2, 3])).ravel()
+
+        self.program = _get_program()
+        self.vertex_list = self.program.vertex_list_indexed(
+            count * 4, gl.GL_TRIANGLES, indices.tolist(),
+            cell=("f", np.repeat(cells, 4, axis=0).ravel().tolist()),
+            corner=("f", corners.tolist()),
+            glyph=("f", [0.0] * (count * 4)),
+            attr=("f", [0.0] * (count * 4)),
+        )
+        buffers = self.vertex_list.domain.attrib_name_buffers
+        self._glyph_buffer = buffers["glyph"]
+        self._attr_buffer = buffers["attr"]
+
+    def delete(self):
+        self.vertex_list.delete()
+
+    # ---------------- CONTENIDO ----------------
+
+    def write(self, codes, attrs):
+        """
+        Lleva la rejilla a ``codes``/``attrs`` subiendo sólo lo que cambió.
+        El bit de cursor no viene en ``attrs``: lo pone ``set_cursor``.
+        """
+        if self.cursor is not None:
+            attrs = attrs.copy()
+            attrs[self.cursor] |= CURSOR
+        changed = (codes != self.codes) | (attrs != self.attrs)
+        self.uploaded = 0
+        if not changed.any():
+            return
+
+        atlas = self.atlas
+        start = self.vertex_list.start
+        for row in np.flatnonzero(changed.any(axis=1)).tolist():
+            cols = np.flatnonzero(changed[row])
+            first, last = int(cols[0]), int(cols[-1]) + 1
+            span = codes[row, first:last]
+            slots = [float(atlas.slot(chr(c))) for c in span.tolist()]
+
+            offset = start + (row * self.cols + first) * 4
+            count = (last - first) * 4
+            self._glyph_buffer.set_region(offset, count, np.repeat(slots, 4).tolist())
+            self._attr_buffer.set_region(
+                offset, count, np.repeat(attrs[row, first:last], 4).astype(np.float32).tolist())
+            self.uploaded += last - first
+
+        self.codes[...] = codes
+        self.attrs[...] = attrs
+
+    def set_cursor(self, cell):
+        """
+        Mueve el cursor a ``cell`` (fila, columna) o lo quita con None.
+        Sólo sube el atributo de la celda vieja y de la nueva.
+        """
+        if cell == self.cursor:
+            return
+        old, self.cursor = self.cursor, cell
+        if old is not None:
+            self._patch_attr(old, int(self.attrs[old]) & ~CURSOR)
+        if cell is not None:
+            self._patch_attr(cell, int(self.attrs[cell]) | CURSOR)
+
+    def _patch_attr(self, cell, attr):
+        row, col = cell
+        self.attrs[row, col] = attr
+        offset = self.vertex_list.start + (row * self.cols + col) * 4
+        self._attr_buffer.set_region(offset, 4, [float(attr)] * 4)
+
+    # ---------------- DIBUJO ----------------
+
+    def draw(self, window, x, top, now=0.0, cursor_width=2):
+        """Dibuja la rejilla con su esquina superior izquierda en (x, top)."""
+        atlas = self.atlas
+        atlas.ensure(window)
+
+        program = self.program
+        program.use()
+        program["origin"] = (float(x), float(top))
+        program["cell_size"] = (float(atlas.cell_width), float(atlas.cell_height))
+        program["atlas_size"] = (float(atlas.texture.width), float(atlas.texture.height))
+        program["atlas_columns"] = ATLAS_COLUMNS
+        program["padding"] = float(PADDING)
+        program["time"] = float(now)
+        program["cursor_width"] = float(cursor_width)
+        program["cell_height"] = float(atlas.cell_height)
+        program["atlas"] = 0
+        palette = program["palette"]
+        for i, color in enumerate(self.palette):
+            palette[i] = tuple(c / 255 for c in color)
+
+        gl.glActiveTexture(gl.GL_TEXTURE0)
+        gl.glBindTexture(atlas.texture.target, atlas.texture.id)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        self.vertex_list.draw(gl.GL_TRIANGLES)
+        gl.glDisable(gl.GL_BLEND)
+        program.stop()
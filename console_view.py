@@ -0,0 +1,266 @@
+import time
+
+import numpy as np
+
+from cell_grid import GLITCH, CellGrid, get_atlas
+
+
+class ConsoleView:
+    """
+    Consola de texto persistente para Shell, Dossier y ARDE.
+
+    Es un terminal de celdas: el historial y el prompt se componen en una
+    CellGrid (arrays de puntos de código y atributos) que se dibuja con un
+    solo draw call sobre el atlas monoespaciado de la fuente. Cada cambio
+    —una línea nueva, una tecla, el scroll— sólo vuelve a subir las celdas
+    que difieren de lo que ya estaba en pantalla.
+
+    El historial se guarda ya partido en filas de ``cols`` columnas (wrap
+    por palabras) y se recorta/amplía por los extremos. La composición se
+    hace como mucho una vez por frame, en ``draw``.
+
+    El cursor es un bit de atributo de la celda que sigue al prompt y va
+    aparte de la composición: parpadear sólo sube esa celda. El color y el
+    temblor del glitch son uniforms y no tocan la rejilla.
+    """
+
+    def __init__(self, window, font_name, font_size, color, gap_lines=0, input_lines=3):
+        self.window = window
+        self.font_name = font_name
+        self.font_size = font_size
+        self.color = color
+        self.gap_lines = gap_lines      # líneas en blanco entre historial y prompt
+        self.input_lines = input_lines  # alto reservado para el prompt (con wrap)
+
+        self.atlas = get_atlas(font_name, font_size)
+        self.grid = None
+        self.cursor_visible = False
+        self._cursor_cell = None  # celda tras el prompt (la fija _compose)
+
+        self._lines = []       # líneas lógicas del historial
+        self._wrapped = []     # filas de cada línea lógica
+        self._input_text = ""
+        self._glitch = frozenset()  # caracteres marcados como corruptos
+        self._geometry = None
+        self._offset = (0, 0)
+        self._top_line = None  # None = pegado al final
+        self._dirty = True
+
+    # ---------------- ESTILO ----------------
+
+    def set_style(self, font_name=None, font_size=None, color=None):
+        """Cambia fuente/color; el color es un uniform y no recompone nada."""
+        if color is not None:
+            self.color = color
+        font_changed = False
+        for attr, value in (("font_name", font_name), ("font_size", font_size)):
+            if value is not None and getattr(self, attr) != value:
+                setattr(self, attr, value)
+                font_changed = True
+        if font_changed:
+            # El tamaño de celda depende de la fuente
+            self.atlas = get_atlas(self.font_name, self.font_size)
+            self._geometry_changed()
+
+    # ---------------- GEOMETRÍA ----------------
+
+    def set_geometry(self, x, top, width, visible_lines):
+        """Coloca la consola: ``top`` es la baseline de la primera línea."""
+        geometry = (x, top, width, visible_lines)
+        if geometry == self._geometry:
+            return
+        self._geometry = geometry
+        self._geometry_changed()
+
+    def _geometry_changed(self):
+        if self._geometry is None:
+            return
+        _, _, width, visible_lines = self._geometry
+        cols = max(1, int(width // self.atlas.cell_width))
+        rows = max(1, visible_lines) + self.gap_lines + self.input_lines
+
+        grid = self.grid
+        if grid is None or grid.atlas is not self.atlas or (grid.cols, grid.rows) != (cols, rows):
+            if grid is not None:
+                grid.delete()
+            self.grid = CellGrid(self.atlas, cols, rows)
+            self._wrapped = [_wrap(line, cols) for line in self._lines]
+        self._dirty = True
+
+    def offset(self, dx, dy):
+        """Desplazamiento temporal (temblor del glitch)."""
+        self._offset = (dx, dy)
+
+    # ---------------- HISTORIAL ----------------
+
+    def sync_lines(self, lines):
+        """
+        Lleva el historial a ``lines`` con el mínimo trabajo:
+        recorta por el principio y añade por el final cuando es posible,
+        y sólo reemplaza todo si no hay nada en común.
+        """
+        old = self._lines
+        if lines == old and not self._glitch:
+            return
+        self._glitch = frozenset()
+        if not lines or not old:
+            self._set_all(lines)
+            return
+
+        n = len(old)
+        drop = n
+        for k in range(n):
+            keep = n - k
+            if keep <= len(lines) and old[k] == lines[0] and lines[:keep] == old[k:]:
+                drop = k
+                break
+
+        if drop == n:
+            self._set_all(lines)
+            return
+
+        if drop:
+            del old[:drop]
+            del self._wrapped[:drop]
+
+        new = lines[len(old):]
+        if new:
+            old.extend(new)
+            if self.grid is not None:
+                self._wrapped.extend(_wrap(line, self.grid.cols) for line in new)
+        self._dirty = True
+
+    def _set_all(self, lines):
+        self._lines = list(lines)
+        if self.grid is not None:
+            self._wrapped = [_wrap(line, self.grid.cols) for line in self._lines]
+        self._dirty = True
+
+    def set_text(self, text, glitch=()):
+        """
+        Reemplaza todo el texto (glitch de corrupción). Las celdas con
+        caracteres de ``glitch`` se marcan como corruptas y tiemblan.
+        """
+        self._glitch = frozenset(glitch)
+        self._set_all(text.split("\n") if text else [])
+
+    # ---------------- SCROLL ----------------
+
+    def scroll_to_line(self, index):
+        """Deja la línea lógica ``index`` arriba del todo (None = al final)."""
+        if index is not None:
+            index = max(0, index)
+        if index != self._top_line:
+            self._top_line = index
+            self._dirty = True
+
+    # ---------------- ENTRADA ----------------
+
+    def set_input(self, text):
+        """Cambia la línea del prompt (sólo se suben las celdas distintas)."""
+        if text != self._input_text:
+            self._input_text = text
+            self._dirty = True
+
+    # ---------------- CURSOR ----------------
+
+    def set_cursor_visible(self, visible):
+        """Parpadeo: no recompone, ``draw`` sólo cambia la celda del cursor."""
+        self.cursor_visible = bool(visible)
+
+    # ---------------- COMPOSICIÓN ----------------
+
+    def _screen_rows(self):
+        """Filas visibles (historial, hueco y prompt) y fila del prompt."""
+        grid = self.grid
+        cols = grid.cols
+        visible_lines = grid.rows - self.gap_lines - self.input_lines
+
+        rows = [row for wrapped in self._wrapped for row in wrapped]
+        if self._top_line is None or not self._lines:
+            first = max(0, len(rows) - visible_lines)
+        else:
+            index = min(self._top_line, len(self._lines) - 1)
+            first = sum(len(wrapped) for wrapped in self._wrapped[:index])
+        history = rows[first:first + visible_lines]
+
+        input_rows = _wrap(self._input_text, cols, hard=True)[:self.input_lines]
+        screen = history + [""] * self.gap_lines + input_rows
+        return screen, len(history) + self.gap_lines
+
+    def _compose(self):
+        grid = self.grid
+        cols = grid.cols
+        screen, input_row = self._screen_rows()
+
+        codes = np.full((grid.rows, cols), 32, dtype=np.uint32)
+        for r, line in enumerate(screen):
+            if line:
+                codes[r, :len(line)] = np.frombuffer(line.encode("utf-32-le"), dtype=np.uint32)
+
+        attrs = np.zeros((grid.rows, cols), dtype=np.uint8)
+        if self._glitch:
+            marked = np.fromiter((ord(ch) for ch in self._glitch), dtype=np.uint32)
+            attrs[np.isin(codes, marked)] |= GLITCH
+
+        row, col = divmod(len(self._input_text), cols)
+        row += input_row
+        self._cursor_cell = (row, col) if row < grid.rows else None
+
+        grid.write(codes, attrs)
+        self._dirty = False
+
+    def delete(self):
+        """Libera la rejilla (su vertex list vive en el batch por defecto)."""
+        if self.grid is not None:
+            self.grid.delete()
+            self.grid = None
+            self._geometry = None
+
+    # ---------------- DIBUJO ----------------
+
+    def draw(self, renderer):
+        """La rejilla es un efecto GL; los demás backends reciben las filas como texto."""
+        if self.grid is None:
+            return
+        renderer.effect(self._draw_grid, self._draw_rows)
+
+    def _draw_grid(self):
+        if self._dirty:
+            self._compose()
+        self.grid.set_cursor(self._cursor_cell if self.cursor_visible else None)
+
+        x, top, _, _ = self._geometry
+        dx, dy = self._offset
+        # ``top`` es la baseline de la primera línea: la celda empieza un ascent más arriba
+        cell_top = top + self.atlas.cell_height + self.atlas.descent
+        self.grid.palette[0] = self.color
+        self.grid.draw(self.window, x + dx, cell_top + dy,
+                       now=time.perf_counter(), cursor_width=max(2, self.font_size // 7))
+
+    def _draw_rows(self, renderer):
+        x, top, width, _ = self._geometry
+        screen, _ = self._screen_rows()
+        if self.cursor_visible:
+            screen[-1] += "_"
+        for row, line in enumerate(screen):
+            if line:
+                renderer.text(("console", id(self), row), line, x, top - row * self.atlas.cell_height,
+                              self.font_name, self.font_size, self.color, width=width)
+
+
+def _wrap(line, cols, hard=False):
+    """Parte ``line`` en filas de ``cols`` (por palabras salvo ``hard``)."""
+    if len(line) <= cols:
+        return [line]
+    if hard:
+        return [line[i:i + cols] for i in range(0, len(line), cols)]
+    rows = []
+    while len(line) > cols:
+        cut = line.rfind(" ", 0, cols + 1)
+        if cut <= 0:
+            cut = cols
+        rows.append(line[:cut])
+        line = line[cut:].lstrip(" ")
+    rows.append(line)
+    return rows
@@ -0,0 +1,757 @@
+import random
+import weakref
+
+import numpy as np
+import pyglet
+from pyglet import gl
+from pyglet.graphics.shader import Shader, ShaderProgram
+from pyglet.math import Mat4
+
+SCREEN_MARGIN = 80  # margen del monitor dentro de la ventana
+RESIZE_SETTLE = 0.2  # segundos sin eventos de resize para dar el tamaño por bueno
+
+
+def screen_bounds(w, h, margin=SCREEN_MARGIN):
+    """Área visible 4:3 del CRT dentro de una ventana de w x h."""
+    w2 = w - margin * 2
+    h2 = h - margin * 2
+    if w2 / h2 > 4 / 3:
+        ih = h2
+        iw = int(ih * 4 / 3)
+    else:
+        iw = w2
+        ih = int(w2 * 3 / 4)
+    x = (w - iw) // 2
+    y = (h - ih) // 2
+    return x, y, iw, ih
+
+
+# -----------------------
+# MARCO CRT (fondo + bisel)
+# -----------------------
+
+class CRTFrame:
+    """
+    Fondo del CRT y las cuatro bandas del bisel, dibujados con el renderer.
+    Los límites se calculan una vez por tamaño de ventana, en on_resize.
+    Todas las escenas comparten las mismas claves ("crt", ...): el backend
+    GL reutiliza los mismos rectángulos al cambiar de escena.
+    """
+
+    def __init__(self, window, bg_color=(5, 5, 5), bezel_opacity=120, band=20):
+        self.window = window
+        self.bg_color = bg_color
+        self.bezel_opacity = bezel_opacity
+        self.band = band
+
+        self.bounds = (0, 0, 0, 0)
+        self._bezel = ()
+        self._size = (0, 0)
+
+        self.on_resize(window.width, window.height)
+        window.push_handlers(on_resize=self.on_resize)
+
+    def on_resize(self, width, height):
+        if (width, height) == self._size:
+            return
+        self._size = (width, height)
+
+        x, y, iw, ih = screen_bounds(width, height)
+        self.bounds = (x, y, iw, ih)
+
+        band = self.band
+        self._bezel = (
+            (x, y + ih - band, iw, band),
+            (x, y, iw, band),
+            (x, y, band, ih),
+            (x + iw - band, y, band, ih),
+        )
+
+    def draw(self, renderer):
+        x, y, iw, ih = self.bounds
+        # Capa -1: debajo de todo lo que la escena pida en el mismo tramo
+        renderer.rect(("crt", "background"), x, y, iw, ih, self.bg_color, layer=-1)
+        for i, (bx, by, bw, bh) in enumerate(self._bezel):
+            renderer.rect(("crt", "bezel", i), bx, by, bw, bh, (0, 0, 0),
+                          opacity=self.bezel_opacity, layer=-1)
+
+    def delete(self):
+        self.window.remove_handlers(on_resize=self.on_resize)
+
+
+# -----------------------
+# RUIDO DE VRAM (BOOT)
+# -----------------------
+
+class BootNoise:
+    """
+    Ruido de VRAM del arranque generado con NumPy.
+
+    Cada frame se rellena un array pequeño (un texel por celda) con brillo
+    y alpha aleatorios, se sube a una textura reutilizada y se dibuja como
+    un único quad escalado con filtrado nearest.
+
+    - ``mode="grid"``: celdas de cell_w x cell_h encendidas con ``density``.
+    - ``mode="lines"``: ``lines`` filas de 1px encendidas a todo el ancho.
+    """
+
+    def __init__(self, mode="grid", cell_w=16, cell_h=10, density=0.45, lines=24):
+        self.mode = mode
+        self.cell_w = cell_w if mode == "grid" else None
+        self.cell_h = cell_h if mode == "grid" else 1
+        self.density = density
+        self.lines = lines
+
+        self._rng = np.random.default_rng()
+        self._pixels = None
+        self.texture = None
+        self.sprite = None
+
+    def _ensure(self, cols, rows):
+        if self.texture is not None and (self.texture.width, self.texture.height) == (cols, rows):
+            return
+        if self.sprite is not None:
+            self.sprite.delete()
+            self.texture.delete()
+        self.texture = pyglet.image.Texture.create(
+            cols, rows,
+            min_filter=gl.GL_NEAREST,
+            mag_filter=gl.GL_NEAREST,
+        )
+        self.sprite = pyglet.sprite.Sprite(self.texture)
+        self._pixels = np.zeros((rows, cols, 4), dtype=np.uint8)
+
+    def _fill_grid(self, pixels):
+        rows, cols, _ = pixels.shape
+        rng = self._rng
+        lit = rng.random((rows, cols)) < self.density
+        pixels[..., 1] = rng.integers(40, 141, (rows, cols), dtype=np.uint8)
+        pixels[..., 3] = np.where(lit, rng.integers(150, 241, (rows, cols), dtype=np.uint8), 0)
+
+    def _fill_lines(self, pixels):
+        rows = pixels.shape[0]
+        rng = self._rng
+        pixels[..., 3] = 0
+        pixels[..., 1] = 255
+        picked = rng.integers(0, rows, self.lines)
+        pixels[picked, :, 3] = rng.integers(80, 161, (len(picked), 1), dtype=np.uint8)
+
+    def draw(self, x, y, w, h):
+        if self.mode == "grid":
+            cols = -(-w // self.cell_w)
+            scale_x = self.cell_w
+        else:
+            cols = 1
+            scale_x = w
+        rows = -(-h // self.cell_h)
+
+        self._ensure(cols, rows)
+        if self.mode == "grid":
+            self._fill_grid(self._pixels)
+        else:
+            self._fill_lines(self._pixels)
+
+        image = pyglet.image.ImageData(cols, rows, "RGBA", self._pixels.tobytes())
+        self.texture.blit_into(image, 0, 0, 0)
+
+        self.sprite.update(x=x, y=y, scale_x=scale_x, scale_y=self.cell_h)
+        self.sprite.draw()
+
+    def delete(self):
+        if self.sprite is not None:
+            self.sprite.delete()
+            self.texture.delete()
+            self.sprite = self.texture = None
+
+
+# -----------------------
+# SHADERS
+# -----------------------
+
+_VERTEX_SOURCE = """#version 150 core
+in vec2 position;
+out vec2 uv;
+
+void main()
+{
+    uv = position * 0.5 + 0.5;
+    gl_Position = vec4(position, 0.0, 1.0);
+}
+"""
+
+_FRAGMENT_SOURCE = """#version 150 core
+in vec2 uv;
+out vec4 final_color;
+
+uniform sampler2D scene;
+uniform vec4 screen_rect;      // x, y, w, h del CRT en píxeles de framebuffer
+uniform vec3 scanline_color;
+uniform float scanline_alpha;  // 0.0 - 1.0
+uniform float flicker;         // desplazamiento vertical de las scanlines
+uniform float pixel_scale;     // píxeles de framebuffer por píxel de ventana
+uniform float vignette;        // oscurecimiento en las esquinas del CRT
+
+void main()
+{
+    vec3 color = texture(scene, uv).rgb;
+    vec2 local = (gl_FragCoord.xy - screen_rect.xy) / screen_rect.zw;
+
+    if (all(greaterThanEqual(local, vec2(0.0))) && all(lessThan(local, vec2(1.0)))) {
+        // Una línea de 1px cada 2px, como las antiguas Rectangle por fila
+        float row = floor((gl_FragCoord.y - screen_rect.y) / pixel_scale - flicker);
+        if (mod(row, 2.0) < 1.0) {
+            color = mix(color, scanline_color, scanline_alpha);
+        }
+
+        vec2 d = local - 0.5;
+        color *= 1.0 - vignette * dot(d, d) * 2.0;
+    }
+
+    final_color = vec4(color, 1.0);
+}
+"""
+
+
+# Las capturas se dibujan con glBlendFunc(SRC_ALPHA, ONE_MINUS_SRC_ALPHA),
+# que también se aplica al alpha: queda rgb*a pero alpha a*a. La cobertura
+# real, para componer como premultiplicado, es sqrt(alpha)
+_COVERAGE_FUNCTION = """
+vec4 premultiplied(vec4 captured)
+{
+    return vec4(captured.rgb, sqrt(captured.a));
+}
+"""
+
+_GLOW_FRAGMENT_SOURCE = """#version 150 core
+in vec2 uv;
+out vec4 final_color;
+
+uniform sampler2D source;
+uniform vec2 direction;   // un texel en x o en y
+uniform int radius;       // 0 = copia directa
+uniform float strength;
+""" + _COVERAGE_FUNCTION + """
+void main()
+{
+    if (radius == 0) {
+        final_color = premultiplied(texture(source, uv)) * strength;
+        return;
+    }
+
+    float sigma = max(float(radius) * 0.5, 0.5);
+    vec4 total = texture(source, uv);
+    float weight_sum = 1.0;
+
+    for (int i = 1; i <= radius; i++) {
+        float w = exp(-float(i * i) / (2.0 * sigma * sigma));
+        total += texture(source, uv + direction * float(i)) * w;
+        total += texture(source, uv - direction * float(i)) * w;
+        weight_sum += 2.0 * w;
+    }
+
+    final_color = total / weight_sum * strength;
+}
+"""
+
+_PRESENT_FRAGMENT_SOURCE = """#version 150 core
+in vec2 uv;
+out vec4 final_color;
+
+uniform sampler2D source;
+
+void main()
+{
+    final_color = texture(source, uv);
+}
+"""
+
+_COVERAGE_FRAGMENT_SOURCE = """#version 150 core
+in vec2 uv;
+out vec4 final_color;
+
+uniform sampler2D source;
+""" + _COVERAGE_FUNCTION + """
+void main()
+{
+    final_color = premultiplied(texture(source, uv));
+}
+"""
+
+_QUAD = ("f", (-1.0, -1.0, 1.0, -1.0, -1.0, 1.0, 1.0, 1.0))
+
+
+class RenderTarget:
+    """Framebuffer + textura de color, recreados sólo al cambiar de tamaño."""
+
+    def __init__(self, filtering=gl.GL_NEAREST):
+        self.filtering = filtering
+        self.framebuffer = None
+        self.texture = None
+        self.size = (0, 0)
+
+    def ensure(self, width, height):
+        if self.framebuffer is not None and self.size == (width, height):
+            return
+
+        if self.framebuffer is not None:
+            self.framebuffer.delete()
+            self.texture.delete()
+
+        self.texture = pyglet.image.Texture.create(
+            width, height,
+            min_filter=self.filtering,
+            mag_filter=self.filtering,
+        )
+        self.framebuffer = pyglet.image.Framebuffer()
+        self.framebuffer.attach_texture(self.texture)
+        self.size = (width, height)
+
+    def bind(self):
+        self.framebuffer.bind()
+
+    def bind_texture(self, unit=0):
+        gl.glActiveTexture(gl.GL_TEXTURE0 + unit)
+        gl.glBindTexture(self.texture.target, self.texture.id)
+
+
+def render_to_texture(texture, window, draw, premultiplied=False):
+    """
+    Ejecuta ``draw()`` sobre ``texture`` con una proyección en píxeles de la
+    textura, limpiando a transparente. Restaura framebuffer, viewport y
+    proyección, así que puede llamarse en mitad de otro pase.
+
+    Con ``premultiplied=True`` el alpha de la captura se corrige a la
+    cobertura real (ver _COVERAGE_FUNCTION), para dibujar el resultado con
+    ``GL_ONE, GL_ONE_MINUS_SRC_ALPHA``.
+    """
+    previous = gl.GLint()
+    gl.glGetIntegerv(gl.GL_DRAW_FRAMEBUFFER_BINDING, previous)
+    viewport = (gl.GLint * 4)()
+    gl.glGetIntegerv(gl.GL_VIEWPORT, viewport)
+    projection = window.projection
+
+    capture = texture
+    if premultiplied:
+        capture = pyglet.image.Texture.create(
+            texture.width, texture.height,
+            min_filter=gl.GL_NEAREST,
+            mag_filter=gl.GL_NEAREST,
+        )
+
+    framebuffer = pyglet.image.Framebuffer()
+    framebuffer.attach_texture(capture)
+    framebuffer.bind()
+    gl.glViewport(0, 0, texture.width, texture.height)
+    window.projection = Mat4.orthogonal_projection(0, texture.width, 0, texture.height, -255, 255)
+    gl.glClearColor(0.0, 0.0, 0.0, 0.0)
+    gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+
+    draw()
+
+    window.projection = projection
+    framebuffer.delete()
+    if premultiplied:
+        _resolve_coverage(capture, texture)
+        capture.delete()
+    gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, previous.value)
+    gl.glViewport(*viewport)
+
+
+# Programa y quad del pase de cobertura, uno por contexto de GL: el quad es
+# un VAO y los VAO no se comparten entre contextos (cada Engine crea el suyo)
+_coverage_passes = weakref.WeakKeyDictionary()
+
+
+def _resolve_coverage(source, texture):
+    """Copia ``source`` en ``texture`` con el alpha corregido a cobertura."""
+    context = gl.current_context
+    coverage = _coverage_passes.get(context)
+    if coverage is None:
+        program = ShaderProgram(
+            Shader(_VERTEX_SOURCE, "vertex"),
+            Shader(_COVERAGE_FRAGMENT_SOURCE, "fragment"),
+        )
+        coverage = _coverage_passes[context] = (
+            program, program.vertex_list(4, gl.GL_TRIANGLE_STRIP, position=_QUAD),
+        )
+    program, quad = coverage
+
+    framebuffer = pyglet.image.Framebuffer()
+    framebuffer.attach_texture(texture)
+    framebuffer.bind()
+    blend = _save_blend()
+    gl.glDisable(gl.GL_BLEND)
+
+    gl.glActiveTexture(gl.GL_TEXTURE0)
+    gl.glBindTexture(source.target, source.id)
+    program.use()
+    program["source"] = 0
+    quad.draw(gl.GL_TRIANGLE_STRIP)
+    program.stop()
+
+    _restore_blend(blend)
+    framebuffer.delete()
+
+
+class CRTPostProcess:
+    """
+    Post-proceso CRT de un solo pase:
+    la escena se dibuja en un framebuffer offscreen y después se compone
+    en la ventana aplicando scanlines, flicker y viñeta en el shader.
+    """
+
+    def __init__(self, window):
+        self.window = window
+
+        self.scanline_color = (0, 30, 0)
+        self.vignette = 0.25
+
+        self.program = ShaderProgram(
+            Shader(_VERTEX_SOURCE, "vertex"),
+            Shader(_FRAGMENT_SOURCE, "fragment"),
+        )
+        self.quad = self.program.vertex_list(4, gl.GL_TRIANGLE_STRIP, position=_QUAD)
+
+        self.target = RenderTarget()
+        self._previous_fbo = 0
+
+    # ---------------- PASE ----------------
+
+    def begin(self):
+        """Redirige el dibujo de la escena al framebuffer offscreen."""
+        previous = gl.GLint()
+        gl.glGetIntegerv(gl.GL_DRAW_FRAMEBUFFER_BINDING, previous)
+        self._previous_fbo = previous.value
+
+        fb_w, fb_h = self.window.get_framebuffer_size()
+        self.target.ensure(fb_w, fb_h)
+        self.target.bind()
+        gl.glClearColor(0.0, 0.0, 0.0, 1.0)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+
+    def end(self, scanline_alpha=55):
+        """Compone el framebuffer en la ventana con el shader CRT."""
+        # Vuelve al destino anterior (la ventana o la pantalla virtual)
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self._previous_fbo)
+
+        w, h = self.window.width, self.window.height
+        fb_w, fb_h = self.target.size
+        pixel_scale = fb_w / w if w else 1.0
+
+        x, y, iw, ih = screen_bounds(w, h)
+
+        self.target.bind_texture()
+
+        self.program.use()
+        self.program["scene"] = 0
+        self.program["screen_rect"] = (
+            x * pixel_scale, y * pixel_scale, iw * pixel_scale, ih * pixel_scale
+        )
+        self.program["scanline_color"] = tuple(c / 255 for c in self.scanline_color)
+        self.program["scanline_alpha"] = max(0, min(255, scanline_alpha)) / 255
+        self.program["flicker"] = random.uniform(-1, 1)
+        self.program["pixel_scale"] = pixel_scale
+        self.program["vignette"] = self.vignette
+        self.quad.draw(gl.GL_TRIANGLE_STRIP)
+        self.program.stop()
+
+
+class GlowPass:
+    """
+    Glow de fósforo en GPU.
+
+    El texto se dibuja una sola vez dentro del ``with`` (GLRenderer.glow) sobre una
+    textura transparente; al salir se aplica un blur separable (horizontal y
+    vertical) que se suma de forma aditiva al destino, y encima se compone el
+    texto nítido. El coste no depende de cuánto texto haya en pantalla.
+
+    ``opacity`` escala la composición final: un flicker de alpha global se
+    aplica como un uniform, sin tocar los colores de los vértices.
+    """
+
+    MAX_RADIUS = 16
+
+    def __init__(self, radius=2, strength=1.0):
+        self.radius = radius
+        self.strength = strength
+
+        self.program = ShaderProgram(
+            Shader(_VERTEX_SOURCE, "vertex"),
+            Shader(_GLOW_FRAGMENT_SOURCE, "fragment"),
+        )
+        self.quad = self.program.vertex_list(4, gl.GL_TRIANGLE_STRIP, position=_QUAD)
+
+        self.source = RenderTarget(filtering=gl.GL_LINEAR)
+        self.blur = RenderTarget(filtering=gl.GL_LINEAR)
+
+        self._previous_fbo = 0
+        self._previous_blend = None
+        self._pass_radius = radius
+        self._pass_strength = strength
+        self._pass_opacity = 1.0
+
+    def capture(self, radius=None, strength=None, opacity=1.0):
+        """Igual que ``with glow:`` pero con radio/intensidad/opacidad propios."""
+        self._pass_radius = self.radius if radius is None else radius
+        self._pass_strength = self.strength if strength is None else strength
+        self._pass_opacity = opacity
+        return self
+
+    def __enter__(self):
+        viewport = (gl.GLint * 4)()
+        gl.glGetIntegerv(gl.GL_VIEWPORT, viewport)
+        width, height = viewport[2], viewport[3]
+
+        previous = gl.GLint()
+        gl.glGetIntegerv(gl.GL_DRAW_FRAMEBUFFER_BINDING, previous)
+        self._previous_fbo = previous.value
+        self._previous_blend = _save_blend()
+
+        self.source.ensure(width, height)
+        self.blur.ensure(width, height)
+
+        self.source.bind()
+        gl.glClearColor(0.0, 0.0, 0.0, 0.0)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        radius = max(0, min(self.MAX_RADIUS, int(self._pass_radius)))
+        strength = self._pass_strength
+        opacity = max(0.0, min(1.0, self._pass_opacity))
+        self._pass_radius = self.radius
+        self._pass_strength = self.strength
+        self._pass_opacity = 1.0
+
+        width, height = self.source.size
+        program = self.program
+        program.use()
+        program["source"] = 0
+
+        # 1) Blur horizontal: texto -> textura intermedia
+        self.blur.bind()
+        gl.glClearColor(0.0, 0.0, 0.0, 0.0)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+        self.source.bind_texture()
+        program["direction"] = (1.0 / width, 0.0)
+        program["radius"] = radius
+        program["strength"] = 1.0
+        self.quad.draw(gl.GL_TRIANGLE_STRIP)
+
+        # 2) Blur vertical, sumado al destino original
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self._previous_fbo)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_ONE, gl.GL_ONE)
+        self.blur.bind_texture()
+        program["direction"] = (0.0, 1.0 / height)
+        program["strength"] = strength * opacity
+        self.quad.draw(gl.GL_TRIANGLE_STRIP)
+
+        # 3) Texto nítido encima, premultiplicado (el shader corrige el
+        # alpha de la captura, ver _COVERAGE_FUNCTION)
+        gl.glBlendFunc(gl.GL_ONE, gl.GL_ONE_MINUS_SRC_ALPHA)
+        self.source.bind_texture()
+        program["radius"] = 0
+        program["strength"] = opacity
+        self.quad.draw(gl.GL_TRIANGLE_STRIP)
+
+        # Blending como lo tenía quien abrió el ``with``
+        _restore_blend(self._previous_blend)
+        program.stop()
+
+
+def _save_blend():
+    """Estado de blending actual (activo y funciones rgb/alpha)."""
+    funcs = []
+    for name in (gl.GL_BLEND_SRC_RGB, gl.GL_BLEND_DST_RGB, gl.GL_BLEND_SRC_ALPHA, gl.GL_BLEND_DST_ALPHA):
+        value = gl.GLint()
+        gl.glGetIntegerv(name, value)
+        funcs.append(value.value)
+    return bool(gl.glIsEnabled(gl.GL_BLEND)), funcs
+
+
+def _restore_blend(state):
+    enabled, funcs = state
+    gl.glBlendFuncSeparate(*funcs)
+    if enabled:
+        gl.glEnable(gl.GL_BLEND)
+    else:
+        gl.glDisable(gl.GL_BLEND)
+
+
+# -----------------------
+# RESOLUCIÓN VIRTUAL
+# -----------------------
+
+class VirtualScreen:
+    """
+    Pantalla interna de tamaño fijo (p. ej. 960x720) escalada a la ventana.
+
+    Las escenas dibujan dentro de ``with screen:`` sobre un framebuffer de
+    ``width`` x ``height``; al salir se presenta centrado en la ventana con
+    el mayor factor entero que quepa (filtrado nearest) y bandas negras. Si
+    la ventana es más pequeña que la pantalla se reduce al tamaño que quepa.
+
+    Se hace pasar por la ventana ante escenas y helpers (``width``,
+    ``height``, ``get_framebuffer_size``, ``projection``), así que el layout
+    se calcula una vez para el tamaño virtual y no depende del monitor: un
+    resize de la ventana sólo cambia el escalado final.
+    """
+
+    def __init__(self, window, width, height):
+        self.window = window
+        self.width = width
+        self.height = height
+
+        self.program = ShaderProgram(
+            Shader(_VERTEX_SOURCE, "vertex"),
+            Shader(_PRESENT_FRAGMENT_SOURCE, "fragment"),
+        )
+        self.quad = self.program.vertex_list(4, gl.GL_TRIANGLE_STRIP, position=_QUAD)
+        self.target = RenderTarget()
+
+        self._previous_fbo = 0
+        self._viewport = (0, 0, 0, 0)
+        self._projection = None
+
+    # ---------------- COMO VENTANA ----------------
+
+    def get_size(self):
+        return self.width, self.height
+
+    def get_framebuffer_size(self):
+        return self.width, self.height
+
+    @property
+    def projection(self):
+        return self.window.projection
+
+    @projection.setter
+    def projection(self, matrix):
+        self.window.projection = matrix
+
+    def push_handlers(self, *args, **kwargs):
+        """El tamaño virtual no cambia: no hay on_resize que reenviar."""
+
+    def remove_handlers(self, *args, **kwargs):
+        pass
+
+    def window_resized(self, width, height):
+        """La ventana cambió: sólo cambia el escalado de la presentación."""
+
+    # ---------------- PASE ----------------
+
+    def __enter__(self):
+        previous = gl.GLint()
+        gl.glGetIntegerv(gl.GL_DRAW_FRAMEBUFFER_BINDING, previous)
+        self._previous_fbo = previous.value
+        viewport = (gl.GLint * 4)()
+        gl.glGetIntegerv(gl.GL_VIEWPORT, viewport)
+        self._viewport = tuple(viewport)
+        self._projection = self.window.projection
+
+        fb_w, fb_h = self.get_framebuffer_size()
+        self.target.ensure(fb_w, fb_h)
+        self.target.bind()
+        gl.glViewport(0, 0, fb_w, fb_h)
+        self.window.projection = Mat4.orthogonal_projection(0, self.width, 0, self.height, -255, 255)
+        gl.glClearColor(0.0, 0.0, 0.0, 1.0)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.window.projection = self._projection
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self._previous_fbo)
+
+        gl.glViewport(*self.present_rect())
+        self.target.bind_texture()
+        self.program.use()
+        self.program["source"] = 0
+        self.quad.draw(gl.GL_TRIANGLE_STRIP)
+        self.program.stop()
+        gl.glViewport(*self._viewport)
+
+    def present_rect(self):
+        """Rectángulo (x, y, w, h) en píxeles de framebuffer donde se presenta."""
+        fb_w, fb_h = self.window.get_framebuffer_size()
+        scale = min(fb_w // self.width, fb_h // self.height)
+        if scale < 1:
+            scale = min(fb_w / self.width, fb_h / self.height)
+        w = int(self.width * scale)
+        h = int(self.height * scale)
+        return (fb_w - w) // 2, (fb_h - h) // 2, w, h
+
+
+class WindowScreen(VirtualScreen):
+    """
+    Pantalla a tamaño de ventana con el resize agrupado ("debounced").
+
+    Mientras se arrastra el borde de la ventana las escenas siguen viendo
+    el último tamaño asentado: se dibujan a ese tamaño en un framebuffer y
+    se estiran a la ventana (vista previa barata, sin relayout). Cuando
+    pasan ``settle`` segundos sin eventos de resize se adopta el tamaño
+    nuevo y se avisa una sola vez a los ``on_resize`` registrados.
+
+    Con el tamaño asentado se dibuja directamente en la ventana, sin pase
+    extra.
+    """
+
+    def __init__(self, window, settle=RESIZE_SETTLE, on_settle=None):
+        super().__init__(window, window.width, window.height)
+        self.target = RenderTarget(filtering=gl.GL_LINEAR)
+        self.settle = settle
+        self.on_settle = on_settle
+
+        self._framebuffer_size = window.get_framebuffer_size()
+        self._handlers = []
+        self._preview = False
+
+    def get_framebuffer_size(self):
+        return self._framebuffer_size
+
+    def push_handlers(self, *args, on_resize=None, **kwargs):
+        if on_resize is not None:
+            self._handlers.append(on_resize)
+
+    def remove_handlers(self, *args, on_resize=None, **kwargs):
+        if on_resize in self._handlers:
+            self._handlers.remove(on_resize)
+
+    @property
+    def resizing(self):
+        """True mientras la ventana no tiene el tamaño asentado."""
+        return self.window.get_framebuffer_size() != self._framebuffer_size
+
+    # ---------------- RESIZE ----------------
+
+    def window_resized(self, width, height):
+        pyglet.clock.unschedule(self._settle)
+        pyglet.clock.schedule_once(self._settle, self.settle)
+
+    def _settle(self, dt):
+        size = (self.window.width, self.window.height)
+        self._framebuffer_size = self.window.get_framebuffer_size()
+        if size == (self.width, self.height):
+            return
+        self.width, self.height = size
+        for handler in self._handlers:
+            handler(*size)
+        if self.on_settle is not None:
+            self.on_settle()
+
+    # ---------------- PASE ----------------
+
+    def __enter__(self):
+        self._preview = self.resizing
+        if self._preview:
+            super().__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._preview:
+            super().__exit__(exc_type, exc, tb)
+
+    def present_rect(self):
+        """La vista previa ocupa toda la ventana."""
+        fb_w, fb_h = self.window.get_framebuffer_size()
+        return 0, 0, fb_w, fb_h
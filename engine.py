@@ -1,62 +1,260 @@
+import time
+
 import pyglet
+from pyglet.window import key
 import assets
+from crt import CRTPostProcess, VirtualScreen, WindowScreen
+from fonts import FontService
+from perf_hud import PerfHUD, track_textures
+from preloader import Preloader
+from renderer import make_renderer
+from scene import Scene
+from texture_loader import TextureLoader
+
+SIM_RATE = 60          # pasos de simulación por segundo (fijos)
+MAX_FRAME_TIME = 0.25  # un frame más largo que esto no se recupera
+MAX_STEPS = 8          # tope de pasos por frame (evita la espiral de muerte)
 
 
 class Engine:
-    def __init__(self, width=1024, height=768, title="Incorrupta"):
+    def __init__(self, width=1024, height=768, title="Incorrupta", on_demand=True,
+                 frame_cap=None, vsync=True, renderer="gl", virtual_size=None, prewarm=True,
+                 visible=True):
         # Crear carpetas de assets si no existen
         assets.ensure_dirs()
+        # Contabilidad de memoria de texturas para el HUD (desde el inicio)
+        track_textures()
 
-        # Ventana principal (una sola ventana para todo el juego)
+        # Ventana principal (una sola ventana para todo el juego). Con
+        # visible=False sigue habiendo contexto de GL (fuentes y texturas lo
+        # necesitan con cualquier renderer), pero no se muestra nada
         self.window = pyglet.window.Window(
             width,
             height,
             caption=title,
-            resizable=True
+            resizable=True,
+            vsync=vsync,
+            visible=visible,
         )
 
-        # Diccionario de escenas registradas
+        # Donde dibujan las escenas. Con resolución virtual, p. ej. (960, 720),
+        # siempre a ese tamaño y escalado a la ventana al final; si no, a
+        # tamaño de ventana con el resize agrupado hasta que se asienta
+        if virtual_size:
+            self.screen = VirtualScreen(self.window, *virtual_size)
+        else:
+            self.screen = WindowScreen(self.window, on_settle=self.invalidate)
+        # Imágenes: decodificadas en segundo plano, subidas con presupuesto
+        self.textures = TextureLoader()
+
+        # Escenas ya construidas y factorías de las que se construyen al
+        # entrar por primera vez (o de nuevo tras descargarse)
         self.scenes = {}
+        self._factories = {}
         # Escena actual
         self.current_scene = None
+        self.current_name = None
         # Manager de media (lo puedes usar desde fuera)
         self.media = None
 
+        # Redibujado bajo demanda: las escenas estáticas (animated = False)
+        # sólo se redibujan tras invalidate(); sin cambios, el loop duerme
+        self.on_demand = on_demand
+        self._needs_redraw = True
+        self._ticking = False
+        self._running = False
+
+        # Paso fijo: on_update siempre recibe sim_step, el render va aparte.
+        # frame_cap = fps máximos de render (None = los que marque vsync;
+        # sin vsync ni cap se renderiza tan rápido como se pueda).
+        self.sim_step = 1.0 / SIM_RATE
+        self.frame_cap = frame_cap
+        self.vsync = vsync
+        self._accumulator = 0.0
+        # Fracción del siguiente paso ya transcurrida (0..1) para interpolar
+        self.frame_alpha = 0.0
+
+        # Primitivas de dibujo de las escenas ("gl", "null" o "ansi"); el
+        # glow de fósforo y la LRU de labels van dentro del backend GL
+        self.renderer = make_renderer(renderer, self.screen)
+        # Post-proceso CRT (scanlines, flicker, viñeta) en un solo pase
+        self.crt = CRTPostProcess(self.screen) if self.renderer.gl else None
+
+        # Fuentes: VT220 registrada una vez y glifos precalentados (con
+        # prewarm=False, el precalentado va en la carga de preload)
+        self.fonts = FontService()
+        self.fonts.register()
+        if prewarm:
+            self.fonts.prewarm()
+        # Carga en segundo plano del arranque (ver preload)
+        self.loader = None
+
+        # HUD de rendimiento (F3)
+        self.perf = PerfHUD(self.window, self.fonts.face())
+
         # Conectar eventos de la ventana a este objeto
         self.window.push_handlers(self)
 
     def register_scene(self, name, scene):
-        """Registra una escena con un nombre."""
-        self.scenes[name] = scene
+        """
+        Registra una escena con un nombre: ya construida o como factoría
+        (``factory(engine)``, p. ej. la clase), que no se llama hasta el
+        primer go_to a esa escena.
+        """
+        if isinstance(scene, Scene):
+            self.scenes[name] = scene
+        else:
+            self._factories[name] = scene
+            self.scenes.pop(name, None)
+
+    def get_scene(self, name):
+        """Escena ``name``, construyéndola con su factoría si hace falta."""
+        scene = self.scenes.get(name)
+        if scene is None and name in self._factories:
+            scene = self.scenes[name] = self._factories[name](self)
+        return scene
 
     def go_to(self, name, **kwargs):
         """Cambia a otra escena."""
-        if self.current_scene:
+        previous, previous_name = self.current_scene, self.current_name
+        if previous:
             try:
-                self.current_scene.on_exit()
+                previous.on_exit()
             except Exception:
                 # si una escena no implementa on_exit, no pasa nada
                 pass
+            # Descargar sólo lo que se puede volver a construir
+            if (previous.unload_on_exit and previous_name != name
+                    and previous_name in self._factories):
+                previous.unload()
+                del self.scenes[previous_name]
 
-        self.current_scene = self.scenes.get(name)
+        self.current_scene = self.get_scene(name)
+        self.current_name = name if self.current_scene else None
+        # Percentiles y medias del HUD, sólo de la escena nueva
+        self.perf.start_scene(self.current_name)
         if self.current_scene:
             self.current_scene.on_enter(**kwargs)
+        self.invalidate()
+
+    # ---------------- CARGA EN SEGUNDO PLANO ----------------
+
+    def preload(self, steps):
+        """
+        Ejecuta ``steps`` (ver Preloader) entre frames, con la escena actual
+        ya en pantalla: la ventana sale en cuanto hay algo que enseñar.
+        """
+        self.loader = Preloader(steps)
+        self.loader.start()
+
+    @property
+    def loading(self):
+        return self.loader is not None and not self.loader.done
+
+    def when_loaded(self, callback):
+        """Llama a ``callback`` ya, o cuando termine la carga de preload."""
+        if self.loader is None:
+            callback()
+        else:
+            self.loader.when_done(callback)
+
+    # ---------------- REDIBUJADO ----------------
+
+    def invalidate(self):
+        """Pide un redibujado en el próximo tick (y despierta el loop)."""
+        self._needs_redraw = True
+        if self._running and not self._ticking:
+            self._schedule_tick()
+
+    def _schedule_tick(self):
+        self._ticking = True
+        # Al despertar no hay tiempo de simulación pendiente
+        self._accumulator = 0.0
+        if self.frame_cap:
+            pyglet.clock.schedule_interval(self._tick, 1.0 / self.frame_cap)
+        else:
+            pyglet.clock.schedule(self._tick)
+
+    def _sleep(self):
+        self._ticking = False
+        pyglet.clock.unschedule(self._tick)
+
+    def set_frame_cap(self, frame_cap):
+        """Cambia el tope de fps de render en caliente (None = sin tope)."""
+        self.frame_cap = frame_cap
+        if self._ticking:
+            self._sleep()
+            self._schedule_tick()
+
+    def set_vsync(self, vsync):
+        self.vsync = vsync
+        self.window.set_vsync(vsync)
+
+    def on_resize(self, width, height):
+        self.screen.window_resized(width, height)
+        self.invalidate()
+
+    def on_expose(self):
+        self.invalidate()
 
     # 🔴 AQUÍ EL CAMBIO IMPORTANTE: ya no tragamos excepciones 🔴
     def on_draw(self):
         """Evento de dibujo de pyglet."""
+        # Texturas que ya terminó de decodificar el hilo de carga
+        self.textures.pump()
+        scene = self.current_scene
+        if not self.renderer.gl:
+            # Backend sin GL (null, ansi): sólo las primitivas de la escena
+            if scene:
+                self._scene_on_draw(scene)
+            return
+
         self.window.clear()
-        if self.current_scene:
+        if scene:
+            self.perf.begin_draw()
+            try:
+                with self.screen:
+                    self._draw_scene(scene)
+            finally:
+                self.perf.end_draw()
+
+        # HUD encima de todo, fuera del post-proceso y a resolución de ventana
+        self.perf.draw()
+
+    def _draw_scene(self, scene):
+        if not scene.crt_postprocess:
             # Dejamos que la excepción salga para verla en consola
-            self.current_scene.on_draw()
+            self._scene_on_draw(scene)
+            return
+
+        # La escena se dibuja offscreen; scanlines, flicker y viñeta
+        # se aplican después en un único pase de shader.
+        self.crt.begin()
+        try:
+            self._scene_on_draw(scene)
+        finally:
+            self.crt.end(scanline_alpha=scene.scanline_alpha)
+
+    def _scene_on_draw(self, scene):
+        self.renderer.begin_frame()
+        try:
+            scene.on_draw()
+        finally:
+            self.renderer.end_frame()
 
     def on_key_press(self, symbol, modifiers):
         """Evento de teclado de pyglet."""
+        if symbol == key.F3:
+            self.perf.toggle()
+            self.invalidate()
+            return
+
         if self.current_scene:
             try:
                 self.current_scene.on_key(symbol, modifiers)
             except Exception:
                 pass
+        self.invalidate()
 
     # Bridge para algunos handlers de pyglet
     def on_key(self, symbol, modifiers):
@@ -64,13 +262,46 @@ class Engine:
 
     def run(self):
         """Inicia el loop principal."""
-        pyglet.clock.schedule_interval(self._update, 1 / 60.0)
-        pyglet.app.run()
+        self._running = True
+        self._schedule_tick()
+        # Sin redibujado automático: lo decide _tick
+        pyglet.app.run(None)
+
+    def _tick(self, dt):
+        """
+        Un frame de render: avanza la simulación en pasos fijos con lo que
+        haya acumulado el reloj y dibuja (o duerme si la escena está quieta).
+        """
+        self._accumulator += min(dt, MAX_FRAME_TIME)
+        steps = 0
+        while self._accumulator >= self.sim_step and steps < MAX_STEPS:
+            self._update(self.sim_step)
+            self._accumulator -= self.sim_step
+            steps += 1
+        if steps == MAX_STEPS:
+            # Máquina demasiado lenta: se descarta el retraso sobrante
+            self._accumulator = min(self._accumulator, self.sim_step)
+        self.frame_alpha = self._accumulator / self.sim_step
+
+        scene = self.current_scene
+        # Con el HUD visible se redibuja siempre para medir; con imágenes
+        # cargando, también (el placeholder se cambia al llegar la textura)
+        animated = ((scene is not None and scene.animated) or self.perf.visible
+                    or self.textures.pending)
+        if self.on_demand and not animated and not self._needs_redraw:
+            # Escena estática sin cambios: nada que hacer hasta invalidate()
+            self._sleep()
+            return
+
+        self._needs_redraw = False
+        self.window.draw(dt)
 
     def _update(self, dt):
-        """Update por frame (llama on_update de la escena actual)."""
+        """Paso de simulación (llama on_update de la escena actual)."""
         if self.current_scene:
+            start = time.perf_counter()
             try:
                 self.current_scene.on_update(dt)
             except Exception:
                 pass
+            self.perf.add_update(time.perf_counter() - start)
@@ -0,0 +1,123 @@
+import ctypes
+import time
+
+import pyglet
+
+import assets
+
+VT220_FILE = "fonts/Glass_TTY_VT220.ttf"  # en assets/ (o en el paquete)
+VT220 = "Glass TTY VT220"
+COURIER = "Courier New"
+
+# Tamaños que usan las escenas (firmware, shell, terminal, ARDE, warning)
+PREWARM_SIZES = (10, 12, 13, 14, 15, 16, 18)
+# Courier New se usa siempre para el título ASCII y el caso Lancaster
+COURIER_SIZES = (10, 16)
+
+# Puntos de código que aparecen en pantalla
+PREWARM_CHARSET = (
+    "".join(chr(c) for c in range(32, 127))
+    + "¡¿ÁÉÍÑÓÚÜáéíñóúü°Δ"
+    + "–—‘’“”•…←↑→↓"
+    + "─│┌┐└┘├┤┬┴┼═║╔╗╚╝▀▄█▌▐░▒▓■"
+    + "✝✞✟⛧†‡"
+)
+
+
+class FontService:
+    """
+    Registro único de fuentes y caché de glifos compartida por las escenas.
+
+    La VT220 se registra una sola vez al arrancar (antes cada escena
+    llamaba a ``add_file`` en cada on_enter). ``prewarm`` rasteriza de
+    golpe el juego de caracteres en todos los tamaños usados, de modo que
+    los atlas de glifos ya están en GPU cuando entra la primera escena
+    (``prewarm_steps`` hace lo mismo por pasos, durante el arranque).
+
+    pyglet sólo guarda referencias débiles a las fuentes cargadas (y fuertes
+    a las tres últimas), así que al alternar tamaños una fuente podía
+    liberarse y re-rasterizarse entera. El servicio retiene cada fuente
+    precalentada durante toda la sesión.
+    """
+
+    def __init__(self):
+        self.vt220_available = False
+        self._registered = False
+        self._fonts = {}  # (nombre, tamaño) -> Font retenida
+
+    # ---------------- REGISTRO ----------------
+
+    def register(self):
+        """Registra la VT220 (sólo la primera vez). Devuelve si está disponible."""
+        if self._registered:
+            return self.vt220_available
+        self._registered = True
+
+        if not assets.exists(VT220_FILE):
+            print("[FONT] No se encontró VT220:", VT220_FILE)
+            return False
+        try:
+            # FreeType se queda su propia copia; se la damos directamente
+            # desde el paquete (o el fichero leído), sin otra intermedia
+            data = assets.read(VT220_FILE)
+            pyglet.font.add_file((ctypes.c_ubyte * len(data)).from_buffer(data))
+            self.vt220_available = True
+            print("[FONT] VT220 registrada:", VT220_FILE)
+        except Exception as e:
+            print("[FONT] Error registrando VT220:", e)
+        return self.vt220_available
+
+    def face(self):
+        """Fuente de terminal: VT220 si está registrada, si no Courier New."""
+        self.register()
+        return VT220 if self.vt220_available else COURIER
+
+    # ---------------- PRECALENTADO ----------------
+
+    def load(self, name, size):
+        """Como ``pyglet.font.load`` pero retiene la fuente."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pyglet.font.load(name, size)
+            self._fonts[key] = font
+        return font
+
+    def prewarm(self, charset=PREWARM_CHARSET):
+        """Rasteriza ``charset`` en todas las fuentes y tamaños de las escenas."""
+        start = time.perf_counter()
+        for _ in self.prewarm_steps(charset):
+            pass
+
+        print("[FONT] Glifos precalentados: %d fuentes en %.0f ms, atlas %.1f MB" % (
+            len(self._fonts),
+            (time.perf_counter() - start) * 1000,
+            self.atlas_memory() / (1024 * 1024),
+        ))
+
+    def prewarm_steps(self, charset=PREWARM_CHARSET):
+        """
+        ``prewarm`` troceado: generador que rasteriza una fuente por paso,
+        para repartirlo entre frames durante el arranque (ver Preloader).
+        """
+        faces = [(self.face(), PREWARM_SIZES)]
+        if self.vt220_available:
+            faces.append((COURIER, COURIER_SIZES))
+
+        for name, sizes in faces:
+            for size in sizes:
+                self.load(name, size).get_glyphs(charset)
+                yield
+
+    # ---------------- MEMORIA ----------------
+
+    def atlas_memory(self):
+        """Bytes de textura (RGBA) ocupados por los atlas de glifos retenidos."""
+        textures = {}
+        for font in self._fonts.values():
+            texture_bin = getattr(font, "texture_bin", None)
+            if texture_bin is None:
+                continue
+            for atlas in texture_bin.atlases:
+                textures[atlas.texture.id] = atlas.texture
+        return sum(t.width * t.height * 4 for t in textures.values())
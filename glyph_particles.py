@@ -0,0 +1,143 @@
+import pyglet
+from pyglet import gl, shapes
+from pyglet.text import Label
+
+from crt import render_to_texture
+
+ATLAS_WIDTH = 1024
+PADDING = 4
+
+
+class GlyphParticles:
+    """
+    Sistema de partículas de glifos con un pool fijo de sprites.
+
+    Los glifos y frases se rasterizan una sola vez en un atlas propio
+    (blanco sobre transparente) y cada partícula es un sprite de ese atlas
+    en un único batch. Cada frame sólo se actualizan en sitio imagen,
+    posición, escala y color a partir de arrays: no se crean Labels ni se
+    rasterizan tamaños nuevos, así que el atlas de fuentes no crece.
+
+    La última imagen del atlas es un bloque sólido para barras de ruido.
+    También puede usar un atlas externo (``attach``) con su propio shader,
+    p. ej. el de campos de distancia de sdf_glyphs.
+    """
+
+    def __init__(self, capacity, program=None, premultiplied=True):
+        self.capacity = capacity
+        self.program = program
+        self.premultiplied = premultiplied
+        self.batch = pyglet.graphics.Batch()
+        self.texture = None
+        self.regions = []
+        self.base_sizes = []  # tamaño de fuente con el que se horneó cada imagen
+        self.sprites = []
+
+    @property
+    def solid_index(self):
+        return len(self.regions) - 1
+
+    # ---------------- ATLAS ----------------
+
+    def build(self, window, items):
+        """Hornea ``items`` = [(texto, fuente, tamaño)] y crea el pool."""
+        if self.texture is not None:
+            return
+
+        batch = pyglet.graphics.Batch()
+        labels = [
+            Label(text, font_name=font_name, font_size=font_size,
+                  anchor_x="left", anchor_y="bottom", batch=batch)
+            for text, font_name, font_size in items
+        ]
+
+        # Empaquetado por estantes
+        cells = []
+        cx = cy = shelf = 0
+        for label in labels:
+            w, h = int(label.content_width) + 1, int(label.content_height) + 1
+            if cx + w > ATLAS_WIDTH:
+                cx, cy, shelf = 0, cy + shelf + PADDING, 0
+            cells.append((cx, cy, w, h))
+            label.position = (cx, cy, 0)
+            cx += w + PADDING
+            shelf = max(shelf, h)
+
+        solid = shapes.Rectangle(0, cy + shelf + PADDING, 8, 8, color=(255, 255, 255), batch=batch)
+        cells.append((2, cy + shelf + PADDING + 2, 4, 4))
+        height = cy + shelf + PADDING * 2 + 8
+
+        self.texture = pyglet.image.Texture.create(
+            ATLAS_WIDTH, height,
+            min_filter=gl.GL_LINEAR,
+            mag_filter=gl.GL_LINEAR,
+        )
+        # Cobertura corregida para componer con GL_ONE (ver attach)
+        render_to_texture(self.texture, window, batch.draw, premultiplied=self.premultiplied)
+        for label in labels:
+            label.delete()
+        solid.delete()
+
+        regions = []
+        for cx, cy, w, h in cells:
+            region = self.texture.get_region(cx, cy, w, h)
+            region.anchor_x = w // 2
+            region.anchor_y = h // 2
+            regions.append(region)
+        self.base_sizes = [font_size for _, _, font_size in items] + [None]
+        self.attach(self.texture, regions)
+
+    def attach(self, texture, regions):
+        """Crea el pool fijo sobre ``regions`` de ``texture``."""
+        if self.sprites:
+            return
+        self.texture = texture
+        self.regions = regions
+
+        if self.premultiplied:
+            blend = (gl.GL_ONE, gl.GL_ONE_MINUS_SRC_ALPHA)
+        else:
+            blend = (gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        for _ in range(self.capacity):
+            sprite = pyglet.sprite.Sprite(
+                regions[0],
+                blend_src=blend[0],
+                blend_dest=blend[1],
+                batch=self.batch,
+                program=self.program,
+            )
+            sprite.visible = False
+            self.sprites.append(sprite)
+
+    # ---------------- FRAME ----------------
+
+    def update(self, images, xs, ys, scale_x, scale_y, colors):
+        """
+        Aplica los arrays del frame al pool. ``colors`` es (n, 4) en 0-255;
+        las partículas sobrantes se ocultan.
+        """
+        count = min(len(images), self.capacity)
+        regions = self.regions
+        for i, sprite in enumerate(self.sprites):
+            if i >= count:
+                if sprite.visible:
+                    sprite.visible = False
+                continue
+
+            region = regions[images[i]]
+            if sprite.image is not region:
+                sprite.image = region
+            sprite.update(
+                x=float(xs[i]), y=float(ys[i]),
+                scale_x=float(scale_x[i]), scale_y=float(scale_y[i]),
+            )
+            r, g, b, a = (int(c) for c in colors[i])
+            if self.premultiplied:
+                # El alpha escala también el rgb
+                r, g, b = r * a // 255, g * a // 255, b * a // 255
+            sprite.color = (r, g, b, a)
+            if not sprite.visible:
+                sprite.visible = True
+
+    def draw(self):
+        self.batch.draw()
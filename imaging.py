@@ -0,0 +1,138 @@
+"""
+Operaciones de imagen en NumPy que usan tanto el horneado offline
+(bake.py) como el juego: sin atlas horneado (desarrollo), texture_loader
+arma el atlas de una animación en tiempo de carga con las mismas
+funciones, así que el resultado es idéntico.
+
+Las imágenes son arrays (alto, ancho, 4) float32 con alfa premultiplicado
+y filas de abajo arriba, como las texturas de GL.
+"""
+import hashlib
+
+import numpy as np
+
+from assets import mip_sizes
+
+SCREEN = (1920, 1200)  # pantalla más grande prevista
+
+# Animaciones: nombre -> (fotogramas en orden, caja de cada fotograma).
+# Los fotogramas se hornean juntos en un atlas (una sola textura); los
+# repetidos ocupan un único hueco.
+ATLASES = {
+    # Diablito de la terminal: ~30% del ancho útil
+    "devil_terminal_idle": (
+        ["devil_terminal_idle_1.png", "devil_terminal_idle_2.png",
+         "devil_terminal_idle_3.png", "devil_terminal_idle_4.png"],
+        (0.3, None),
+    ),
+}
+ATLAS_GAP = 8  # píxeles transparentes entre fotogramas (los mipmaps no se mezclan)
+
+
+# ---------------- HASH ----------------
+
+def content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+# ---------------- IMAGEN ----------------
+
+def target_size(box, width, height, screen):
+    """Tamaño horneado: cabe en ``box`` y nunca agranda."""
+    box_w, box_h = box
+    scale = 1.0
+    if box_w is not None:
+        scale = min(scale, box_w * screen[0] / width)
+    if box_h is not None:
+        scale = min(scale, box_h * screen[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _area_weights(n_in, n_out):
+    """Matriz (n_out x n_in) de reducción por área (promedio de caja exacto)."""
+    edges = np.arange(n_out + 1) * (n_in / n_out)
+    lo, hi = edges[:-1, None], edges[1:, None]
+    pixels = np.arange(n_in)[None, :]
+    overlap = np.clip(np.minimum(hi, pixels + 1) - np.maximum(lo, pixels), 0.0, None)
+    return (overlap / overlap.sum(axis=1, keepdims=True)).astype(np.float32)
+
+
+def resize(pixels, width, height):
+    """Reduce un array (alto, ancho, 4) premultiplicado a ``width`` x ``height``."""
+    rows = _area_weights(pixels.shape[0], height)
+    cols = _area_weights(pixels.shape[1], width)
+    return np.einsum("ij,jkc,lk->ilc", rows, pixels, cols, optimize=True)
+
+
+def read_png(path):
+    """PNG -> array (alto, ancho, 4) float32 con alfa premultiplicado, de abajo arriba."""
+    # El png puro de pyglet: pyglet.image necesitaría un contexto GL
+    from pyglet.extlibs import png
+
+    width, height, rows, _ = png.Reader(filename=path).asRGBA8()
+    pixels = np.vstack([np.frombuffer(row, dtype=np.uint8) for row in rows])
+    pixels = pixels.reshape(height, width, 4)[::-1].astype(np.float32) / 255.0
+    pixels[..., :3] *= pixels[..., 3:]
+    return pixels
+
+
+def _to_rgba8(pixels):
+    alpha = pixels[..., 3:]
+    rgb = np.divide(pixels[..., :3], alpha, out=np.zeros_like(pixels[..., :3]), where=alpha > 0)
+    out = np.concatenate([rgb, alpha], axis=2)
+    return (np.clip(out, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+def mip_levels(pixels):
+    """Cadena de mipmaps de ``pixels`` (premultiplicado) en bytes RGBA."""
+    levels = []
+    level = pixels
+    for w, h in mip_sizes(pixels.shape[1], pixels.shape[0]):
+        # Cada nivel sale del anterior: el coste total es ~1/3 del primero
+        level = resize(level, w, h)
+        levels.append(_to_rgba8(level).tobytes())
+    return levels
+
+
+# ---------------- ATLAS ----------------
+
+def build_atlas(sources, box, screen):
+    """
+    Fotogramas ``sources`` (PNG del mismo tamaño) en un atlas en rejilla.
+    Devuelve (tamaño original del fotograma, píxeles del atlas, regiones
+    (x, y, ancho, alto) por fotograma, en coordenadas de textura).
+    """
+    slots = {}  # contenido -> índice de hueco
+    regions_of = []
+    frames = []
+    for source in sources:
+        digest = content_hash(source)
+        if digest not in slots:
+            slots[digest] = len(frames)
+            frames.append(read_png(source))
+        regions_of.append(slots[digest])
+
+    height, width = frames[0].shape[:2]
+    w, h = target_size(box, width, height, screen)
+    # Rejilla de menor área (3 fotogramas distintos caben mejor en fila)
+    def area(cols):
+        rows = -(-len(frames) // cols)
+        return (cols * (w + ATLAS_GAP)) * (rows * (h + ATLAS_GAP))
+    cols = min(range(1, len(frames) + 1), key=area)
+    rows = -(-len(frames) // cols)
+    atlas = np.zeros((ATLAS_GAP + rows * (h + ATLAS_GAP),
+                      ATLAS_GAP + cols * (w + ATLAS_GAP), 4), dtype=np.float32)
+
+    slots_xy = []
+    for i, frame in enumerate(frames):
+        x = ATLAS_GAP + (i % cols) * (w + ATLAS_GAP)
+        y = ATLAS_GAP + (i // cols) * (h + ATLAS_GAP)
+        atlas[y:y + h, x:x + w] = resize(frame, w, h)
+        slots_xy.append((x, y))
+
+    regions = [[*slots_xy[slot], w, h] for slot in regions_of]
+    return (width, height), atlas, regions
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+
+CAPACITY = 64  # variantes de texto retiradas que se guardan entre todas las escenas
+
+
+class LayoutCache:
+    """
+    Caché LRU de layouts ya construidos que ahora no se ven (labels).
+
+    La usa GLRenderer: cuando una primitiva de texto cambia de variante
+    (texto, fuente, ancho...), el label anterior se guarda aquí con la clave
+    (ámbito, ..., variante) en vez de destruirse. Al volver a una variante
+    ya vista —p. ej. alternar entre pantalla completa y ventana, o mover la
+    selección de un menú— se recupera el label en vez de reconstruirlo.
+
+    Lo que sale de la caché (por capacidad, ``discard`` o ``clear``) se
+    entrega a ``on_evict`` para que el dueño lo destruya.
+    """
+
+    def __init__(self, capacity=CAPACITY, on_evict=None):
+        self.capacity = capacity
+        self.on_evict = on_evict
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def take(self, key):
+        """Saca el layout de ``key`` (None si no está)."""
+        layout = self._items.pop(key, None)
+        if layout is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return layout
+
+    def put(self, key, layout):
+        """Guarda ``layout`` como el más reciente; expulsa los más viejos."""
+        items = self._items
+        if key in items:
+            self._evict(items.pop(key))
+        items[key] = layout
+        while len(items) > self.capacity:
+            self._evict(items.popitem(last=False)[1])
+
+    def discard(self, scope):
+        """Quita los layouts de ``scope`` (primer elemento de la clave)."""
+        for key in [key for key in self._items if key[0] == scope]:
+            self._evict(self._items.pop(key))
+
+    def clear(self):
+        while self._items:
+            self._evict(self._items.popitem()[1])
+
+    def _evict(self, layout):
+        if self.on_evict is not None:
+            self.on_evict(layout)
+
+    def __len__(self):
+        return len(self._items)
@@ -2,14 +2,22 @@ import os
 from engine import Engine
 from save_manager import SaveManager
 from inventory import Inventory
-from vatican_terminal import VaticanTerminal
 from vatican_firmware import VaticanFirmware
-from vatican_warning import VaticanWarning
-from arde import Arde         
-from vatican_shell import VaticanShell
-from case_lancaster import CaseLancasterScene
 import assets
 
+# Arranque en dos etapas: para la primera sólo hacen falta Engine y el
+# firmware; el resto de escenas (y pyglet.media) se importan en
+# boot_steps, mientras se ve "Press ENTER to continue..."
+
+# Resolución interna fija (p. ej. (960, 720) o (640, 480)) escalada a la
+# ventana; None dibuja directamente a tamaño de ventana
+VIRTUAL_SIZE = None
+
+# Backend de dibujo de las escenas: 'gl' (el juego), 'null' (sólo cuenta
+# primitivas) o 'ansi' (celdas de color en la terminal desde la que se lanza;
+# la ventana sigue haciendo falta para el teclado)
+RENDERER = 'gl'
+
 
 def integrate_existing(file_path):
     if os.path.exists(file_path):
@@ -18,24 +26,76 @@ def integrate_existing(file_path):
         print('Original file missing:', file_path)
 
 
+def register_scenes(engine, save_manager, inventory):
+    """
+    Registra todas las escenas del juego (también lo usa bench.py).
+    Se construyen al entrar por primera vez, no aquí.
+    """
+    engine.register_scene('vatican_firmware', VaticanFirmware)
+    register_game_scenes(engine, save_manager, inventory)
+
+
+def register_game_scenes(engine, save_manager, inventory):
+    """Escenas que siguen al firmware (importa sus módulos)."""
+    from vatican_terminal import VaticanTerminal
+    from vatican_warning import VaticanWarning
+    from arde import Arde
+    from vatican_shell import VaticanShell
+    from case_lancaster import CaseLancasterScene
+
+    engine.register_scene('vatican_shell', VaticanShell)
+    engine.register_scene('vatican_terminal', VaticanTerminal)
+    engine.register_scene('vatican_warning', VaticanWarning)
+    engine.register_scene('case_lancaster',
+                          lambda engine: CaseLancasterScene(engine, save_manager, inventory))
+    engine.register_scene('arde', Arde)
+
+
+def boot_steps(engine, save_manager, inventory):
+    """
+    Segunda etapa del arranque (Engine.preload): cada ``yield`` es un
+    punto donde puede cortarse hasta el siguiente frame.
+    """
+    register_game_scenes(engine, save_manager, inventory)
+    yield
+
+    # Glifos de todas las fuentes y tamaños, una fuente por paso
+    yield from engine.fonts.prewarm_steps()
+
+    # El driver de audio se abre con el primer Player (terminal, Lancaster)
+    import pyglet.media
+    pyglet.media.get_audio_driver()
+    yield
+
+    # El diablito de la terminal: se decodifica en los hilos de TextureLoader
+    engine.textures.get_atlas('devil_terminal_idle')
+    yield
+
+    # Lo siguiente tras ENTER: la shell ya construida y su atlas SDF
+    # del glitch (on_enter lo encuentra cargado)
+    shell = engine.get_scene('vatican_shell')
+    yield
+    shell.symbol_atlas.load(engine.screen)
+    yield
+
+
 def main():
-    engine = Engine(1024, 720, title='Incorrupta - Refactor base')
+    # Primera etapa: ventana y firmware en pantalla cuanto antes
+    engine = Engine(1024, 720, title='Incorrupta - Refactor base', virtual_size=VIRTUAL_SIZE,
+                    renderer=RENDERER, prewarm=False)
     save_manager = SaveManager()
     inventory = Inventory()
-
-    # Registrar escenas
-    engine.register_scene('vatican_firmware', VaticanFirmware(engine))
-    engine.register_scene('vatican_shell', VaticanShell(engine))
-    engine.register_scene('vatican_terminal', VaticanTerminal(engine))
-    engine.register_scene('vatican_warning', VaticanWarning(engine))
-    engine.register_scene('case_lancaster', CaseLancasterScene(engine, save_manager, inventory))
-    engine.register_scene('arde', Arde(engine))  
+    engine.register_scene('vatican_firmware', VaticanFirmware)
 
     # si quieres enlazar con tu script viejo, ajusta esta ruta
     integrate_existing('Incorrupta2025.py')
 
     # Flujo de arranque: Firmware -> Shell -> Daemonum Index / menú -> casos
     engine.go_to('vatican_firmware')
+
+    # Segunda etapa: el resto, mientras el firmware está en pantalla
+    # (ENTER sólo espera si todavía no ha terminado)
+    engine.preload(boot_steps(engine, save_manager, inventory))
     engine.run()
 
 
@@ -1,5 +1,14 @@
 import pyglet
-import os
+
+import assets
+
+
+def _load(name, streaming=True):
+    """Source del asset ``name`` (p. ej. "audio/x.ogg") o None si no existe."""
+    if not assets.exists(name):
+        return None
+    return pyglet.media.load(name, file=assets.open_asset(name), streaming=streaming)
+
 
 class MediaManager:
     def __init__(self):
@@ -7,9 +16,9 @@ class MediaManager:
         self.current_source = None
 
     def play_sound(self, path, volume=1.0):
-        if not os.path.exists(path):
+        src = _load(path, streaming=False)
+        if src is None:
             return
-        src = pyglet.media.load(path, streaming=False)
         player = pyglet.media.Player()
         player.volume = volume
         player.queue(src)
@@ -17,10 +26,10 @@ class MediaManager:
         return player
 
     def play_music(self, path, loop=True, volume=0.6):
-        if not os.path.exists(path):
+        src = _load(path)
+        if src is None:
             return None
         self.player.next_source()
-        src = pyglet.media.load(path)
         self.player.queue(src)
         self.player.loop = loop
         self.player.volume = volume
@@ -35,9 +44,9 @@ class MediaManager:
             pass
 
     def play_video(self, path):
-        if not os.path.exists(path):
+        src = _load(path)
+        if src is None:
             return None
-        src = pyglet.media.load(path)
         player = pyglet.media.Player()
         player.queue(src)
         player.play()
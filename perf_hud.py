@@ -0,0 +1,241 @@
+import time
+import weakref
+from collections import deque
+
+import pyglet
+from pyglet import shapes
+from pyglet.graphics import vertexdomain
+from pyglet.text import Label
+
+HISTORY = 240         # frames que entran en los percentiles
+REFRESH = 0.25        # segundos entre actualizaciones del texto
+HUD_COLOR = (0, 255, 140, 255)
+
+# Un dominio con varias regiones (labels borrados o recreados en el batch)
+# dibuja con glMultiDraw*: una llamada por dominio, que también cuenta
+_DRAW_FUNCS = ("glDrawArrays", "glDrawElements", "glDrawArraysInstanced", "glDrawElementsInstanced",
+               "glMultiDrawArrays", "glMultiDrawElements")
+
+
+# ---------------- TEXTURAS ----------------
+
+_textures = weakref.WeakSet()
+_texture_create = None
+
+
+def track_textures():
+    """
+    Registra cada textura creada con ``Texture.create`` (fuentes, imágenes,
+    FBOs...). Sólo cuesta algo al crear texturas, así que va siempre puesto.
+    """
+    global _texture_create
+    if _texture_create is not None:
+        return
+    _texture_create = pyglet.image.Texture.create.__func__
+
+    def create(cls, *args, **kwargs):
+        texture = _texture_create(cls, *args, **kwargs)
+        _textures.add(texture)
+        return texture
+
+    pyglet.image.Texture.create = classmethod(create)
+
+
+def texture_memory():
+    """Bytes (RGBA8) de las texturas vivas."""
+    return sum(t.width * t.height * 4 for t in list(_textures) if t.id is not None)
+
+
+# ---------------- CONTADORES ----------------
+
+class FrameCounters:
+    """
+    Contadores por frame (draw calls, Labels y shapes construidos).
+
+    Los hooks envuelven las funciones de dibujo de pyglet y los __init__ de
+    Label/ShapeBase; sólo se instalan mientras el HUD está visible.
+    """
+
+    def __init__(self):
+        self.draw_calls = 0
+        self.labels = 0
+        self.shapes = 0
+        self._saved = []
+
+    @property
+    def installed(self):
+        return bool(self._saved)
+
+    def reset(self):
+        self.draw_calls = self.labels = self.shapes = 0
+
+    def install(self):
+        if self._saved:
+            return
+        for name in _DRAW_FUNCS:
+            self._wrap(vertexdomain, name, self._count_draw)
+        self._wrap(Label, "__init__", self._count_init("labels"))
+        self._wrap(shapes.ShapeBase, "__init__", self._count_init("shapes"))
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._saved):
+            setattr(owner, name, original)
+        self._saved = []
+
+    def _wrap(self, owner, name, make_wrapper):
+        original = getattr(owner, name)
+        self._saved.append((owner, name, original))
+        setattr(owner, name, make_wrapper(original))
+
+    def _count_draw(self, original):
+        def draw(*args):
+            self.draw_calls += 1
+            return original(*args)
+        return draw
+
+    def _count_init(self, attr):
+        def make_wrapper(original):
+            def __init__(obj, *args, **kwargs):
+                setattr(self, attr, getattr(self, attr) + 1)
+                original(obj, *args, **kwargs)
+            return __init__
+        return make_wrapper
+
+
+# ---------------- HUD ----------------
+
+class PerfHUD:
+    """
+    Overlay de rendimiento (F3). Lo dibuja Engine.on_draw encima del
+    post-proceso CRT, así que no pasa por scanlines ni glow.
+
+    Los tiempos de on_update/on_draw se miden siempre (dos perf_counter por
+    llamada); los hooks de conteo sólo existen con el HUD visible y el texto
+    se reescribe unas pocas veces por segundo.
+    """
+
+    def __init__(self, window, font_name):
+        self.window = window
+        self.font_name = font_name
+        self.visible = False
+        self.counters = FrameCounters()
+        # Escena medida: las muestras son sólo suyas (ver start_scene)
+        self.scene_name = None
+
+        self.frame_times = deque(maxlen=HISTORY)
+        self.samples = deque(maxlen=HISTORY)  # (update, draw, draws, labels, shapes)
+        self._update_time = 0.0
+        self._draw_start = 0.0
+        self._last_frame = None
+        self._last_refresh = 0.0
+
+        self.batch = None
+        self.background = None
+        self.label = None
+
+    # ---------------- CONTROL ----------------
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self._build()
+            self.counters.install()
+        else:
+            self.counters.uninstall()
+        self._clear()
+
+    def start_scene(self, name):
+        """Empieza el desglose de otra escena (Engine.go_to)."""
+        self.scene_name = name
+        self._clear()
+
+    def _clear(self):
+        self.frame_times.clear()
+        self.samples.clear()
+        self._last_frame = None
+
+    def _build(self):
+        if self.batch is not None:
+            return
+        self.batch = pyglet.graphics.Batch()
+        self.background = shapes.Rectangle(0, 0, 1, 1, color=(0, 0, 0), batch=self.batch)
+        self.background.opacity = 190
+        self.label = Label(
+            "",
+            font_name=self.font_name,
+            font_size=12,
+            multiline=True,
+            width=420,
+            anchor_y="top",
+            color=HUD_COLOR,
+            batch=self.batch,
+        )
+
+    # ---------------- MEDICIÓN ----------------
+
+    def add_update(self, seconds):
+        self._update_time += seconds
+
+    def begin_draw(self):
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            self.frame_times.append(now - self._last_frame)
+        self._last_frame = now
+        self._draw_start = now
+
+    def end_draw(self):
+        draw_time = time.perf_counter() - self._draw_start
+        counters = self.counters
+        if self.visible:
+            self.samples.append((
+                self._update_time, draw_time,
+                counters.draw_calls, counters.labels, counters.shapes,
+            ))
+        self._update_time = 0.0
+        counters.reset()
+
+    # ---------------- DIBUJO ----------------
+
+    def draw(self):
+        if not self.visible:
+            return
+        now = time.perf_counter()
+        if now - self._last_refresh >= REFRESH:
+            self._last_refresh = now
+            self._refresh()
+        self.batch.draw()
+        # El propio HUD no cuenta para el frame siguiente
+        self.counters.reset()
+
+    def _refresh(self):
+        frames = sorted(self.frame_times)
+        samples = list(self.samples)
+        n = len(samples) or 1
+
+        def pct(p):
+            if not frames:
+                return 0.0
+            return frames[min(len(frames) - 1, int(p * len(frames)))] * 1000
+
+        update_ms = sum(s[0] for s in samples) / n * 1000
+        draw_ms = sum(s[1] for s in samples) / n * 1000
+        draws = sum(s[2] for s in samples) / n
+        labels = sum(s[3] for s in samples) / n
+        built = sum(s[4] for s in samples) / n
+
+        self.label.text = "\n".join([
+            "escena  %s" % (self.scene_name or "-"),
+            "frame ms  p50 %.1f  p95 %.1f  p99 %.1f" % (pct(0.50), pct(0.95), pct(0.99)),
+            "update %.2f ms   draw %.2f ms" % (update_ms, draw_ms),
+            "draw calls/frame  %.1f" % draws,
+            "Label/frame %.2f   shapes/frame %.2f" % (labels, built),
+            "texturas  %.1f MB" % (texture_memory() / (1024 * 1024)),
+        ])
+
+        pad = 8
+        height = self.label.content_height + pad * 2
+        top = self.window.height - 10
+        self.label.position = (10 + pad, top - pad, 0)
+        self.background.position = (10, top - height)
+        self.background.width = self.label.content_width + pad * 2
+        self.background.height = height
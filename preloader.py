@@ -0,0 +1,71 @@
+import time
+
+import pyglet
+
+BUDGET_MS = 6.0        # trabajo de carga por frame mientras se ve la escena
+WAIT_BUDGET_MS = 50.0  # con alguien esperando (ENTER pulsado) se aprieta
+
+
+class Preloader:
+    """
+    Segunda etapa del arranque: trabajo troceado que corre entre frames
+    mientras la primera escena ya está en pantalla.
+
+    ``steps`` es un iterable y cada elemento consumido es un paso; un
+    generador que hace ``yield`` tras cada trozo de trabajo sirve tal cual.
+    Corre en el hilo principal (fuentes y texturas necesitan el contexto
+    de GL), con un presupuesto por frame para no tirar la animación; lo
+    pesado de verdad (decodificar imágenes) ya va en los hilos de
+    TextureLoader.
+
+    ``when_done(callback)`` llama enseguida si ya terminó, o al terminar.
+    """
+
+    def __init__(self, steps, budget_ms=BUDGET_MS, wait_budget_ms=WAIT_BUDGET_MS):
+        self._steps = iter(steps)
+        self.budget = budget_ms / 1000.0
+        self.wait_budget = wait_budget_ms / 1000.0
+        self.done = False
+        self.count = 0       # pasos ejecutados
+        self.elapsed = 0.0   # segundos de trabajo (sin contar los frames)
+        self._waiting = []
+
+    def start(self):
+        pyglet.clock.schedule(self._run)
+
+    def _run(self, dt):
+        budget = self.wait_budget if self._waiting else self.budget
+        start = time.perf_counter()
+        while not self.done and time.perf_counter() - start < budget:
+            self._step()
+
+    def _step(self):
+        start = time.perf_counter()
+        try:
+            next(self._steps)
+        except StopIteration:
+            self._finish()
+            return
+        self.count += 1
+        self.elapsed += time.perf_counter() - start
+
+    def finish(self):
+        """Ejecuta ya todo lo que queda (bloquea)."""
+        while not self.done:
+            self._step()
+
+    def _finish(self):
+        self.done = True
+        pyglet.clock.unschedule(self._run)
+        print("[BOOT] Carga en segundo plano: %d pasos en %.0f ms" % (
+            self.count, self.elapsed * 1000))
+
+        waiting, self._waiting = self._waiting, []
+        for callback in waiting:
+            callback()
+
+    def when_done(self, callback):
+        if self.done:
+            callback()
+        else:
+            self._waiting.append(callback)
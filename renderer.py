@@ -0,0 +1,445 @@
+import sys
+from contextlib import contextmanager
+
+import pyglet
+from pyglet import shapes
+from pyglet.text import Label
+
+from crt import GlowPass
+from layout_cache import LayoutCache
+
+
+class Renderer:
+    """
+    Interfaz de dibujo de las escenas (la crea y la posee Engine).
+
+    Las escenas piden primitivas cada frame —texto, rectángulos, sprites y
+    overlays— identificadas por una clave estable: una tupla cuyo primer
+    elemento es el ámbito (``Scene.draw_key`` pone el nombre de la escena),
+    que ``discard`` suelta de golpe. Cada backend decide cómo dibujarlas;
+    ``layer`` ordena las primitivas de un mismo tramo entre sí.
+
+    Lo que sólo existe en GL (shaders propios, scissor, texturas generadas)
+    va por ``effect``, con un ``fallback`` opcional hecho de primitivas para
+    los demás backends; el glow de fósforo es ``with renderer.glow():``.
+
+    ``gl`` dice si el backend dibuja con OpenGL: sin él Engine se salta el
+    post-proceso CRT y el HUD. Las escenas siguen creando fuentes, atlas y
+    texturas, así que el contexto de la ventana (headless vale) hace falta
+    igualmente; lo que no hay son draws.
+
+    ``stats`` cuenta las primitivas del último frame por tipo.
+    """
+
+    gl = False
+
+    def __init__(self, window):
+        self.window = window
+        self.stats = {}
+        self._frame = {}
+
+    # ---------------- FRAME ----------------
+
+    def begin_frame(self):
+        self._frame = {}
+
+    def end_frame(self):
+        self.stats = self._frame
+
+    def _count(self, kind):
+        self._frame[kind] = self._frame.get(kind, 0) + 1
+
+    # ---------------- PRIMITIVAS ----------------
+
+    def text(self, key, text, x, y, font_name, font_size, color,
+             width=None, multiline=False, anchor_x="left", anchor_y="baseline", layer=1):
+        self._count("text")
+
+    def rect(self, key, x, y, width, height, color, opacity=255, layer=0):
+        self._count("rect")
+
+    def sprite(self, key, image, x, y, scale=1.0, opacity=255, layer=0, scale_x=1.0, scale_y=1.0):
+        self._count("sprite")
+
+    def overlay(self, key, color, opacity=1.0, layer=2):
+        """Rectángulo a pantalla completa (``opacity`` en 0..1)."""
+        self._count("overlay")
+
+    def effect(self, draw, fallback=None):
+        """
+        Dibujo propio de GL: ``draw()`` en orden con el resto de primitivas.
+        Los backends sin GL llaman a ``fallback(renderer)`` si lo hay.
+        """
+        self._count("effect")
+        if fallback is not None:
+            fallback(self)
+
+    @contextmanager
+    def glow(self, radius=None, strength=None, opacity=1.0):
+        """Lo pedido dentro sale con glow de fósforo (ver crt.GlowPass)."""
+        self._count("glow")
+        yield self
+
+    def discard(self, scope):
+        """Olvida las primitivas retenidas de ``scope`` (escena que se descarga)."""
+
+
+class NullRenderer(Renderer):
+    """No dibuja nada: sólo cuenta primitivas (tests y benchmarks sin draws)."""
+
+
+# ---------------- GL ----------------
+
+class GLRenderer(Renderer):
+    """
+    Backend pyglet: cada clave tiene un objeto retenido (Label, Rectangle,
+    Sprite). Pedir la misma primitiva frame a frame sólo actualiza los
+    atributos que cambian; las claves que no se piden en un frame se
+    ocultan (y sus animaciones se pausan), no se destruyen.
+
+    Las primitivas van a un batch por tramo: ``glow`` y ``effect`` cierran
+    el tramo en curso y lo dibujan, así que el orden de la escena se
+    respeta con un draw por tramo y no uno por primitiva.
+
+    Un texto que cambia de variante (texto, fuente, ancho...) deja el label
+    anterior en ``layouts`` (LRU) por si vuelve a pedirse.
+    """
+
+    gl = True
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.glow_pass = GlowPass()
+        self.layouts = LayoutCache(on_evict=self._delete_retired)
+        self._groups = {}
+        self._batches = []
+        self._members = []  # por tramo: claves cuyo objeto está en su batch
+        self._objects = {}  # clave -> [tipo, objeto, capa, tramo, variante]
+        self._used = set()
+        self._pass = 0
+
+    def _group(self, layer):
+        group = self._groups.get(layer)
+        if group is None:
+            group = self._groups[layer] = pyglet.graphics.Group(order=layer)
+        return group
+
+    def _batch(self, index):
+        while len(self._batches) <= index:
+            self._batches.append(pyglet.graphics.Batch())
+            self._members.append(set())
+        return self._batches[index]
+
+    def _get(self, key, kind, layer, create, variant=None):
+        self._used.add(key)
+        entry = self._objects.get(key)
+        if entry is not None and (entry[0], entry[2], entry[4]) == (kind, layer, variant):
+            self._show(key, entry)
+            return entry[1]
+        if entry is not None:
+            self._drop(key)
+        obj = create(self._batch(self._pass), self._group(layer))
+        self._add(key, [kind, obj, layer, self._pass, variant])
+        return obj
+
+    def _add(self, key, entry):
+        self._objects[key] = entry
+        self._members[entry[3]].add(key)
+
+    def _show(self, key, entry):
+        obj = entry[1]
+        if entry[3] != self._pass:
+            # La escena cambió de orden: el objeto pasa al tramo actual
+            self._members[entry[3]].discard(key)
+            obj.batch = self._batch(self._pass)
+            entry[3] = self._pass
+            self._members[self._pass].add(key)
+        if not obj.visible:
+            obj.visible = True
+        if entry[0] == "sprite" and obj.paused and _animated(obj):
+            obj.paused = False
+
+    @staticmethod
+    def _hide(entry):
+        obj = entry[1]
+        if obj.visible:
+            obj.visible = False
+        if entry[0] == "sprite" and not obj.paused and _animated(obj):
+            obj.paused = True
+
+    def _drop(self, key):
+        """Quita ``key``: los textos quedan en la LRU, lo demás se destruye."""
+        entry = self._objects.pop(key)
+        self._members[entry[3]].discard(key)
+        if entry[0] == "text":
+            self._hide(entry)
+            self.layouts.put(key + (entry[4],), entry[1])
+        else:
+            entry[1].delete()
+
+    @staticmethod
+    def _delete_retired(label):
+        label.delete()
+
+    # ---------------- FRAME ----------------
+
+    def begin_frame(self):
+        super().begin_frame()
+        self._used = set()
+        self._pass = 0
+        self._batch(0)
+
+    def flush(self):
+        """Dibuja el tramo en curso y abre el siguiente."""
+        for key in self._members[self._pass]:
+            if key not in self._used:
+                self._hide(self._objects[key])
+        self._batches[self._pass].draw()
+        self._pass += 1
+        self._batch(self._pass)
+
+    def end_frame(self):
+        self.flush()
+        # Tramos que este frame no ha llegado a abrir
+        for key, entry in self._objects.items():
+            if key not in self._used:
+                self._hide(entry)
+        super().end_frame()
+
+    def discard(self, scope):
+        for key in [key for key in self._objects if key[0] == scope]:
+            entry = self._objects.pop(key)
+            self._members[entry[3]].discard(key)
+            entry[1].delete()
+        self.layouts.discard(scope)
+
+    # ---------------- PRIMITIVAS ----------------
+
+    @staticmethod
+    def _set(obj, attr, value):
+        if getattr(obj, attr) != value:
+            setattr(obj, attr, value)
+
+    def text(self, key, text, x, y, font_name, font_size, color,
+             width=None, multiline=False, anchor_x="left", anchor_y="baseline", layer=1):
+        self._count("text")
+        variant = (text, font_name, font_size, width, multiline, anchor_x, anchor_y, layer)
+        entry = self._objects.get(key)
+        if entry is not None and entry[4] != variant:
+            self._drop(key)
+            entry = None
+        if entry is None:
+            # Variante ya vista: el label vuelve de la LRU
+            label = self.layouts.take(key + (variant,))
+            if label is not None:
+                label.batch = self._batch(self._pass)
+                self._add(key, ["text", label, layer, self._pass, variant])
+
+        label = self._get(key, "text", layer, lambda batch, group: Label(
+            text, x=x, y=y, width=width, multiline=multiline,
+            font_name=font_name, font_size=font_size, color=color,
+            anchor_x=anchor_x, anchor_y=anchor_y, batch=batch, group=group,
+        ), variant)
+        self._set(label, "color", tuple(color))
+        if label.position[:2] != (x, y):
+            label.position = (x, y, 0)
+
+    def rect(self, key, x, y, width, height, color, opacity=255, layer=0):
+        self._count("rect")
+        self._rect(key, x, y, width, height, color, opacity, layer)
+
+    def _rect(self, key, x, y, width, height, color, opacity, layer):
+        rect = self._get(key, "rect", layer, lambda batch, group: shapes.Rectangle(
+            x, y, width, height, color=color[:3], batch=batch, group=group,
+        ))
+        self._set(rect, "position", (x, y))
+        self._set(rect, "width", width)
+        self._set(rect, "height", height)
+        self._set(rect, "color", (*color[:3], int(opacity)))
+
+    def sprite(self, key, image, x, y, scale=1.0, opacity=255, layer=0, scale_x=1.0, scale_y=1.0):
+        self._count("sprite")
+        sprite = self._get(key, "sprite", layer, lambda batch, group: pyglet.sprite.Sprite(
+            image, x=x, y=y, batch=batch, group=group,
+        ))
+        if sprite.image is not image:
+            sprite.image = image
+        if (sprite.x, sprite.y, sprite.scale, sprite.scale_x, sprite.scale_y) != (x, y, scale, scale_x, scale_y):
+            sprite.update(x=x, y=y, scale=scale, scale_x=scale_x, scale_y=scale_y)
+        self._set(sprite, "opacity", int(opacity))
+
+    def overlay(self, key, color, opacity=1.0, layer=2):
+        self._count("overlay")
+        self._rect(key, 0, 0, self.window.width, self.window.height,
+                   color, int(255 * opacity), layer)
+
+    def effect(self, draw, fallback=None):
+        self._count("effect")
+        self.flush()
+        draw()
+
+    @contextmanager
+    def glow(self, radius=None, strength=None, opacity=1.0):
+        self._count("glow")
+        self.flush()
+        with self.glow_pass.capture(radius, strength, opacity):
+            yield self
+            self.flush()
+
+
+# ---------------- CELDAS (ANSI) ----------------
+
+class AnsiRenderer(Renderer):
+    """
+    Backend de celdas de carácter: proyecta las primitivas sobre una rejilla
+    ``cols`` x ``rows`` y la vuelca con secuencias ANSI (color de 24 bits).
+    Sólo reescribe las filas que cambian respecto al frame anterior.
+    Pensado para depurar por SSH/puerto serie un kiosco sin pantalla.
+    """
+
+    def __init__(self, window, stream=None, cols=80, rows=30):
+        super().__init__(window)
+        self.stream = stream or sys.stdout
+        self.cols = cols
+        self.rows = rows
+        self._layers = []
+        self._previous = [None] * rows
+
+    def _cell(self, x, y):
+        w = max(1, self.window.width)
+        h = max(1, self.window.height)
+        return int(x / w * self.cols), int((h - y) / h * self.rows)
+
+    def begin_frame(self):
+        super().begin_frame()
+        self._layers = []
+
+    def text(self, key, text, x, y, font_name, font_size, color,
+             width=None, multiline=False, anchor_x="left", anchor_y="baseline", layer=1):
+        self._count("text")
+        self._layers.append((layer, len(self._layers), "text", (text, x, y, color, width, multiline, anchor_x)))
+
+    def rect(self, key, x, y, width, height, color, opacity=255, layer=0):
+        self._count("rect")
+        self._layers.append((layer, len(self._layers), "rect", (x, y, width, height, color, opacity / 255)))
+
+    def sprite(self, key, image, x, y, scale=1.0, opacity=255, layer=0, scale_x=1.0, scale_y=1.0):
+        self._count("sprite")
+        if isinstance(image, pyglet.image.Animation):
+            image = image.frames[0].image
+        sx, sy = scale * scale_x, scale * scale_y
+        x0 = x - image.anchor_x * sx
+        y0 = y - image.anchor_y * sy
+        self._layers.append((layer, len(self._layers), "sprite",
+                             (x0, y0, image.width * sx, image.height * sy)))
+
+    def overlay(self, key, color, opacity=1.0, layer=2):
+        self._count("overlay")
+        self._layers.append((layer, len(self._layers), "rect",
+                             (0, 0, self.window.width, self.window.height, color, opacity)))
+
+    def end_frame(self):
+        cols, rows = self.cols, self.rows
+        chars = [[" "] * cols for _ in range(rows)]
+        fg = [[(200, 200, 200)] * cols for _ in range(rows)]
+        bg = [[(0, 0, 0)] * cols for _ in range(rows)]
+
+        for _, _, kind, args in sorted(self._layers, key=lambda item: item[:2]):
+            if kind == "rect":
+                x, y, w, h, color, alpha = args
+                c0, r1 = self._cell(x, y)
+                c1, r0 = self._cell(x + w, y + h)
+                for r in range(max(0, r0), min(rows, r1 + 1)):
+                    for c in range(max(0, c0), min(cols, c1)):
+                        bg[r][c] = _mix(bg[r][c], color[:3], alpha)
+            elif kind == "sprite":
+                x, y, w, h = args
+                c0, r1 = self._cell(x, y)
+                c1, r0 = self._cell(x + w, y + h)
+                for r in range(max(0, r0), min(rows, r1)):
+                    for c in range(max(0, c0), min(cols, c1)):
+                        chars[r][c] = "░"
+                        fg[r][c] = (120, 120, 120)
+            else:
+                text, x, y, color, width, multiline, anchor_x = args
+                # El alpha del texto (fades, flicker) mezcla con el fondo
+                alpha = color[3] / 255 if len(color) > 3 else 1.0
+                col, row = self._cell(x, y)
+                span = self._cell(x + width, y)[0] - col if width else cols
+                for line in _wrap(text, max(1, span), multiline):
+                    start = col
+                    if anchor_x == "center":
+                        start -= len(line) // 2
+                    elif anchor_x == "right":
+                        start -= len(line)
+                    if 0 <= row < rows:
+                        for i, ch in enumerate(line):
+                            c = start + i
+                            if 0 <= c < cols:
+                                chars[row][c] = ch
+                                fg[row][c] = _mix(bg[row][c], color[:3], alpha)
+                    row += 1
+
+        out = []
+        for r in range(rows):
+            line = _ansi_row(chars[r], fg[r], bg[r])
+            if line != self._previous[r]:
+                self._previous[r] = line
+                out.append("\x1b[%d;1H%s" % (r + 1, line))
+        if out:
+            self.stream.write("".join(out) + "\x1b[0m")
+            self.stream.flush()
+        super().end_frame()
+
+
+def _animated(sprite):
+    """Si el sprite muestra una Animation (pausar uno estático rompe pyglet)."""
+    return isinstance(sprite.image, pyglet.image.Animation)
+
+
+def _mix(base, color, alpha):
+    return tuple(int(b + (c - b) * alpha) for b, c in zip(base, color))
+
+
+def _wrap(text, width, multiline):
+    lines = text.split("\n") if multiline else [text.replace("\n", " ")]
+    if not multiline:
+        return lines
+    wrapped = []
+    for line in lines:
+        while len(line) > width:
+            cut = line.rfind(" ", 0, width + 1)
+            if cut <= 0:
+                cut = width
+            wrapped.append(line[:cut])
+            line = line[cut:].lstrip(" ")
+        wrapped.append(line)
+    return wrapped
+
+
+def _ansi_row(chars, fg, bg):
+    parts = []
+    current = None
+    for ch, f, b in zip(chars, fg, bg):
+        if (f, b) != current:
+            current = (f, b)
+            parts.append("\x1b[38;2;%d;%d;%dm\x1b[48;2;%d;%d;%dm" % (*f, *b))
+        parts.append(ch)
+    return "".join(parts)
+
+
+# ---------------- FÁBRICA ----------------
+
+RENDERERS = {
+    "gl": GLRenderer,
+    "null": NullRenderer,
+    "ansi": AnsiRenderer,
+}
+
+
+def make_renderer(kind, window):
+    """Crea el backend ``kind`` ("gl", "null" o "ansi")."""
+    try:
+        return RENDERERS[kind](window)
+    except KeyError:
+        raise ValueError("Renderer desconocido: %r (opciones: %s)" % (kind, ", ".join(RENDERERS)))
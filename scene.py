@@ -1,7 +1,95 @@
+import pyglet
+
+
+class DirtyFlag:
+    """
+    Flag de "hay que reconstruir" (``_text_dirty``, ``_labels_dirty``...).
+    Al ponerse a True pide además un redibujado a Engine, así las escenas
+    estáticas no necesitan redibujar cada frame para enterarse.
+    """
+
+    def __set_name__(self, owner, name):
+        self.attr = "_flag" + name
+
+    def __get__(self, scene, owner=None):
+        if scene is None:
+            return self
+        return scene.__dict__.get(self.attr, False)
+
+    def __set__(self, scene, value):
+        scene.__dict__[self.attr] = value
+        if value:
+            scene.invalidate()
+
+
 class Scene:
     """Base para escenas (menú, intro, casos, etc.)."""
+
+    # Post-proceso CRT aplicado por Engine.on_draw
+    crt_postprocess = True
+    scanline_alpha = 55
+
+    # True: se redibuja cada frame. False: sólo tras invalidate()
+    # (teclas, resize o un flag dirty que cambia)
+    animated = True
+
+    # True: al salir, Engine la descarga (``unload``) y, si se registró con
+    # una factoría, la vuelve a construir en el siguiente go_to. Para
+    # escenas de paso o que rehacen su estado en on_enter.
+    unload_on_exit = False
+
+    _text_dirty = DirtyFlag()
+    _labels_dirty = DirtyFlag()
+
     def __init__(self, engine):
         self.engine = engine
+        self._scheduled = set()  # callbacks programados en pyglet.clock
+
+    def invalidate(self):
+        """Pide a Engine un redibujado (sólo si es la escena activa)."""
+        engine = getattr(self, "engine", None)
+        if engine is not None and engine.current_scene is self:
+            engine.invalidate()
+
+    def draw_key(self, *parts):
+        """Clave de una primitiva de ``engine.renderer`` propia de esta escena."""
+        return (type(self).__name__,) + parts
+
+    # ---------------- RELOJ ----------------
+
+    def schedule_interval(self, func, interval):
+        """pyglet.clock.schedule_interval que ``unload`` sabe deshacer."""
+        self._scheduled.add(func)
+        pyglet.clock.schedule_interval(func, interval)
+
+    def schedule_once(self, func, delay):
+        """Como schedule_interval, pero se olvida de ``func`` al dispararse."""
+        def fire(dt, *args, **kwargs):
+            self._scheduled.discard(fire)
+            func(dt, *args, **kwargs)
+        fire.__wrapped__ = func
+        self._scheduled.add(fire)
+        pyglet.clock.schedule_once(fire, delay)
+
+    def unschedule(self, func):
+        for scheduled in [s for s in self._scheduled
+                          if s is func or getattr(s, "__wrapped__", None) is func]:
+            self._scheduled.discard(scheduled)
+            pyglet.clock.unschedule(scheduled)
+        pyglet.clock.unschedule(func)
+
+    # ---------------- CICLO DE VIDA ----------------
+
+    def unload(self):
+        """
+        Suelta lo que retiene la escena: callbacks del reloj y primitivas
+        del renderer (``draw_key``). Las subclases añaden sus texturas,
+        consolas y players.
+        """
+        for func in self._scheduled:
+            pyglet.clock.unschedule(func)
+        self._scheduled.clear()
+        self.engine.renderer.discard(type(self).__name__)
 
     def on_enter(self, **kwargs):
         pass
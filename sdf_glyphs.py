@@ -0,0 +1,183 @@
+import hashlib
+import os
+
+import numpy as np
+import pyglet
+from pyglet import gl
+from pyglet.graphics.shader import Shader, ShaderProgram
+from pyglet.text import Label
+
+import assets
+from crt import render_to_texture
+
+CACHE_VERSION = 1
+
+CELL = 128         # texels por glifo en el atlas final
+SUPERSAMPLE = 4    # resolución de la máscara respecto al atlas
+SPREAD = 12        # distancia (en texels del atlas) codificada en 0..1
+RENDER_SIZE = 224  # tamaño de fuente con el que se rasteriza la máscara
+
+_FRAGMENT_SOURCE = """#version 150 core
+in vec4 vertex_colors;
+in vec3 texture_coords;
+out vec4 final_colors;
+
+uniform sampler2D sprite_texture;
+
+void main()
+{
+    // 0.5 = borde del glifo; fwidth mantiene el borde nítido a cualquier escala
+    float d = texture(sprite_texture, texture_coords.xy).r;
+    float w = max(fwidth(d), 0.0001);
+    float coverage = smoothstep(0.5 - w, 0.5 + w, d);
+    final_colors = vec4(vertex_colors.rgb, vertex_colors.a * coverage);
+}
+"""
+
+
+class SDFGlyphAtlas:
+    """
+    Atlas de campos de distancia con signo para los símbolos grandes.
+
+    Cada símbolo se rasteriza una vez a alta resolución, se convierte en un
+    campo de distancia de CELL x CELL y se guarda en assets/cache, así que
+    sólo el primer arranque paga la generación. Se dibuja con sprites y un
+    shader de distancia: el coste y la nitidez no dependen de la escala.
+    """
+
+    def __init__(self, symbols, font_name="Courier New"):
+        self.symbols = list(symbols)
+        self.font_name = font_name
+
+        self.texture = None
+        self.regions = []
+        self.program = None
+
+        # Tamaño de fuente equivalente a escala 1
+        self.base_size = RENDER_SIZE / SUPERSAMPLE
+
+    # ---------------- CACHÉ ----------------
+
+    def cache_path(self):
+        key = "|".join([str(CACHE_VERSION), self.font_name, str(CELL), str(SUPERSAMPLE),
+                        str(SPREAD), str(RENDER_SIZE)] + self.symbols)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(assets.CACHE_DIR, f"sdf_{digest}.npy")
+
+    def load(self, window):
+        """Carga el atlas de disco o lo genera (y lo cachea) la primera vez."""
+        if self.texture is not None:
+            return
+
+        path = self.cache_path()
+        field = None
+        if os.path.exists(path):
+            try:
+                field = np.load(path)
+            except (OSError, ValueError) as e:
+                print("[SDF] Caché inválida, regenerando:", e)
+
+        if field is None or field.shape != (CELL, CELL * len(self.symbols)):
+            field = self._generate(window)
+            try:
+                os.makedirs(assets.CACHE_DIR, exist_ok=True)
+                np.save(path, field)
+            except OSError as e:
+                print("[SDF] No se pudo guardar la caché:", e)
+
+        self._upload(field)
+
+    # ---------------- GENERACIÓN ----------------
+
+    def _generate(self, window):
+        hi = CELL * SUPERSAMPLE
+        width = hi * len(self.symbols)
+
+        batch = pyglet.graphics.Batch()
+        labels = [
+            Label(symbol, font_name=self.font_name, font_size=RENDER_SIZE,
+                  x=i * hi + hi // 2, y=hi // 2,
+                  anchor_x="center", anchor_y="center", batch=batch)
+            for i, symbol in enumerate(self.symbols)
+        ]
+        target = pyglet.image.Texture.create(width, hi)
+        render_to_texture(target, window, batch.draw)
+        for label in labels:
+            label.delete()
+
+        data = target.get_image_data().get_data("RGBA", width * 4)
+        target.delete()
+        alpha = np.frombuffer(data, dtype=np.uint8).reshape(hi, width, 4)[..., 3]
+
+        cells = [
+            self._distance_field(alpha[:, i * hi:(i + 1) * hi] > 127)
+            for i in range(len(self.symbols))
+        ]
+        return np.hstack(cells)
+
+    @staticmethod
+    def _distance_field(mask):
+        """Distancia con signo (dentro > 0.5) de cada texel al borde de ``mask``."""
+        # Píxeles de borde: dentro con algún vecino fuera (4-conexión)
+        padded = np.pad(mask, 1)
+        interior = (padded[1:-1, :-2] & padded[1:-1, 2:] & padded[:-2, 1:-1] & padded[2:, 1:-1])
+        edge_y, edge_x = np.nonzero(mask & ~interior)
+
+        # Centros de los texels del atlas en coordenadas de la máscara
+        centers = (np.arange(CELL) + 0.5) * SUPERSAMPLE
+        field = np.zeros((CELL, CELL), dtype=np.uint8)
+        if len(edge_x) == 0:
+            return field
+
+        spread = SPREAD * SUPERSAMPLE
+        cx = centers[None, :, None]
+        for row in range(CELL):
+            cy = centers[row]
+            near = np.abs(edge_y - cy) <= spread
+            if not near.any():
+                dist = np.full(CELL, float(spread))
+            else:
+                dx = cx - edge_x[near][None, None, :]
+                dy = cy - edge_y[near][None, None, :]
+                dist = np.sqrt(dx * dx + dy * dy).min(axis=2)[0]
+            inside = mask[int(cy), centers.astype(int)]
+            signed = np.where(inside, dist, -dist) / (2 * spread) + 0.5
+            field[row] = np.clip(signed * 255, 0, 255).astype(np.uint8)
+        return field
+
+    # ---------------- GPU ----------------
+
+    def _upload(self, field):
+        height, width = field.shape
+        rgba = np.repeat(field[..., None], 4, axis=2)
+        image = pyglet.image.ImageData(width, height, "RGBA", rgba.tobytes())
+
+        self.texture = pyglet.image.Texture.create(
+            width, height,
+            min_filter=gl.GL_LINEAR,
+            mag_filter=gl.GL_LINEAR,
+        )
+        self.texture.blit_into(image, 0, 0, 0)
+
+        self.regions = []
+        for i in range(len(self.symbols)):
+            region = self.texture.get_region(i * CELL, 0, CELL, CELL)
+            region.anchor_x = CELL // 2
+            region.anchor_y = CELL // 2
+            self.regions.append(region)
+
+        self.program = ShaderProgram(
+            Shader(pyglet.sprite.vertex_source, "vertex"),
+            Shader(_FRAGMENT_SOURCE, "fragment"),
+        )
+
+
+if __name__ == "__main__":
+    # Genera la caché en tiempo de build: python sdf_glyphs.py
+    from vatican_shell import GLITCH_SYMBOLS
+
+    window = pyglet.window.Window(visible=False)
+    atlas = SDFGlyphAtlas(GLITCH_SYMBOLS)
+    atlas.load(window)
+    print("[SDF] Atlas listo:", atlas.cache_path())
+    window.close()
@@ -0,0 +1,296 @@
+import ctypes
+import queue
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pyglet
+from pyglet import gl
+
+import assets
+import imaging
+
+UPLOAD_BUDGET_MS = 4.0  # tiempo máximo de subidas a GPU por frame
+GPU_CAP_MB = 192        # tope de memoria de las texturas cacheadas
+WORKERS = 2             # hilos de decodificación
+
+PLACEHOLDER_COLOR = (0, 40, 20, 255)
+
+
+def _decode(asset):
+    """
+    Hilo de trabajo: la imagen en bytes RGBA listos para subir (no toca GL).
+    Devuelve (ancho, alto, [datos por nivel de mipmap]).
+    """
+    if asset.endswith(assets.BAKED_EXTENSION):
+        # Horneada por bake.py: ya viene reducida y con mipmaps, y los
+        # niveles son slices del paquete o del fichero leído
+        return assets.read_baked(assets.read(asset))
+    image = pyglet.image.load(asset, file=assets.open_asset(asset))
+    return image.width, image.height, [image.get_data("RGBA", image.width * 4)]
+
+
+def _build_atlas(name):
+    """
+    Hilo de trabajo, sin hornear (desarrollo): arma el atlas ``name`` de
+    imaging.ATLASES a partir de los PNG, igual que lo haría bake.py.
+    Devuelve (ancho, alto, niveles, tamaño original del fotograma, regiones).
+    """
+    frames, box = imaging.ATLASES[name]
+    sources = [assets.path("images/" + frame) for frame in frames]
+    size, pixels, regions = imaging.build_atlas(sources, box, imaging.SCREEN)
+    height, width = pixels.shape[:2]
+    return width, height, imaging.mip_levels(pixels), size, regions
+
+
+def _upload(width, height, levels):
+    """Crea la textura y sube sus niveles (hilo de GL)."""
+    mipmapped = len(levels) > 1
+    texture = pyglet.image.Texture.create(
+        width, height, internalformat=None,
+        min_filter=gl.GL_LINEAR_MIPMAP_LINEAR if mipmapped else gl.GL_LINEAR,
+        mag_filter=gl.GL_LINEAR,
+    )
+    gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+    for level, ((w, h), data) in enumerate(zip(assets.mip_sizes(width, height), levels)):
+        if isinstance(data, memoryview):
+            # Sin copiar: ctypes apunta directamente al buffer (o al mmap)
+            data = (ctypes.c_ubyte * len(data)).from_buffer(data)
+        gl.glTexImage2D(texture.target, level, gl.GL_RGBA8, w, h, 0,
+                        gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, data)
+    gl.glTexParameteri(texture.target, gl.GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+    gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 4)
+    return texture
+
+
+class TextureHandle:
+    """
+    Textura que puede no estar en GPU todavía.
+
+    ``image`` es la textura ya subida o, mientras tanto, el placeholder;
+    ``width``/``height`` son los de la imagen original desde el primer
+    momento (manifest o cabecera del PNG), así que la escena puede maquetar
+    sin esperar. La textura horneada puede ser más pequeña: para dibujar,
+    escalar a ``width``/``height`` con el tamaño real de ``image``.
+    """
+
+    def __init__(self, loader, name, asset):
+        self.loader = loader
+        self.name = name
+        self.asset = asset  # nombre en assets/ (horneada o PNG)
+        self.state = "pending"  # pending | ready | missing | evicted
+        self.texture = None
+        self.size = assets.image_size(name)
+        self.bytes = 0
+        self.last_used = 0
+
+    def available(self):
+        return assets.exists(self.asset)
+
+    def load(self):
+        """Hilo de trabajo: (ancho, alto, niveles) listos para ``_upload``."""
+        return _decode(self.asset)
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    @property
+    def missing(self):
+        return self.state == "missing"
+
+    @property
+    def image(self):
+        if self.texture is not None:
+            return self.texture
+        return self.loader.placeholder
+
+    @property
+    def width(self):
+        return self.size[0] if self.size else self.image.width
+
+    @property
+    def height(self):
+        return self.size[1] if self.size else self.image.height
+
+
+class AtlasHandle(TextureHandle):
+    """
+    Atlas de fotogramas de una animación (imaging.ATLASES): una sola textura
+    con todos los fotogramas. ``width``/``height`` son los de un fotograma
+    original; ``animation`` reparte la textura en regiones, así que
+    cambiar de fotograma sólo cambia coordenadas de textura.
+    """
+
+    def __init__(self, loader, name, asset, entry):
+        super().__init__(loader, name, asset)
+        self.entry = entry
+        self.size = tuple(entry["size"]) if entry else None
+        self.regions = entry["regions"] if entry else None
+        self._animation = None
+        self._animation_key = None
+
+    def available(self):
+        if self.entry:
+            return super().available()
+        frames, _ = imaging.ATLASES.get(self.name, ((), None))
+        return bool(frames) and all(assets.exists("images/" + frame) for frame in frames)
+
+    def load(self):
+        if self.entry:
+            return super().load()
+        width, height, levels, size, regions = _build_atlas(self.name)
+        self.size, self.regions = size, regions
+        return width, height, levels
+
+    @property
+    def frame_size(self):
+        """Tamaño de un fotograma dentro del atlas."""
+        return tuple(self.regions[0][2:])
+
+    def animation(self, frame_time):
+        """pyglet Animation sobre regiones de la textura (None si aún no está)."""
+        if not self.ready:
+            return None
+        key = (self.texture, frame_time)
+        if self._animation_key != key:
+            frames = [self.texture.get_region(*region) for region in self.regions]
+            self._animation = pyglet.image.Animation.from_image_sequence(frames, frame_time)
+            self._animation_key = key
+        return self._animation
+
+
+class TextureLoader:
+    """
+    Cargador de imágenes de ``assets/images`` en segundo plano.
+
+    ``get(nombre)`` devuelve enseguida un TextureHandle; el PNG se decodifica
+    en un hilo y ``pump`` (una vez por frame, en el hilo de GL) sube a GPU
+    lo que ya esté listo sin pasarse de ``upload_budget_ms``.
+
+    Las texturas subidas viven en una LRU con tope de memoria: al pasarse,
+    se liberan las menos usadas que no se hayan pedido en el último frame.
+    Un handle liberado vuelve a cargarse solo la próxima vez que se pida.
+    """
+
+    def __init__(self, upload_budget_ms=UPLOAD_BUDGET_MS, gpu_cap_mb=GPU_CAP_MB, workers=WORKERS):
+        self.upload_budget = upload_budget_ms / 1000.0
+        self.gpu_cap = int(gpu_cap_mb * 1024 * 1024)
+        self.gpu_bytes = 0
+
+        self._handles = OrderedDict()  # asset -> handle, de menos a más reciente
+        self._done = queue.Queue()     # (handle, future) ya decodificados
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="texture")
+        self._in_flight = 0
+        self._frame = 0
+        self._placeholder = None
+
+    @property
+    def placeholder(self):
+        """Textura de 1x1 que se estira al tamaño de la imagen mientras carga."""
+        if self._placeholder is None:
+            pattern = pyglet.image.SolidColorImagePattern(PLACEHOLDER_COLOR)
+            self._placeholder = pattern.create_image(1, 1).get_texture()
+        return self._placeholder
+
+    @property
+    def pending(self):
+        """True mientras quede alguna imagen por decodificar o subir."""
+        return self._in_flight > 0
+
+    # ---------------- PETICIONES ----------------
+
+    def get(self, name):
+        """
+        Handle de ``name`` (relativo a assets/images); arranca la carga si
+        hace falta. Nombres que el manifest resuelve al mismo fichero
+        (duplicados) comparten handle y textura.
+        """
+        return self._get(assets.image_file(name),
+                         lambda asset: TextureHandle(self, name, asset))
+
+    def get_atlas(self, name):
+        """Handle del atlas de animación ``name`` (ver imaging.ATLASES)."""
+        entry = assets.atlas_entry(name)
+        asset = "baked/" + entry["file"] if entry else "atlas/" + name
+        return self._get(asset, lambda asset: AtlasHandle(self, name, asset, entry))
+
+    def _get(self, asset, make):
+        handle = self._handles.get(asset)
+        if handle is None:
+            handle = self._handles[asset] = make(asset)
+            self._request(handle)
+        else:
+            self._handles.move_to_end(asset)
+            if handle.state == "evicted":
+                self._request(handle)
+        handle.last_used = self._frame
+        return handle
+
+    def _request(self, handle):
+        if not handle.available():
+            print("[TEX] No existe", handle.asset)
+            handle.state = "missing"
+            return
+        handle.state = "pending"
+        self._in_flight += 1
+        future = self._pool.submit(handle.load)
+        future.add_done_callback(lambda f: self._done.put((handle, f)))
+
+    # ---------------- SUBIDA ----------------
+
+    def pump(self):
+        """
+        Sube a GPU lo ya decodificado hasta agotar el presupuesto del frame
+        (al menos una imagen por llamada). Devuelve True si subió algo.
+        """
+        self._frame += 1
+        start = time.perf_counter()
+        uploaded = False
+        while not uploaded or time.perf_counter() - start < self.upload_budget:
+            try:
+                handle, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._in_flight -= 1
+            try:
+                width, height, levels = future.result()
+            except Exception as e:
+                print("[TEX] No se pudo decodificar", handle.name, e)
+                handle.state = "missing"
+                continue
+
+            handle.texture = _upload(width, height, levels)
+            if handle.size is None:
+                handle.size = (width, height)
+            handle.bytes = sum(len(data) for data in levels)
+            handle.state = "ready"
+            self.gpu_bytes += handle.bytes
+            uploaded = True
+
+        if self.gpu_bytes > self.gpu_cap:
+            self._evict()
+        return uploaded
+
+    # ---------------- LRU ----------------
+
+    def _evict(self):
+        for handle in list(self._handles.values()):
+            if self.gpu_bytes <= self.gpu_cap:
+                break
+            # Lo pedido en el frame anterior sigue en pantalla
+            if handle.ready and handle.last_used < self._frame - 1:
+                self.release(handle)
+
+    def release(self, handle):
+        """Libera la textura de ``handle`` (se recargará si se vuelve a pedir)."""
+        if handle.texture is None:
+            return
+        self.gpu_bytes -= handle.bytes
+        handle.texture.delete()
+        handle.texture = None
+        handle.state = "evicted"
+
+    def clear(self):
+        for handle in self._handles.values():
+            self.release(handle)
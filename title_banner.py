@@ -0,0 +1,169 @@
+import math
+
+import pyglet
+from pyglet import gl
+from pyglet.text import Label
+
+from crt import render_to_texture
+
+
+class TitleBanner:
+    """
+    Título ASCII pre-horneado en una textura.
+
+    Las líneas se rasterizan una sola vez por paleta/tamaño con el degradado
+    ya aplicado. La revelación carácter a carácter es un recorte (scissor)
+    sobre la misma textura y los fantasmas del glitch son redibujados
+    desplazados de una banda de líneas: un puñado de draws por frame.
+    """
+
+    def __init__(self, font_name="Courier New", font_size=10, line_height=14):
+        self.font_name = font_name
+        self.font_size = font_size
+        self.line_height = line_height
+
+        self.texture = None
+        self.sprite = None
+        self._key = None
+
+        self.lines = []
+        self.text_length = 0
+        self._baselines = []  # baseline de cada línea dentro de la textura
+        self._advances = []   # x acumulada de cada carácter por línea
+        self._ascent = 0
+        self._descent = 0
+
+    # ---------------- HORNEADO ----------------
+
+    def bake(self, text, colors, window):
+        """Rasteriza ``text`` con un color por línea (sólo si cambió algo)."""
+        key = (text, tuple(colors))
+        if key == self._key:
+            return
+        self._key = key
+
+        self.lines = text.splitlines()
+        self.text_length = len(text)
+
+        font = pyglet.font.load(self.font_name, self.font_size)
+        self._ascent = math.ceil(font.ascent)
+        self._descent = math.floor(font.descent)
+
+        self._advances = []
+        for line in self.lines:
+            xs = [0]
+            glyphs, _ = font.get_glyphs(line)
+            for glyph in glyphs:
+                xs.append(xs[-1] + glyph.advance)
+            self._advances.append(xs)
+
+        width = max(1, max((xs[-1] for xs in self._advances), default=1))
+        height = self._ascent - self._descent + max(0, len(self.lines) - 1) * self.line_height
+        self._baselines = [
+            height - self._ascent - i * self.line_height for i in range(len(self.lines))
+        ]
+
+        if self.texture is not None:
+            self.sprite.delete()
+            self.texture.delete()
+        self.texture = pyglet.image.Texture.create(
+            width, height,
+            min_filter=gl.GL_NEAREST,
+            mag_filter=gl.GL_NEAREST,
+        )
+
+        batch = pyglet.graphics.Batch()
+        labels = [
+            Label(
+                line,
+                x=0,
+                y=baseline,
+                font_name=self.font_name,
+                font_size=self.font_size,
+                anchor_x="left",
+                anchor_y="baseline",
+                color=color,
+                batch=batch,
+            )
+            for line, baseline, color in zip(self.lines, self._baselines, colors)
+        ]
+        render_to_texture(self.texture, window, batch.draw, premultiplied=True)
+        for label in labels:
+            label.delete()
+
+        # La textura queda premultiplicada, con la cobertura real en alpha
+        self.sprite = pyglet.sprite.Sprite(
+            self.texture,
+            blend_src=gl.GL_ONE,
+            blend_dest=gl.GL_ONE_MINUS_SRC_ALPHA,
+        )
+
+    # ---------------- DIBUJO ----------------
+
+    def line_baseline(self, index, top_y):
+        """Baseline en pantalla de la línea ``index`` (top_y = primera línea)."""
+        return top_y - index * self.line_height
+
+    def draw(self, x, top_y, revealed, alpha=255, pixel_scale=1.0):
+        """Dibuja los primeros ``revealed`` caracteres recortando la textura."""
+        if self.sprite is None or revealed <= 0:
+            return
+
+        origin_y = top_y - self._baselines[0] if self._baselines else top_y
+        self._set_sprite(x, origin_y, alpha)
+
+        if revealed >= self.text_length:
+            self.sprite.draw()
+            return
+
+        # Líneas completas + la línea en curso hasta el último carácter
+        done = 0
+        remaining = revealed
+        while done < len(self.lines) and remaining > len(self.lines[done]):
+            remaining -= len(self.lines[done]) + 1
+            done += 1
+
+        gl.glEnable(gl.GL_SCISSOR_TEST)
+        if done:
+            bottom = self._baselines[done - 1] + self._descent
+            self._scissor(x, origin_y + bottom, self.texture.width, self.texture.height - bottom, pixel_scale)
+            self.sprite.draw()
+        if done < len(self.lines) and remaining > 0:
+            baseline = self._baselines[done]
+            width = self._advances[done][min(remaining, len(self._advances[done]) - 1)]
+            self._scissor(x, origin_y + baseline + self._descent, width, self._ascent - self._descent, pixel_scale)
+            self.sprite.draw()
+        gl.glDisable(gl.GL_SCISSOR_TEST)
+
+    def draw_ghost(self, index, x, top_y, dx, dy, alpha=180, pixel_scale=1.0):
+        """Fantasma del glitch: la banda de la línea ``index`` desplazada."""
+        if self.sprite is None or not 0 <= index < len(self.lines):
+            return
+        origin_y = top_y - self._baselines[0]
+        baseline = self._baselines[index]
+        self._set_sprite(x + dx, origin_y + dy, alpha)
+
+        gl.glEnable(gl.GL_SCISSOR_TEST)
+        self._scissor(
+            x + dx, origin_y + dy + baseline + self._descent,
+            self.texture.width, self._ascent - self._descent, pixel_scale,
+        )
+        self.sprite.draw()
+        gl.glDisable(gl.GL_SCISSOR_TEST)
+
+    def _set_sprite(self, x, y, alpha):
+        if self.sprite.position[:2] != (x, y):
+            self.sprite.position = (x, y, 0)
+        # Premultiplicado: el alpha escala también el rgb
+        tint = (alpha, alpha, alpha, alpha)
+        if self.sprite.color != tint:
+            self.sprite.color = tint
+
+    @staticmethod
+    def _scissor(x, y, w, h, pixel_scale):
+        gl.glScissor(
+            int(x * pixel_scale),
+            int(y * pixel_scale),
+            max(0, math.ceil(w * pixel_scale)),
+            max(0, math.ceil(h * pixel_scale)),
+        )
@@ -1,20 +1,5 @@
 from scene import Scene
-from pyglet.text import Label
-from pyglet import shapes
-import pyglet
-import os
-import random
-
-# -----------------------
-# CONFIGURACIÓN DE FUENTE
-# -----------------------
-
-FONT_FILE = os.path.join(
-    os.path.dirname(__file__),
-    'assets', 'fonts', 'Glass_TTY_VT220.ttf'
-)
-
-FONT_NAME = "Glass TTY VT220"
+from crt import CRTFrame, BootNoise
 
 COLOR_PRESETS = {
     "green":  (0, 255, 140, 255),
@@ -23,8 +8,6 @@ COLOR_PRESETS = {
     "purple": (200, 120, 255, 255),
 }
 
-SCREEN_MARGIN = 80  # margen del monitor dentro de la ventana
-
 
 class VaticanFirmware(Scene):
     """
@@ -36,13 +19,17 @@ class VaticanFirmware(Scene):
     Press ENTER to continue...
     """
 
+    # Sólo se ve al arrancar: al salir se descarga
+    unload_on_exit = True
+
     def __init__(self, engine):
         super().__init__(engine)
 
-        self.font_name = "Courier New"
+        self.font_name = engine.fonts.face()
         self.color_key = "green"
 
-        self.title_label = None
+        # ENTER pulsado con la carga del arranque aún en marcha
+        self.waiting = False
 
         # Boot CRT
         self.boot_sequence_played = False
@@ -55,23 +42,11 @@ class VaticanFirmware(Scene):
         self.overlay_opacity = 0.0   # 0–1
         self.overlay_color = (0.0, 0.0, 0.0)
 
-        # PERF: control de reconstrucción de labels
-        self._labels_dirty = True
-        self._last_size = (0, 0)
-
-    # ---------------- FUENTE ----------------
-
-    def _load_custom_font(self):
-        if os.path.exists(FONT_FILE):
-            try:
-                pyglet.font.add_file(FONT_FILE)
-                self.font_name = FONT_NAME
-                print("[FONT] Cargada fuente VT220 (Firmware):", FONT_FILE)
-                self._labels_dirty = True  # PERF: cambiar fuente => reconstruir label
-            except Exception as e:
-                print("[FONT] Error cargando fuente VT220 (Firmware):", e)
-        else:
-            print("[FONT] Archivo de fuente VT220 no encontrado (Firmware):", FONT_FILE)
+        # Fondo + bisel del CRT (cacheado por tamaño de ventana)
+        self.crt_frame = CRTFrame(engine.screen)
+
+        # Ruido de VRAM del boot (textura reutilizada)
+        self.boot_noise = BootNoise()
 
     # ---------------- TEXTO ----------------
 
@@ -81,14 +56,12 @@ class VaticanFirmware(Scene):
             "(c) 1982 ExLibris TechnoSacrum Inc. All rights reserved.\n"
             "\n"
             "\n"
-            "Press ENTER to continue..."
+            + ("Loading..." if self.waiting else "Press ENTER to continue...")
         )
 
     # ---------------- CICLO DE VIDA ----------------
 
     def on_enter(self, **kwargs):
-        self._load_custom_font()
-
         # Boot CRT solo la primera vez
         if not self.boot_sequence_played:
             self.boot_sequence_played = True
@@ -100,7 +73,10 @@ class VaticanFirmware(Scene):
             self.text_alpha = 255
             self.boot_noise_active = False
 
-        self._labels_dirty = True  # PERF: forzar reconstrucción al entrar
+    def unload(self):
+        super().unload()
+        self.crt_frame.delete()
+        self.boot_noise.delete()
 
     def _start_boot(self):
         """Inicializa el efecto de encendido CRT."""
@@ -111,44 +87,7 @@ class VaticanFirmware(Scene):
         self.text_alpha = 0
         self.boot_noise_active = False
 
-    def _make_labels(self):
-        """Crea el label central con el texto de firmware sólo si es necesario."""
-        if not self.engine or not self.engine.window:
-            return
-
-        w = self.engine.window.width
-        h = self.engine.window.height
-        size = (w, h)
-
-        # PERF: si ni cambió el tamaño ni el contenido, no recreamos
-        if (
-            not self._labels_dirty
-            and self.title_label is not None
-            and size == self._last_size
-        ):
-            return
-
-        self._last_size = size
-        self._labels_dirty = False
-
-        x, y, iw, ih = self._get_screen_bounds(w, h)
-        fw_text = self._firmware_text()
-
-        self.title_label = Label(
-            fw_text,
-            x=x + 40,
-            y=y + ih // 2,
-            width=iw - 80,
-            multiline=True,
-            anchor_x="left",
-            anchor_y="center",
-            font_name=self.font_name,
-            font_size=16,
-            color=COLOR_PRESETS[self.color_key],
-        )
-
     def on_update(self, dt):
-        # PERF: solo actualizamos la lógica de boot; los labels se aseguran en on_draw
         self._update_boot(dt)
 
     def _update_boot(self, dt):
@@ -202,83 +141,52 @@ class VaticanFirmware(Scene):
             self.overlay_opacity = 0.0
             self.boot_noise_active = False
             self.text_alpha = 255
+            # Último frame con el texto entero; a partir de aquí es estática
+            self.invalidate()
 
-    # ---------------- GEOMETRÍA CRT 4:3 ----------------
-
-    def _get_screen_bounds(self, w, h):
-        w2 = w - SCREEN_MARGIN * 2
-        h2 = h - SCREEN_MARGIN * 2
-        if w2 / h2 > 4 / 3:
-            ih = h2
-            iw = int(ih * 4 / 3)
-        else:
-            iw = w2
-            ih = int(iw * 3 / 4)
-        x = (w - iw) // 2
-        y = (h - ih) // 2
-        return x, y, iw, ih
 
     # ---------------- DIBUJO ----------------
 
-    def _draw_glow_label(self, label):
-        if not label:
-            return
-        base_color = label.color
-        r, g, b, _ = base_color
-        a = int(self.text_alpha)
-        base_color = (r, g, b, a)
-
-        ox, oy = label.x, label.y
-        glow_color = (r, g, b, int(a * 0.35))
-
-        # Glow alrededor
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            label.color = glow_color
-            label.x, label.y = ox + dx, oy + dy
-            label.draw()
+    @property
+    def animated(self):
+        # Sólo el encendido se anima; después la pantalla está quieta
+        return self.boot_active
 
-        # Texto principal
-        label.color = base_color
-        label.x, label.y = ox, oy
-        label.draw()
+    @property
+    def scanline_alpha(self):
+        # Scanlines más marcadas durante el encendido (las dibuja Engine)
+        return 70 if self.boot_active else 50
 
     def on_draw(self):
-        if not self.engine or not self.engine.window:
+        if not self.engine or not self.engine.screen:
             return
 
-        # PERF: aseguramos labels sólo aquí
-        self._make_labels()
-
-        w = self.engine.window.width
-        h = self.engine.window.height
-        x, y, iw, ih = self._get_screen_bounds(w, h)
-
-        # BASE CRT
-        base = shapes.Rectangle(x, y, iw, ih, color=(5, 5, 5))
-        base.draw()
-
-        # VIÑETA / CURVATURA
-        opacity = 120
-        band = 20
-        for off_x, off_y, bw, bh in (
-            (x, y + ih - band, iw, band),
-            (x, y, iw, band),
-            (x, y, band, ih),
-            (x + iw - band, y, band, ih),
-        ):
-            v = shapes.Rectangle(off_x, off_y, bw, bh, color=(0, 0, 0))
-            v.opacity = opacity
-            v.draw()
-
-        # Ruido de boot
-        if self.boot_active and self.boot_noise_active:
-            self._draw_boot_noise(x, y, iw, ih)
+        renderer = self.engine.renderer
+        x, y, iw, ih = self.crt_frame.bounds
 
-        # TEXTO
-        self._draw_glow_label(self.title_label)
+        # BASE CRT + VIÑETA / CURVATURA
+        self.crt_frame.draw(renderer)
 
-        # SCANLINES
-        self._draw_scanlines(x, y, iw, ih)
+        # Ruido de boot (una textura de celdas generada con NumPy, un solo quad)
+        if self.boot_active and self.boot_noise_active:
+            renderer.effect(lambda: self.boot_noise.draw(x, y, iw, ih))
+
+        # TEXTO (glow de fósforo en GPU; el fade va en el alpha del color)
+        with renderer.glow():
+            r, g, b, _ = COLOR_PRESETS[self.color_key]
+            renderer.text(
+                self.draw_key("title"),
+                self._firmware_text(),
+                x + 40,
+                y + ih // 2,
+                width=iw - 80,
+                multiline=True,
+                anchor_x="left",
+                anchor_y="center",
+                font_name=self.font_name,
+                font_size=16,
+                color=(r, g, b, int(self.text_alpha)),
+            )
 
         # OVERLAY flash fósforo
         if self.overlay_opacity > 0:
@@ -287,35 +195,8 @@ class VaticanFirmware(Scene):
                 rgb = (int(r * 255), int(g * 255), int(b * 255))
             else:
                 rgb = (int(r), int(g), int(b))
-            ov = shapes.Rectangle(x, y, iw, ih, color=rgb)
-            ov.opacity = int(max(0.0, min(1.0, self.overlay_opacity)) * 255)
-            ov.draw()
-
-    def _draw_boot_noise(self, x, y, w, h):
-        cell_w = 16
-        cell_h = 10
-        for yy in range(y, y + h, cell_h):
-            for xx in range(x, x + w, cell_w):
-                if random.random() < 0.45:
-                    brightness = random.randint(40, 140)
-                    rect = shapes.Rectangle(
-                        xx,
-                        yy,
-                        cell_w - 1,
-                        cell_h - 1,
-                        color=(0, brightness, 0),
-                    )
-                    rect.opacity = random.randint(150, 240)
-                    rect.draw()
-
-    def _draw_scanlines(self, x, y, w, h):
-        flick = random.uniform(-1, 1)
-        base_alpha = 70 if self.boot_active else 50
-        color = (0, 30, 0)
-        for yy in range(y, y + h, 2):
-            line = shapes.Rectangle(x, yy + flick, w, 1, color=color)
-            line.opacity = base_alpha
-            line.draw()
+            opacity = int(max(0.0, min(1.0, self.overlay_opacity)) * 255)
+            renderer.rect(self.draw_key("boot_flash"), x, y, iw, ih, rgb, opacity=opacity, layer=2)
 
     # ---------------- INPUT ----------------
 
@@ -331,8 +212,14 @@ class VaticanFirmware(Scene):
             self.color_key = "white"
         elif symbol == key.P:
             self.color_key = "purple"
-            self._labels_dirty = True  # si quieres que el label tome el nuevo color inmediatamente
 
         # ENTER: pasar a sistema de login de la ROM (Daemonum Index)
-        if symbol == key.ENTER:
-            self.engine.go_to("vatican_shell")
+        # (si la carga del arranque no ha terminado, se espera a ella)
+        if symbol == key.ENTER and not self.waiting:
+            if self.engine.loading:
+                self.waiting = True
+            self.engine.when_loaded(self._continue)
+
+    def _continue(self):
+        self.waiting = False
+        self.engine.go_to("vatican_shell")
@@ -1,23 +1,11 @@
 from scene import Scene
-from pyglet.text import Label
-from pyglet import shapes
-import pyglet
-import os
+from crt import CRTFrame
+from console_view import ConsoleView
+from glyph_particles import GlyphParticles
+from sdf_glyphs import SDFGlyphAtlas
+import numpy as np
 import random
 
-# -----------------------
-# CONFIGURACIÓN DE FUENTE
-# -----------------------
-
-FONT_FILE = os.path.join(
-    os.path.dirname(__file__),
-    "assets",
-    "fonts",
-    "Glass_TTY_VT220.ttf"
-)
-
-FONT_NAME = "Glass TTY VT220"
-
 COLOR_PRESETS = {
     "green": (0, 255, 140, 255),
     "amber": (255, 170, 60, 255),
@@ -25,7 +13,38 @@ COLOR_PRESETS = {
     "purple": (200, 120, 255, 255),
 }
 
-SCREEN_MARGIN = 80  # margen del monitor dentro de la ventana
+# -----------------------
+# GLITCH DE ACCESO
+# -----------------------
+
+GLITCH_SYMBOLS = ["⛧", "▒", "█", "▓", "░", "✟", "✞"]
+STAR_SYMBOLS = [0, 1, 2, 3, 4]         # ⛧ ▒ █ ▓ ░
+LOOSE_SYMBOLS = [1, 2, 3, 4, 0, 5, 6]  # ▒ █ ▓ ░ ⛧ ✟ ✞
+
+LATIN_FRAGMENTS = [
+    "In Nomine Patris",
+    "et Filii et Spiritus Sancti",
+    "Libera nos a malo",
+    "Vade retro Satana",
+    "Ecce Crucem Domini",
+    "Fugite partes adversae",
+    "Deus in adiutorium",
+    "Salus in periculis",
+    "Protege nos Domine",
+    "Exsurge Domine",
+    "Benedictus in nomine Domini",
+    "In manus tuas Domine",
+    "Averte faciem tuam",
+    "Sub tuum praesidium",
+]
+LATIN_BAKE_SIZE = 18
+
+STAR_GHOSTS = 8
+LATIN_COUNT = 30   # saturación demoníaca
+SYMBOL_COUNT = 80
+BAND_COUNT = 10
+SYMBOL_POOL = 3 * (1 + STAR_GHOSTS) + SYMBOL_COUNT
+PHRASE_POOL = LATIN_COUNT + BAND_COUNT
 
 
 class VaticanShell(Scene):
@@ -43,10 +62,11 @@ class VaticanShell(Scene):
     def __init__(self, engine):
         super().__init__(engine)
 
-        self.font_name = "Courier New"
+        self.font_name = engine.fonts.face()
         self.color_key = "green"
 
-        self.console_label = None
+        # Consola persistente (historial + línea de entrada)
+        self.console = ConsoleView(engine.screen, self.font_name, 14, COLOR_PRESETS[self.color_key])
 
         # Historial de la consola
         self.lines = []            # líneas ya impresas
@@ -70,6 +90,9 @@ class VaticanShell(Scene):
         # Cursor parpadeante
         self.cursor_visible = True
 
+        # Fondo + bisel del CRT (cacheado por tamaño de ventana)
+        self.crt_frame = CRTFrame(engine.screen)
+
         # Reconstrucción condicionada
         self._text_dirty = True
         self._last_size = (0, 0)
@@ -88,25 +111,15 @@ class VaticanShell(Scene):
         self.glitch_timer = 0.0
         self.glitch_duration = 3.0
         self.glitch_color_phase = 0.0
-    # ---------------- FUENTE ----------------
-
-    def _load_custom_font(self):
-        if os.path.exists(FONT_FILE):
-            try:
-                pyglet.font.add_file(FONT_FILE)
-                self.font_name = FONT_NAME
-                print("[FONT] VT220 cargada (Shell).")
-                self._text_dirty = True
-            except Exception as e:
-                print("[FONT] Error cargando VT220 (Shell):", e)
-        else:
-            print("[FONT] No se encontró VT220 (Shell):", FONT_FILE)
+        # Símbolos: atlas SDF (nítido a cualquier escala); latín + barras: atlas normal
+        self.symbol_atlas = SDFGlyphAtlas(GLITCH_SYMBOLS)
+        self.glitch_symbols = None
+        self.glitch_particles = GlyphParticles(PHRASE_POOL)
+        self._rng = np.random.default_rng()
 
     # ---------------- CICLO DE VIDA ----------------
 
     def on_enter(self, **kwargs):
-        self._load_custom_font()
-
         self.lines = []
         self.current_input = ""
         self.pending_lines = []
@@ -132,22 +145,34 @@ class VaticanShell(Scene):
         ]
         self._enqueue_lines(header)
 
-        pyglet.clock.schedule_interval(self._toggle_cursor, 0.5)
+        self.schedule_interval(self._toggle_cursor, 0.5)
         self._text_dirty = True
 
+        # Atlas del glitch: se hornean una sola vez, fuera del glitch
+        self.symbol_atlas.load(self.engine.screen)
+        if self.glitch_symbols is None:
+            self.glitch_symbols = GlyphParticles(
+                SYMBOL_POOL, program=self.symbol_atlas.program, premultiplied=False
+            )
+            self.glitch_symbols.attach(self.symbol_atlas.texture, self.symbol_atlas.regions)
+        self.glitch_particles.build(
+            self.engine.screen,
+            [(frag, self.font_name, LATIN_BAKE_SIZE) for frag in LATIN_FRAGMENTS],
+        )
+
     def on_exit(self):
         try:
-            pyglet.clock.unschedule(self._toggle_cursor)
+            self.unschedule(self._toggle_cursor)
         except Exception:
             pass
 
         try:
-            pyglet.clock.unschedule(self._drain_pending_lines)
+            self.unschedule(self._drain_pending_lines)
         except Exception:
             pass
 
         try:
-            pyglet.clock.unschedule(self._reset_after_lock)
+            self.unschedule(self._reset_after_lock)
         except Exception:
             pass
 
@@ -169,14 +194,14 @@ class VaticanShell(Scene):
         self.pending_lines.extend(new_lines)
         if not self.animation_scheduled:
             self.animation_scheduled = True
-            pyglet.clock.schedule_interval(self._drain_pending_lines, 0.05)
+            self.schedule_interval(self._drain_pending_lines, 0.05)
         self._text_dirty = True
 
     def _drain_pending_lines(self, dt):
         if not self.pending_lines:
             self.animation_scheduled = False
             try:
-                pyglet.clock.unschedule(self._drain_pending_lines)
+                self.unschedule(self._drain_pending_lines)
             except Exception:
                 pass
             return
@@ -186,50 +211,46 @@ class VaticanShell(Scene):
         self._text_dirty = True
 
     def _toggle_cursor(self, dt):
+        # El parpadeo sólo cambia la opacidad del cursor, no el texto
         self.cursor_visible = not self.cursor_visible
-        self._text_dirty = True
-    # ---------------- TEXTO BASE / LABEL ----------------
+        self._update_cursor()
+        self.invalidate()
 
-    def _get_base_text(self) -> str:
-        """Construye el texto limpio de la consola (sin glitch)."""
-        all_lines = list(self.lines)
+    def _update_cursor(self):
         cursor_active = self.cursor_visible and not self.locked and not self.glitch_mode
-        cursor_char = "|" if cursor_active else " "
-        all_lines.append(f"{self.prompt}{self.current_input}{cursor_char}")
-        return "\n".join(all_lines)
+        self.console.set_cursor_visible(cursor_active)
+    # ---------------- TEXTO BASE / CONSOLA ----------------
+
+    def _get_input_text(self) -> str:
+        """Línea del prompt limpia (sin glitch)."""
+        return f"{self.prompt}{self.current_input}"
+
+    def _console_color(self):
+        r, g, b, _ = COLOR_PRESETS[self.color_key]
+        return (r, g, b, int(self.text_alpha))
 
     def _make_labels(self):
-        if not self.engine or not self.engine.window:
+        if not self.engine or not self.engine.screen:
             return
 
-        w = self.engine.window.width
-        h = self.engine.window.height
+        w = self.engine.screen.width
+        h = self.engine.screen.height
         size = (w, h)
 
-        if (
-            not self._text_dirty
-            and self.console_label is not None
-            and size == self._last_size
-        ):
+        if not self._text_dirty and size == self._last_size:
             return
 
         self._last_size = size
         self._text_dirty = False
 
-        x, y, iw, ih = self._get_screen_bounds(w, h)
-
-        base_text = self._get_base_text()
+        x, y, iw, ih = self.crt_frame.bounds
 
-        self.console_label = Label(
-            base_text,
-            x=x + 40,
-            y=y + ih - 60,
-            width=iw - 80,
-            multiline=True,
-            font_name=self.font_name,
-            font_size=14,
-            color=COLOR_PRESETS[self.color_key],
-        )
+        # Sólo se tocan las partes que cambiaron: nada se reconstruye
+        self.console.set_style(font_name=self.font_name, color=self._console_color())
+        self.console.set_geometry(x + 40, y + ih - 60, iw - 80, self.max_lines)
+        self.console.sync_lines(self.lines)
+        self.console.set_input(self._get_input_text())
+        self._update_cursor()
 
     def on_update(self, dt):
         # Si está en glitch, solo actualizamos el temporizador de glitch
@@ -239,51 +260,6 @@ class VaticanShell(Scene):
 
         self._make_labels()
 
-    # ---------------- GEOMETRÍA CRT ----------------
-
-    def _get_screen_bounds(self, w, h):
-        w2 = w - SCREEN_MARGIN * 2
-        h2 = h - SCREEN_MARGIN * 2
-        if w2 / h2 > 4 / 3:
-            ih = h2
-            iw = int(ih * 4 / 3)
-        else:
-            iw = w2
-            ih = int(w2 * 3 / 4)
-        x = (w - iw) // 2
-        y = (h - ih) // 2
-        return x, y, iw, ih
-
-    # ---------------- DIBUJO BASE ----------------
-
-    def _draw_glow_label(self, label):
-        if not label:
-            return
-        base_color = label.color
-        r, g, b, _ = base_color
-        a = int(self.text_alpha)
-        base_color = (r, g, b, a)
-
-        ox, oy = label.x, label.y
-        glow_color = (r, g, b, int(a * 0.35))
-
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            label.color = glow_color
-            label.x, label.y = ox + dx, oy + dy
-            label.draw()
-
-        label.color = base_color
-        label.x, label.y = ox, oy
-        label.draw()
-
-    def _draw_scanlines(self, x, y, w, h):
-        flick = random.uniform(-1, 1)
-        base_alpha = 55
-        color = (0, 30, 0)
-        for yy in range(y, y + h, 2):
-            line = shapes.Rectangle(x, yy + flick, w, 1, color=color)
-            line.opacity = base_alpha
-            line.draw()
 
     # ---------------- COLOR GLITCH PÚRPURA/ROJO NEÓN ----------------
 
@@ -304,6 +280,16 @@ class VaticanShell(Scene):
             b = random.randint(60, 120)
         return r, g, b
 
+    def _glitch_colors(self, n):
+        """Versión vectorizada de _glitch_color: array (n, 3)."""
+        rng = self._rng
+        purple = rng.random(n) < 0.5
+        colors = np.empty((n, 3), dtype=np.int32)
+        colors[:, 0] = np.where(purple, rng.integers(200, 256, n), 255)
+        colors[:, 1] = np.where(purple, rng.integers(0, 81, n), rng.integers(0, 41, n))
+        colors[:, 2] = np.where(purple, rng.integers(200, 256, n), rng.integers(60, 121, n))
+        return colors
+
     # ---------------- GLITCH VISUAL ----------------
 
     def _draw_glitch(self, x, y, w, h):
@@ -313,196 +299,139 @@ class VaticanShell(Scene):
         - Estrellas con capas ghost deformadas usando ⛧ + ▒█▓░.
         - Palabras/frases en latín regadas sobre el área de texto.
         - Símbolos ▒█▓░⛧✟✞ dispersos por toda la pantalla.
+        - Barras de ruido horizontal.
         - Todo tintado con púrpura infernal / rojo neón dinámico.
-        """
 
-        # Color base dinámico (púrpura / rojo neón)
-        r, g, b = self._glitch_color()
+        Cada frame sólo genera arrays y los aplica al pool de partículas.
+        """
+        symbols = self.glitch_symbols
+        particles = self.glitch_particles
+        if symbols is None or not particles.sprites:
+            return
+        rng = self._rng
 
         # ---------------- ESTRELLAS GRANDES ----------------
+        stars = 3 * (1 + STAR_GHOSTS)
+        per_star = 1 + STAR_GHOSTS
+        n = stars + SYMBOL_COUNT
+
+        images = np.empty(n, dtype=np.int32)
+        xs = np.empty(n)
+        ys = np.empty(n)
+        sizes = np.empty(n)  # tamaño de fuente equivalente
+        alphas = np.empty(n, dtype=np.int32)
+
         # Posiciones: superior derecha, centro izquierda, inferior derecha
-        positions = [
+        centers = np.array([
             (x + int(w * 0.78), y + int(h * 0.80)),  # arriba derecha
             (x + int(w * 0.30), y + int(h * 0.50)),  # centro izquierda
             (x + int(w * 0.75), y + int(h * 0.20)),  # abajo derecha
-        ]
+        ])
+        base_sizes = rng.integers(120, 171, 3)
+        star = slice(0, stars)
+        base = slice(0, stars, per_star)  # capa base sólida ⛧ de cada estrella
+        images[star] = np.array(STAR_SYMBOLS)[rng.integers(0, len(STAR_SYMBOLS), stars)]
+        xs[star] = np.repeat(centers[:, 0], per_star) + rng.integers(-28, 29, stars)
+        ys[star] = np.repeat(centers[:, 1], per_star) + rng.integers(-20, 21, stars)
+        sizes[star] = np.repeat(base_sizes, per_star) * rng.uniform(0.88, 1.10, stars)
+        alphas[star] = rng.integers(70, 221, stars)
+        images[base] = 0
+        xs[base] = centers[:, 0]
+        ys[base] = centers[:, 1]
+        sizes[base] = base_sizes
+        alphas[base] = 235
 
-        star_symbols = ["⛧", "▒", "█", "▓", "░"]
-
-        for cx, cy in positions:
-            base_size = random.randint(120, 170)
-
-            # Capa base sólida ⛧
-            base_label = Label(
-                "⛧",
-                font_name="Courier New",
-                font_size=base_size,
-                x=cx,
-                y=cy,
-                anchor_x="center",
-                anchor_y="center",
-                color=(r, g, b, 235),
-            )
-            base_label.draw()
-
-            # Capas ghost deformadas
-            ghost_count = 8
-            for _ in range(ghost_count):
-                jitter_x = random.randint(-28, 28)
-                jitter_y = random.randint(-20, 20)
-                ghost_size = int(base_size * random.uniform(0.88, 1.10))
-
-                glyph = random.choice(star_symbols)
-
-                gr, gg, gb = self._glitch_color()
-                alpha = random.randint(70, 220)
-
-                ghost = Label(
-                    glyph,
-                    font_name="Courier New",
-                    font_size=ghost_size,
-                    x=cx + jitter_x,
-                    y=cy + jitter_y,
-                    anchor_x="center",
-                    anchor_y="center",
-                    color=(gr, gg, gb, alpha),
-                )
-                ghost.draw()
+        # ---------------- SÍMBOLOS SUELTOS POR TODA LA PANTALLA ----------------
+        loose = slice(stars, n)
+        images[loose] = np.array(LOOSE_SYMBOLS)[rng.integers(0, len(LOOSE_SYMBOLS), SYMBOL_COUNT)]
+        xs[loose] = rng.integers(x + 20, x + w - 20 + 1, SYMBOL_COUNT)
+        ys[loose] = rng.integers(y + 20, y + h - 20 + 1, SYMBOL_COUNT)
+        sizes[loose] = rng.integers(12, 29, SYMBOL_COUNT)
+        alphas[loose] = rng.integers(110, 241, SYMBOL_COUNT)
+
+        scale = sizes / self.symbol_atlas.base_size
+        colors = np.empty((n, 4), dtype=np.int32)
+        colors[:, :3] = self._glitch_colors(n)
+        colors[:, 3] = alphas
+        # La capa base de cada estrella comparte el color del frame
+        colors[base, :3] = self._glitch_color()
+        symbols.update(images, xs, ys, scale, scale, colors)
 
         # ---------------- LATÍN REGADO POR LA PANTALLA ----------------
-        latin_fragments = [
-            "In Nomine Patris",
-            "et Filii et Spiritus Sancti",
-            "Libera nos a malo",
-            "Vade retro Satana",
-            "Ecce Crucem Domini",
-            "Fugite partes adversae",
-            "Deus in adiutorium",
-            "Salus in periculis",
-            "Protege nos Domine",
-            "Exsurge Domine",
-            "Benedictus in nomine Domini",
-            "In manus tuas Domine",
-            "Averte faciem tuam",
-            "Sub tuum praesidium",
-        ]
-
-        latin_count = 30  # saturación demoníaca
-        for _ in range(latin_count):
-            frag = random.choice(latin_fragments)
-            font_size = random.randint(10, 18)
-            px = random.randint(x + 40, x + w - 40)
-            py = random.randint(y + 40, y + h - 40)
-            lr, lg, lb = self._glitch_color()
-            alpha = random.randint(90, 210)
-
-            label = Label(
-                frag,
-                font_name=self.font_name,
-                font_size=font_size,
-                x=px,
-                y=py,
-                anchor_x="center",
-                anchor_y="center",
-                color=(lr, lg, lb, alpha),
-            )
-            label.draw()
-
-        # ---------------- SÍMBOLOS SUELTOS POR TODA LA PANTALLA ----------------
-        loose_symbols = ["▒", "█", "▓", "░", "⛧", "✟", "✞"]
-        symbol_count = 80
-        for _ in range(symbol_count):
-            sym = random.choice(loose_symbols)
-            font_size = random.randint(12, 28)
-            px = random.randint(x + 20, x + w - 20)
-            py = random.randint(y + 20, y + h - 20)
-            sr, sg, sb = self._glitch_color()
-            alpha = random.randint(110, 240)
-
-            s_label = Label(
-                sym,
-                font_name="Courier New",
-                font_size=font_size,
-                x=px,
-                y=py,
-                anchor_x="center",
-                anchor_y="center",
-                color=(sr, sg, sb, alpha),
-            )
-            s_label.draw()
+        n = LATIN_COUNT + BAND_COUNT
+        images = np.empty(n, dtype=np.int32)
+        xs = np.empty(n)
+        ys = np.empty(n)
+        scale_x = np.empty(n)
+        scale_y = np.empty(n)
+        alphas = np.empty(n, dtype=np.int32)
+
+        latin = slice(0, LATIN_COUNT)
+        images[latin] = rng.integers(0, len(LATIN_FRAGMENTS), LATIN_COUNT)
+        xs[latin] = rng.integers(x + 40, x + w - 40 + 1, LATIN_COUNT)
+        ys[latin] = rng.integers(y + 40, y + h - 40 + 1, LATIN_COUNT)
+        scale_x[latin] = rng.integers(10, 19, LATIN_COUNT) / LATIN_BAKE_SIZE
+        scale_y[latin] = scale_x[latin]
+        alphas[latin] = rng.integers(90, 211, LATIN_COUNT)
 
         # ---------------- BARRAS DE RUIDO HORIZONTAL ----------------
-        bands = 10
-        for _ in range(bands):
-            band_height = random.randint(4, 14)
-            band_y = random.randint(y, y + h - band_height)
-            br, bg, bb = self._glitch_color()
-            band = shapes.Rectangle(x, band_y, w, band_height, color=(br, bg, bb))
-            band.opacity = random.randint(70, 180)
-            band.draw()
+        bands = slice(LATIN_COUNT, n)
+        solid = particles.regions[particles.solid_index]
+        band_heights = rng.integers(4, 15, BAND_COUNT)
+        images[bands] = particles.solid_index
+        xs[bands] = x + w / 2
+        ys[bands] = rng.integers(y, y + h - band_heights + 1) + band_heights / 2
+        scale_x[bands] = w / solid.width
+        scale_y[bands] = band_heights / solid.height
+        alphas[bands] = rng.integers(70, 181, BAND_COUNT)
+
+        colors = np.empty((n, 4), dtype=np.int32)
+        colors[:, :3] = self._glitch_colors(n)
+        colors[:, 3] = alphas
+        particles.update(images, xs, ys, scale_x, scale_y, colors)
+
+        symbols.draw()
+        particles.draw()
+
+    @property
+    def animated(self):
+        # Fuera del glitch la shell está quieta (redibujo bajo demanda)
+        return self.glitch_mode
 
     def on_draw(self):
-        if not self.engine or not self.engine.window:
+        if not self.engine or not self.engine.screen:
             return
 
         self._make_labels()
 
-        w = self.engine.window.width
-        h = self.engine.window.height
-        x, y, iw, ih = self._get_screen_bounds(w, h)
-
-        # Fondo del CRT
-        base = shapes.Rectangle(x, y, iw, ih, color=(5, 5, 5))
-        base.draw()
-
-        # Bisel oscuro
-        opacity = 120
-        band = 20
-        for off_x, off_y, bw, bh in (
-            (x, y + ih - band, iw, band),
-            (x, y, iw, band),
-            (x, y, band, ih),
-            (x + iw - band, y, band, ih),
-        ):
-            v = shapes.Rectangle(off_x, off_y, bw, bh, color=(0, 0, 0))
-            v.opacity = opacity
-            v.draw()
-
-        # Scanlines siempre
-        self._draw_scanlines(x, y, iw, ih)
-
-        # --- TEXTO (posible glitch de corrupción) ---
-        if self.console_label:
-            base_text = self._get_base_text()
-
-            if self.glitch_mode:
-                intensity = 1.0  # glitch duro en la fase activa
-                corrupted = self._corrupt_text(base_text, intensity)
-                self.console_label.text = corrupted
-            else:
-                self.console_label.text = base_text
+        renderer = self.engine.renderer
+        x, y, iw, ih = self.crt_frame.bounds
 
-            ox, oy = self.console_label.x, self.console_label.y
-            or_, og, ob, oa = self.console_label.color
+        # Fondo del CRT + bisel oscuro
+        self.crt_frame.draw(renderer)
 
-            if self.glitch_mode:
-                # Temblor del texto
-                self.console_label.x = ox + random.randint(-2, 2)
-                self.console_label.y = oy + random.randint(-2, 2)
+        # --- TEXTO (posible glitch de corrupción) ---
+        if self.glitch_mode:
+            intensity = 1.0  # glitch duro en la fase activa
+            self.console.set_text(self._corrupt_text("\n".join(self.lines), intensity), glitch=GLITCH_SYMBOLS)
+            self.console.set_input(self._corrupt_text(self._get_input_text(), intensity))
+            self.console.set_cursor_visible(False)
 
-                # Color del texto también se va a púrpura/rojo neón
-                tr, tg, tb = self._glitch_color()
-                self.console_label.color = (tr, tg, tb, oa)
+            # Temblor del texto
+            self.console.offset(random.randint(-2, 2), random.randint(-2, 2))
 
-            self._draw_glow_label(self.console_label)
+            # Color del texto también se va a púrpura/rojo neón
+            tr, tg, tb = self._glitch_color()
+            self.console.set_style(color=(tr, tg, tb, int(self.text_alpha)))
+        else:
+            self.console.offset(0, 0)
 
-            # Restauramos posición y color
-            self.console_label.x, self.console_label.y = ox, oy
-            self.console_label.color = (or_, og, ob, oa)
+        with renderer.glow():
+            self.console.draw(renderer)
 
-        # Glitch visual encima del texto
+        # Glitch visual encima del texto (partículas SDF: sólo en GL)
         if self.glitch_mode:
-            self._draw_glitch(x, y, iw, ih)
+            renderer.effect(lambda: self._draw_glitch(x, y, iw, ih))
     # ---------------- INPUT ----------------
 
     def on_key(self, symbol, modifiers):
@@ -738,7 +667,7 @@ class VaticanShell(Scene):
         self.pending_lines = []
         self.animation_scheduled = False
         try:
-            pyglet.clock.unschedule(self._drain_pending_lines)
+            self.unschedule(self._drain_pending_lines)
         except Exception:
             pass
 
@@ -795,7 +724,7 @@ class VaticanShell(Scene):
                 self.prompt = self.shell_prompt
 
                 if not self._lock_reset_scheduled:
-                    pyglet.clock.schedule_once(self._reset_after_lock, 60.0)
+                    self.schedule_once(self._reset_after_lock, 60.0)
                     self._lock_reset_scheduled = True
             else:
                 # Fallo pero todavía puede intentar
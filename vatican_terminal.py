@@ -1,23 +1,14 @@
 from scene import Scene
-from pyglet.text import Label
-from pyglet import shapes
-import os
+from crt import CRTFrame, BootNoise
+from console_view import ConsoleView
+from title_banner import TitleBanner
 import random
 from media_manager import MediaManager
-import pyglet
 
-# -----------------------
-# CONFIGURACIÓN DE FUENTE
-# -----------------------
-
-FONT_FILE = os.path.join(
-    os.path.dirname(__file__),
-    "assets",
-    "fonts",
-    "Glass_TTY_VT220.ttf",
-)
-
-FONT_NAME = "Glass TTY VT220"
+TITLE_PURPLE = (200, 120, 255)
+TITLE_RED = (255, 40, 40)
+PET_ATLAS = "devil_terminal_idle"
+PET_FRAME_TIME = 0.18  # segundos por fotograma del diablito
 
 COLOR_PRESETS = {
     "red": (255, 40, 40, 255),
@@ -27,8 +18,6 @@ COLOR_PRESETS = {
     "purple": (200, 120, 255, 255),
 }
 
-SCREEN_MARGIN = 80  # margen interno del CRT
-
 
 class VaticanTerminal(Scene):
     """
@@ -41,15 +30,14 @@ class VaticanTerminal(Scene):
     def __init__(self, engine):
         super().__init__(engine)
 
-        # Labels principales
-        self.title_label = None
-        self.index_label = None
-        self.menu_labels = []
-        self.synopsis_label = None
-        self.dossier_console_label = None
+        # Textos principales: argumentos de renderer.text ya maquetados
+        self.title_banner = TitleBanner("Courier New", 10, line_height=14)
+        self.index_run = None
+        self.menu_runs = []
+        self.synopsis_run = None
 
         self.color_key = "red"
-        self.font_name = "Courier New"
+        self.font_name = engine.fonts.face()
 
         self.media = MediaManager()
 
@@ -66,7 +54,6 @@ class VaticanTerminal(Scene):
 
         # Glitch transición
         self.case_transition_active = False
-        self.glitch_labels = []
 
         # Fases internas
         self.phase = "splash"
@@ -78,14 +65,9 @@ class VaticanTerminal(Scene):
         self.title_reveal_speed = 120.0
 
         # Mascota de la terminal (diablito)
-        self.pet_sprite = None
-        try:
-            img_path = r"C:\Users\Usuario\Desktop\IncorruptaModular\assets\images\Terminal pet.png"
-            pet_img = pyglet.image.load(img_path)
-            self.pet_sprite = pyglet.sprite.Sprite(pet_img)
-        except Exception as e:
-            print("[PET] No se pudo cargar Terminal pet:", e)
-            self.pet_sprite = None
+        # Animación idle desde un atlas horneado (una sola textura); se carga
+        # en segundo plano y el renderer crea el sprite al dibujarlo
+        self.pet = engine.textures.get_atlas(PET_ATLAS)
 
         # Casos
         self.cases = [
@@ -118,25 +100,19 @@ class VaticanTerminal(Scene):
         self.dossier_cursor_visible = True
         self.dossier_scroll_offset = 0   # 0 = al final; >0 = arriba
 
-        # Reconstrucción
-        self._labels_dirty = True
-        self._crt_last_size = (0, 0)
+        # Consola persistente del dossier (se sincroniza sin recrear labels)
+        self.dossier_console = ConsoleView(engine.screen, self.font_name, 13, COLOR_PRESETS[self.color_key])
+        self._dossier_dirty = True
 
-    def _get_screen_bounds(self, w, h):
-        """
-        Devuelve un área visible central para contenido ASCII o texto,
-        respetando los márgenes oscuros del estilo de monitor retro.
-        """
-        margin_w = int(w * 0.15)
-        margin_h = int(h * 0.12)
+        # Fondo + bisel del CRT (cacheado por tamaño de ventana)
+        self.crt_frame = CRTFrame(engine.screen)
 
-        x = margin_w
-        y = margin_h
-        iw = w - margin_w * 2
-        ih = h - margin_h * 2
-
-        return x, y, iw, ih
+        # Ruido de VRAM del boot (textura reutilizada)
+        self.boot_noise = BootNoise(mode="lines", lines=24)
 
+        # Reconstrucción
+        self._labels_dirty = True
+        self._crt_last_size = (0, 0)
 
     # ---------------- TEXTOS BASE ----------------
 
@@ -166,24 +142,9 @@ class VaticanTerminal(Scene):
         except Exception as e:
             print(f"[AUDIO] Error playing sfx '{key}':", e)
 
-    # ---------------- FUENTE ----------------
-
-    def _load_custom_font(self):
-        if os.path.exists(FONT_FILE):
-            try:
-                pyglet.font.add_file(FONT_FILE)
-                self.font_name = FONT_NAME
-                print("[FONT] VT220 cargada (Terminal).")
-                self._labels_dirty = True
-            except Exception as e:
-                print("[FONT] Error VT220 (Terminal):", e)
-        else:
-            print("[FONT] No se encontró VT220 (Terminal):", FONT_FILE)
-
     # ---------------- CICLO DE VIDA ----------------
 
     def on_enter(self, **kwargs):
-        self._load_custom_font()
         self.phase = "splash"
         self.selected_index = 0
 
@@ -207,7 +168,7 @@ class VaticanTerminal(Scene):
 
     def on_exit(self):
         try:
-            pyglet.clock.unschedule(self._dossier_toggle_cursor)
+            self.unschedule(self._dossier_toggle_cursor)
         except Exception:
             pass
 
@@ -220,66 +181,60 @@ class VaticanTerminal(Scene):
         self.boot_noise_active = False
         self._play_sfx("boot")
 
-    # ---------------- GEOMETRÍA CRT ----------------
-
-    def _get_screen_bounds(self, w, h):
-        w2 = w - SCREEN_MARGIN * 2
-        h2 = h - SCREEN_MARGIN * 2
-        if w2 / h2 > 4 / 3:
-            ih = h2
-            iw = int(ih * 4 / 3)
-        else:
-            iw = w2
-            ih = int(w2 * 3 / 4)
-        x = (w - iw) // 2
-        y = (h - ih) // 2
-        return x, y, iw, ih
 
         # ---------------- LABELS ----------------
 
     def _make_labels(self):
-        if not self.engine or not self.engine.window:
+        if not self.engine or not self.engine.screen:
             return
 
-        w = self.engine.window.width
-        h = self.engine.window.height
+        w = self.engine.screen.width
+        h = self.engine.screen.height
         size = (w, h)
 
         # Si nada cambió y ya tenemos labels, no recalcular
         if (
             not self._labels_dirty
-            and self.title_label is not None
+            and self.index_run is not None
             and size == self._crt_last_size
         ):
+            # Cambios del dossier (líneas, input, cursor, scroll) no
+            # reconstruyen título ni menú
+            if self.phase == "dossier" and self._dossier_dirty:
+                self._sync_dossier_console()
             return
 
         self._crt_last_size = size
         self._labels_dirty = False
 
-        x, y, iw, ih = self._get_screen_bounds(w, h)
+        x, y, iw, ih = self.crt_frame.bounds
 
         # Zonas verticales
-        title_y = y + int(ih * 0.87)
         index_y = y + int(ih * 0.60)
         menu_base_y = y + int(ih * 0.50)
-        dossier_console_y = y + int(ih * 0.47)
-
-        # ---- Título ASCII (Daemonum Index) ----
-        title_text = self._title_text()
-        self.title_label = Label(
-            title_text,
-            x=x + 80,
-            y=title_y,
-            width=iw - 160,
-            multiline=True,
-            font_name="Courier New",
-            font_size=10,
-            color=COLOR_PRESETS[self.color_key],
+
+        # ---- Título ASCII (Daemonum Index): textura con el degradado ----
+        title_lines = self._title_text().splitlines()
+        self.title_banner.bake(
+            self._title_text(), self._title_gradient(len(title_lines)), self.engine.screen
         )
 
+        # Index, menú y sinopsis: el renderer reutiliza los labels de las
+        # variantes ya vistas (p. ej. al volver de pantalla completa)
+        self.index_run, self.menu_runs, self.synopsis_run = self._build_runs(
+            x, y, iw, ih, index_y, menu_base_y
+        )
+
+        # ---- DOSSIER (consola de comandos) ----
+        if self.phase == "dossier":
+            self._sync_dossier_console()
+            return
+
+    def _build_runs(self, x, y, iw, ih, index_y, menu_base_y):
+        """(index, menú, sinopsis) de la fase actual como argumentos de renderer.text."""
         # ---- *Index* centrado (rojo neón) ----
-        self.index_label = Label(
-            "⛧Index⛧",
+        index_run = dict(
+            text="⛧Index⛧",
             x=x + iw // 2,
             y=index_y,
             anchor_x="center",
@@ -288,39 +243,35 @@ class VaticanTerminal(Scene):
             color=(255, 40, 40, 255),  # rojo neón intenso
         )
 
-        # Reset de otros labels
-        self.menu_labels = []
-        self.synopsis_label = None
-        self.dossier_console_label = None
-        self.glitch_labels = []
+        menu_runs = []
+        synopsis_run = None
 
         # ---- PANTALLA SPLASH ----
         if self.phase == "splash":
             # Texto de “Press ENTER…” alineado a la izquierda
-            self.synopsis_label = Label(
-                self._splash_message(),
+            synopsis_run = dict(
+                text=self._splash_message(),
                 x=x + 40,
                 y=y + 40,
                 width=iw - 80,
                 multiline=True,
                 font_name=self.font_name,
-                font_size=14,
+                font_size=16,
                 anchor_x="left",
-                color=(255, 40, 40, 255),  # rojo neón
+                color=COLOR_PRESETS[self.color_key],
             )
-            return
+            return index_run, menu_runs, synopsis_run
 
         # ---- MENÚ DE CASOS ----
         if self.phase == "menu":
             base_y = menu_base_y
             line_height = 24
 
-            # Lista de casos (labels de menú)
+            # Lista de casos
             for idx, case in enumerate(self.cases):
                 prefix = "> " if idx == self.selected_index else "  "
-                text = f"{prefix}{case['title']}"
-                lbl = Label(
-                    text,
+                menu_runs.append((idx, dict(
+                    text=f"{prefix}{case['title']}",
                     x=x + 40,
                     y=base_y - idx * line_height,
                     width=iw - 80,
@@ -328,8 +279,7 @@ class VaticanTerminal(Scene):
                     font_name=self.font_name,
                     font_size=14,
                     color=COLOR_PRESETS[self.color_key],
-                )
-                self.menu_labels.append((idx, lbl))
+                )))
 
             # Sinopsis del caso seleccionado + ayuda
             selected_case = self.cases[self.selected_index]
@@ -338,8 +288,8 @@ class VaticanTerminal(Scene):
                 + "\n\nUse UP/DOWN to select a case. Press ENTER to open."
             )
 
-            self.synopsis_label = Label(
-                synopsis_text,
+            synopsis_run = dict(
+                text=synopsis_text,
                 x=x + 40,
                 y=y + 40,
                 width=iw - 80,
@@ -349,123 +299,85 @@ class VaticanTerminal(Scene):
                 anchor_x="left",
                 color=COLOR_PRESETS[self.color_key],
             )
-            return
 
-        # ---- DOSSIER (consola de comandos) ----
-        if self.phase == "dossier":
-            visible_lines = self._get_visible_dossier_lines()
-            cursor_char = "|" if self.dossier_cursor_visible else " "
-            all_lines = list(visible_lines)
-            all_lines.append(
-                f"{self.dossier_prompt}{self.dossier_current_input}{cursor_char}"
-            )
-            console_text = "\n".join(all_lines)
+        return index_run, menu_runs, synopsis_run
 
-            self.dossier_console_label = Label(
-                console_text,
-                x=x + 40,
-                y=dossier_console_y,
-                width=iw - 80,
-                multiline=True,
-                font_name=self.font_name,
-                font_size=13,
-                color=COLOR_PRESETS[self.color_key], 
-            )
-            return
+    def _dossier_color(self):
+        r, g, b, a = COLOR_PRESETS[self.color_key]
+        alpha = int(self.text_alpha) if self.text_alpha is not None else a
+        return (r, g, b, alpha)
 
+    def _sync_dossier_console(self):
+        """Lleva la consola del dossier al estado actual con ediciones mínimas."""
+        self._dossier_dirty = False
 
+        x, y, iw, ih = self.crt_frame.bounds
+        console = self.dossier_console
+        console.set_style(font_name=self.font_name, color=self._dossier_color())
+        console.set_geometry(x + 40, y + int(ih * 0.47), iw - 80, self.dossier_max_lines)
+        console.sync_lines(self.dossier_lines)
 
-    def _get_visible_dossier_lines(self):
+        # Scroll: la consola recompone desde la primera línea visible
         total = len(self.dossier_lines)
-        if total == 0:
-            return []
-
-        max_visible = self.dossier_max_lines
-        if max_visible <= 0:
-            return list(self.dossier_lines)
-
-        max_offset = max(0, total - max_visible)
+        max_offset = max(0, total - self.dossier_max_lines)
         offset = min(self.dossier_scroll_offset, max_offset)
+        if offset == 0:
+            console.scroll_to_line(None)
+        else:
+            console.scroll_to_line(total - self.dossier_max_lines - offset)
 
-        start = max(0, total - max_visible - offset)
-        end = max(0, total - offset)
-        return self.dossier_lines[start:end]
+        console.set_input(f"{self.dossier_prompt}{self.dossier_current_input}")
+        console.set_cursor_visible(self.dossier_cursor_visible)
 
     # ---------------- DIBUJO ----------------
 
-    def _draw_glow_label(self, label):
-        if not label:
+    def _draw_run(self, renderer, key, run, color=None):
+        """Texto vía renderer con el alpha del boot (el glow lo pone renderer.glow)."""
+        if not run:
             return
-        base_color = label.color
-        r, g, b, _ = base_color
-        a = int(self.text_alpha) if self.text_alpha is not None else base_color[3]
-        base_color = (r, g, b, a)
-
-        ox, oy = label.x, label.y
-        glow_color = (r, g, b, int(a * 0.35))
-
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            label.color = glow_color
-            label.x, label.y = ox + dx, oy + dy
-            label.draw()
-
-        label.color = base_color
-        label.x, label.y = ox, oy
-        label.draw()
-
-    def _draw_boot_noise(self, x, y, w, h):
-        cell_w = 16
-        cell_h = 10
-        for yy in range(y, y + h, cell_h):
-            for xx in range(x, x + w, cell_w):
-                if random.random() < 0.45:
-                    brightness = random.randint(40, 140)
-                    rect = shapes.Rectangle(
-                        xx,
-                        yy,
-                        cell_w - 1,
-                        cell_h - 1,
-                        color=(0, brightness, 0),
-                    )
-                    rect.opacity = random.randint(150, 240)
-                    rect.draw()
-
-    def _draw_scanlines(self, x, y, w, h):
-        flick = random.uniform(-1, 1)
+        r, g, b, a = color or run["color"]
+        alpha = int(self.text_alpha) if self.text_alpha is not None else a
+        renderer.text(self.draw_key(*key), **dict(run, color=(r, g, b, alpha)))
 
+    @property
+    def scanline_alpha(self):
+        # Las scanlines las dibuja Engine en el post-proceso CRT
         base_alpha = 50
         if self.boot_active:
             base_alpha = 70
         if self.case_transition_active:
             base_alpha = max(base_alpha, 65)
+        return base_alpha
 
-        color = (0, 30, 0)
-        for yy in range(y, y + h, 2):
-            line = shapes.Rectangle(x, yy + flick, w, 1, color=color)
-            line.opacity = base_alpha
-            line.draw()
-
-    def _draw_boot_noise(self, x, y, w, h):
-        noise_lines = 24
-        for i in range(noise_lines):
-            yy = random.randint(y, y + h)
-            flick = random.uniform(-2, 2)
-            line = shapes.Rectangle(x, yy + flick, w, 1, color=(0, 255, 0))
-            line.opacity = random.randint(80, 160)
-            line.draw()
+    def _draw_boot_noise(self, renderer, x, y, w, h):
+        # Líneas de ruido en una textura NumPy de 1px de ancho, un solo quad
+        renderer.effect(lambda: self.boot_noise.draw(x, y, w, h))
 
 
     # ---------------- ASCII TÍTULO: MORADO → ROJO + GOTEO ----------------
 
-    def _draw_ascii_title(self, x, y, iw, ih):
+    def _title_gradient(self, num_lines):
+        """Degradado vertical morado neón (arriba) → rojo neón (abajo)."""
+        colors = []
+        for i in range(num_lines):
+            t = 0.0 if num_lines == 1 else i / (num_lines - 1)
+            colors.append(tuple(
+                int(p * (1 - t) + r * t) for p, r in zip(TITLE_PURPLE, TITLE_RED)
+            ) + (255,))
+        return colors
+
+    def _draw_ascii_title(self, renderer, x, y, iw, ih):
         """
-        Dibuja el ASCII del título con:
-        - Degradado morado neón (arriba) → rojo neón (abajo).
-        - Micro-glitch suave en bordes.
+        Dibuja el ASCII del título (textura pre-horneada) con:
+        - Revelado por recorte sobre la textura.
+        - Micro-glitch suave en bordes (redibujos desplazados).
         - 'Goteo' sutil desde la base del ASCII.
+
+        El recorte es scissor de GL: los demás backends reciben el texto
+        revelado como un texto normal.
         """
         # Si aún no hay título preparado, no dibujar
-        if not getattr(self, "full_title", ""):
+        if not getattr(self, "full_title", "") or self.title_reveal_chars <= 0:
             return
 
         # Coordenadas base (mismas proporciones de _make_labels)
@@ -473,106 +385,65 @@ class VaticanTerminal(Scene):
         left_x = x + 80
         max_width = iw - 160
 
-        # Texto revelado hasta ahora (animación existente)
-        if self.title_reveal_chars <= 0:
-            return
-        current_text = self.full_title[: self.title_reveal_chars]
-        lines = current_text.splitlines()
-        if not lines:
-            return
-
-        num_lines = len(lines)
-        line_height = 14
-
-        purple = (200, 120, 255)
-        red = (255, 40, 40)
-
-        line_labels = []
+        screen = self.engine.screen
+        pixel_scale = screen.get_framebuffer_size()[0] / screen.width if screen.width else 1.0
+        alpha = int(self.text_alpha) if self.text_alpha is not None else 255
 
-        # Dibujar cada línea con degradado vertical morado → rojo
-        for i, line in enumerate(lines):
-            t = 0.0 if num_lines == 1 else i / (num_lines - 1)
-            r = int(purple[0] * (1 - t) + red[0] * t)
-            g = int(purple[1] * (1 - t) + red[1] * t)
-            b = int(purple[2] * (1 - t) + red[2] * t)
-
-            line_y = top_y - i * line_height
-
-            lbl = Label(
-                line,
-                x=left_x,
-                y=line_y,
-                width=max_width,
-                multiline=False,
-                font_name="Courier New",
-                font_size=10,
-                anchor_x="left",
-                anchor_y="baseline",
-                color=(r, g, b, 255),
-            )
-            self._draw_glow_label(lbl)
-            line_labels.append((line_y, lbl))
+        banner = self.title_banner
+        # Entre pasos de simulación se interpola la revelación
+        total = len(self.full_title)
+        revealed = self.title_reveal_chars
+        if revealed < total:
+            step = self.engine.sim_step * self.engine.frame_alpha
+            revealed = min(total, revealed + self.title_reveal_speed * step)
+        revealed = int(revealed)
+        renderer.effect(
+            lambda: banner.draw(left_x, top_y, revealed, alpha=alpha, pixel_scale=pixel_scale),
+            lambda fallback: fallback.text(
+                self.draw_key("title"), self.full_title[:revealed], left_x, top_y,
+                banner.font_name, banner.font_size, TITLE_PURPLE + (alpha,),
+                width=max_width, multiline=True,
+            ),
+        )
 
         # Solo activamos glitch/goteo cuando el título ya está completo
         if self.title_reveal_chars < len(self.full_title):
             return
 
-        if line_labels:
-            # Glitch suave en la línea superior
-            top_line_y, top_lbl = line_labels[0]
-            if random.random() < 0.4:
-                ghost_top = Label(
-                    top_lbl.text,
-                    x=top_lbl.x + random.choice([-1, 1]),
-                    y=top_line_y + random.choice([-1, 1]),
-                    width=max_width,
-                    multiline=False,
-                    font_name="Courier New",
-                    font_size=10,
-                    anchor_x="left",
-                    anchor_y="baseline",
-                    color=(200, 120, 255, 180),
-                )
-                self._draw_glow_label(ghost_top)
-
-            # Glitch suave en la línea inferior
-            bottom_line_y, bottom_lbl = line_labels[-1]
-            if random.random() < 0.4:
-                ghost_bottom = Label(
-                    bottom_lbl.text,
-                    x=bottom_lbl.x + random.choice([-1, 1]),
-                    y=bottom_line_y + random.choice([-1, 1]),
-                    width=max_width,
-                    multiline=False,
-                    font_name="Courier New",
-                    font_size=10,
-                    anchor_x="left",
-                    anchor_y="baseline",
-                    color=(255, 40, 40, 180),
+        num_lines = len(banner.lines)
+
+        # Glitch suave en la línea superior / inferior
+        ghosts = [
+            (index, random.choice([-1, 1]), random.choice([-1, 1]))
+            for index in (0, num_lines - 1)
+            if random.random() < 0.4
+        ]
+        def draw_ghosts():
+            for index, dx, dy in ghosts:
+                banner.draw_ghost(
+                    index, left_x, top_y, dx, dy,
+                    alpha=min(alpha, 180), pixel_scale=pixel_scale,
                 )
-                self._draw_glow_label(ghost_bottom)
+
+        if ghosts:
+            renderer.effect(draw_ghosts)
 
         # Goteo desde la base del ASCII (modo B – evidente pero elegante)
-        bottom_y = top_y - (num_lines - 1) * line_height
-        drip_count = 5
-        for _ in range(drip_count):
-            drip_x = random.randint(left_x, left_x + max_width)
-            drip_height = random.randint(8, 22)
-            drip_y = bottom_y - 4 - random.randint(0, 6)
-
-            rect = shapes.Rectangle(
-                drip_x,
-                drip_y,
-                2,  # ancho del goteo
-                drip_height,
-                color=(255, 40, 40),
+        bottom_y = banner.line_baseline(num_lines - 1, top_y)
+        for i in range(5):
+            renderer.rect(
+                self.draw_key("drip", i),
+                random.randint(left_x, left_x + max_width),
+                bottom_y - 4 - random.randint(0, 6),
+                2,
+                random.randint(8, 22),
+                (255, 40, 40),
+                opacity=random.randint(120, 200),
             )
-            rect.opacity = random.randint(120, 200)
-            rect.draw()
 
     # ---------------- OVERLAYS LATINOS DEL AUDIT DAEMON ----------------
 
-    def _draw_audit_daemon_overlays(self, x, y, iw, ih):
+    def _draw_audit_daemon_overlays(self, renderer, x, y, iw, ih):
         """
         Mensajes latinos pequeños en márgenes izquierdo y derecho,
         simulando monitoreo del Audit Daemon.
@@ -605,8 +476,8 @@ class VaticanTerminal(Scene):
             r, g, b = (200, 120, 255)
             alpha = random.randint(80, 140)
 
-            lbl = Label(
-                frag,
+            self._draw_run(renderer, ("audit", i), dict(
+                text=frag,
                 x=fx,
                 y=fy,
                 font_name=self.font_name,
@@ -614,177 +485,107 @@ class VaticanTerminal(Scene):
                 anchor_x="left",
                 anchor_y="baseline",
                 color=(r, g, b, alpha),
-            )
-            self._draw_glow_label(lbl)
+            ))
 
     # ---------------- DIBUJO PRINCIPAL ----------------
 
     def on_draw(self):
-        if not self.engine or not self.engine.window:
+        if not self.engine or not self.engine.screen:
             return
-        # Asegurarnos de que los labels están actualizados
+        # Asegurarnos de que los textos están maquetados
         self._make_labels()
 
-        w = self.engine.window.width
-        h = self.engine.window.height
-        x, y, iw, ih = self._get_screen_bounds(w, h)
+        renderer = self.engine.renderer
+        x, y, iw, ih = self.crt_frame.bounds
 
-        # Fondo de la “pantalla” de la terminal
-        base = shapes.Rectangle(x, y, iw, ih, color=(5, 5, 5))
-        base.draw()
-        
-        # Bordes oscuros estilo CRT
-        opacity = 120
-        band = 20
-        for off_x, off_y, bw, bh in (
-            (x, y + ih - band, iw, band),
-            (x, y, iw, band),
-            (x, y, band, ih),
-            (x + iw - band, y, band, ih),
-        ):
-            v = shapes.Rectangle(off_x, off_y, bw, bh, color=(0, 0, 0))
-            v.opacity = opacity
-            v.draw()
+        # Fondo de la “pantalla” de la terminal + bordes oscuros estilo CRT
+        self.crt_frame.draw(renderer)
 
         # Ruido de arranque si sigue activos
         if self.boot_active and self.boot_noise_active:
-            self._draw_boot_noise(x, y, iw, ih)
-
-        # ASCII: degradado morado → rojo + goteo + micro-glitch
-        self._draw_ascii_title(x, y, iw, ih)
-
-        # *Index* en el color actual de la terminal
-        self._draw_glow_label(self.index_label)
+            self._draw_boot_noise(renderer, x, y, iw, ih)
 
-        # ---------- FASES ----------
-       
-        # SPLASH: texto ENTER + diablito
-        if self.phase == "splash":
-            if self.synopsis_label:
-                self._draw_glow_label(self.synopsis_label)
-
-        # Diablito en el centro, debajo de *Index*
-            if hasattr(self, "pet_sprite") and self.pet_sprite:
-                pet = self.pet_sprite
-
-                # Escalado más pequeño — ocupa un ~22% del ancho útil
-                max_width = iw * 0.30
-                scale = max_width / pet.image.width
-                pet.scale = scale
+        # Todo el texto va en un único pase de glow en GPU
+        with renderer.glow():
+            # ASCII: degradado morado → rojo + goteo + micro-glitch
+            self._draw_ascii_title(renderer, x, y, iw, ih)
 
-            # Posición centrada horizontalmente
-            pet.x = x + iw // 2 - pet.width // 2
+            # *Index* en el color actual de la terminal
+            self._draw_run(renderer, ("index",), self.index_run)
 
-            # Colocar un poco debajo del título *Index*
-            if self.index_label:
-                pet.y = self.index_label.y - pet.height - 25
-            else:
-                pet.y = y + ih // 2
-
-            pet.opacity = 255
-            pet.draw()
+            self._draw_phase_text(renderer, iw)
 
+        # ---------- FASES ----------
 
-        # Scanlines al final
-        self._draw_scanlines(x, y, iw, ih)
-
+        # SPLASH: diablito en el centro, debajo de *Index*
+        if self.phase == "splash":
+            # Pedirlo cada frame lo marca en uso (la LRU no lo expulsa en
+            # pantalla) y lo vuelve a cargar si se expulsó
+            self.pet = self.engine.textures.get_atlas(PET_ATLAS)
+            if not self.pet.missing:
+                self._draw_pet(renderer, x, y, iw, ih)
+
+    def _draw_pet(self, renderer, x, y, iw, ih):
+        handle = self.pet
+        # Placeholder hasta que llega el atlas
+        image = handle.animation(PET_FRAME_TIME) or handle.image
+        frame_w, frame_h = handle.frame_size if handle.ready else (image.width, image.height)
+
+        # Escalado más pequeño — ocupa un ~30% del ancho útil
+        width = iw * 0.30
+        height = handle.height * width / handle.width
+
+        # Centrado en horizontal, un poco debajo del título *Index*
+        if self.index_run:
+            pet_y = self.index_run["y"] - height - 25
+        else:
+            pet_y = y + ih // 2
+
+        # Fuera del splash el renderer la oculta y pausa su animación
+        renderer.sprite(
+            self.draw_key("pet"),
+            image,
+            x + iw // 2 - width // 2,
+            pet_y,
+            scale_x=width / frame_w,
+            scale_y=height / frame_h,
+        )
 
+    def _draw_phase_text(self, renderer, iw):
+        """Texto propio de cada fase (se llama dentro de renderer.glow)."""
+        # SPLASH: texto ENTER
         if self.phase == "splash":
-            self.synopsis_label = Label(
-                self._splash_message(),
-                x=x + 40,
-                y=y + 40,
-                width=iw - 80,
-                multiline=True,
-                font_name=self.font_name,
-                font_size=16,
-                color=COLOR_PRESETS[self.color_key],
-            )
-            return
+            self._draw_run(renderer, ("synopsis",), self.synopsis_run)
 
         # MENÚ
         if self.phase == "menu":
             # Dibujar cada entrada del menú
-            for idx_case, lbl in self.menu_labels:
+            for idx_case, run in self.menu_runs:
+                color = None
                 if idx_case == self.selected_index:
-                    # Resalte para el caso seleccionado
+                    # Resalte para el caso seleccionado (debajo del texto)
                     r, g, b, _ = COLOR_PRESETS[self.color_key]
-                    bar = shapes.Rectangle(
-                        lbl.x - 10,
-                        lbl.y - 4,
+                    renderer.rect(
+                        self.draw_key("menu_bar"),
+                        run["x"] - 10,
+                        run["y"] - 4,
                         iw - 80,
-                        lbl.font_size + 8,
-                        color=(r, g, b),
+                        run["font_size"] + 8,
+                        (r, g, b),
+                        opacity=220,
                     )
-                    bar.opacity = 220
-                    bar.draw()
-                    lbl.color = (0, 0, 0, 255)
-                else:
-                    lbl.color = COLOR_PRESETS[self.color_key]
+                    color = (0, 0, 0, 255)
 
-                self._draw_glow_label(lbl)
+                self._draw_run(renderer, ("menu", idx_case), run, color)
 
             # Sinopsis del caso seleccionado
-            if self.synopsis_label:
-                self._draw_glow_label(self.synopsis_label)
-
+            self._draw_run(renderer, ("synopsis",), self.synopsis_run)
 
         # DOSSIER
         if self.phase == "dossier":
-            visible_lines = self._get_visible_dossier_lines()
-            cursor_char = "|" if self.dossier_cursor_visible else " "
-
-            all_lines = list(visible_lines)
-
-            # 👉 Espacio visual entre el texto y el prompt
-            all_lines.append("")  # si quieres más espacio, añade otro all_lines.append("")
-
-            all_lines.append(
-                f"{self.dossier_prompt}{self.dossier_current_input}{cursor_char}"
-            )
-            console_text = "\n".join(all_lines)
-
-            # Dibujar la línea de consola del dossier si existe
-            if self.dossier_console_label:
-                self._draw_glow_label(self.dossier_console_label)
-
-
-    def _get_visible_dossier_lines(self):
-        total = len(self.dossier_lines)
-        if total == 0:
-            return []
-
-        max_visible = self.dossier_max_lines
-        if max_visible <= 0:
-            return list(self.dossier_lines)
-
-        max_offset = max(0, total - max_visible)
-        offset = min(self.dossier_scroll_offset, max_offset)
-
-        start = max(0, total - max_visible - offset)
-        end = max(0, total - offset)
-        return self.dossier_lines[start:end]
-        # TRANSICIONES / GLITCH LABELS
-        if self.case_transition_active:
-            for lbl in self.glitch_labels:
-                lbl.draw()
-
-        # Overlays del Audit Daemon (frases latinas en los márgenes)
-        self._draw_audit_daemon_overlays(x, y, iw, ih)
-
-        # Scanlines CRT al final
-        self._draw_scanlines(x, y, iw, ih)
-
-
-        if self.overlay_opacity > 0:
-            r, g, b = self.overlay_color
-            if 0 <= r <= 1 and 0 <= g <= 1 and 0 <= b <= 1:
-                rgb = (int(r * 255), int(g * 255), int(b * 255))
-            else:
-                rgb = (int(r), int(g), int(b))
-            ov = shapes.Rectangle(x, y, iw, ih, color=rgb)
-            ov.opacity = int(max(0.0, min(1.0, self.overlay_opacity)) * 255)
-            ov.draw()
+            # Consola del dossier (el alpha del boot va en el color)
+            self.dossier_console.set_style(color=self._dossier_color())
+            self.dossier_console.draw(renderer)
 
     # ---------------- UPDATE ----------------
 
@@ -798,11 +599,12 @@ class VaticanTerminal(Scene):
         if total <= 0:
             return
         if self.title_reveal_chars < total:
-            before = self.title_reveal_chars
-            self.title_reveal_chars += int(self.title_reveal_speed * dt)
+            # Acumulado en float: a dt pequeños int(speed * dt) era 0
+            before = int(self.title_reveal_chars)
+            self.title_reveal_chars += self.title_reveal_speed * dt
             if self.title_reveal_chars > total:
                 self.title_reveal_chars = total
-            if self.title_reveal_chars != before:
+            if int(self.title_reveal_chars) != before:
                 self._labels_dirty = True
 
     def _update_boot(self, dt):
@@ -875,7 +677,7 @@ class VaticanTerminal(Scene):
         self.dossier_lines.append(line)
         self._dossier_trim_lines()
         self.dossier_scroll_offset = 0
-        self._labels_dirty = True
+        self._dossier_dirty = True
 
     def _dossier_enqueue_lines(self, new_lines):
         if not new_lines:
@@ -883,23 +685,24 @@ class VaticanTerminal(Scene):
         self.dossier_pending_lines.extend(new_lines)
         if not self.dossier_animation_scheduled:
             self.dossier_animation_scheduled = True
-            pyglet.clock.schedule_interval(self._dossier_drain_pending_lines, 0.05)
-        self._labels_dirty = True
+            self.schedule_interval(self._dossier_drain_pending_lines, 0.05)
+        self._dossier_dirty = True
 
     def _dossier_drain_pending_lines(self, dt):
         if not self.dossier_pending_lines:
             self.dossier_animation_scheduled = False
-            pyglet.clock.unschedule(self._dossier_drain_pending_lines)
+            self.unschedule(self._dossier_drain_pending_lines)
             return
         line = self.dossier_pending_lines.pop(0)
         self.dossier_lines.append(line)
         self._dossier_trim_lines()
         self.dossier_scroll_offset = 0
-        self._labels_dirty = True
+        self._dossier_dirty = True
 
     def _dossier_toggle_cursor(self, dt):
+        # Sólo cambia el atributo de la celda del cursor; el texto no se recompone
         self.dossier_cursor_visible = not self.dossier_cursor_visible
-        self._labels_dirty = True
+        self.dossier_console.set_cursor_visible(self.dossier_cursor_visible)
 
     # ---------------- INPUT ----------------
 
@@ -977,13 +780,13 @@ class VaticanTerminal(Scene):
                     max_offset = max(0, total - self.dossier_max_lines)
                     if self.dossier_scroll_offset < max_offset:
                         self.dossier_scroll_offset += 1
-                        self._labels_dirty = True
+                        self._dossier_dirty = True
                 return
 
             if symbol == key.DOWN:
                 if self.dossier_scroll_offset > 0:
                     self.dossier_scroll_offset -= 1
-                    self._labels_dirty = True
+                    self._dossier_dirty = True
                 return
 
             # ENTER
@@ -996,7 +799,7 @@ class VaticanTerminal(Scene):
             if symbol == key.BACKSPACE:
                 if self.dossier_current_input:
                     self.dossier_current_input = self.dossier_current_input[:-1]
-                    self._labels_dirty = True
+                    self._dossier_dirty = True
                 return
 
             # Caracteres permitidos (escritura normal)
@@ -1027,7 +830,7 @@ class VaticanTerminal(Scene):
 
             if ch:
                self.dossier_current_input += ch
-               self._labels_dirty = True
+               self._dossier_dirty = True
             return
 
     # ------------- TRANSICIÓN CASOS ---------------
@@ -1045,7 +848,7 @@ class VaticanTerminal(Scene):
             self.case_transition_active = False
             self.engine.go_to(target_scene)
 
-        pyglet.clock.schedule_once(finish, 0.4)
+        self.schedule_once(finish, 0.4)
 
     # ------------- ENTRAR AL DOSSIER ---------------
 
@@ -1059,7 +862,7 @@ class VaticanTerminal(Scene):
         self.overlay_opacity = 0.0
         self.text_alpha = 255
 
-        pyglet.clock.schedule_interval(self._dossier_toggle_cursor, 0.5)
+        self.schedule_interval(self._dossier_toggle_cursor, 0.5)
         # El dossier arranca en blanco por defecto
         self.color_key = "white"
         self._labels_dirty = True
@@ -1251,7 +1054,7 @@ class VaticanTerminal(Scene):
             self._dossier_enqueue_lines(block)
             self.dossier_current_input = ""
             try:
-                pyglet.clock.unschedule(self._dossier_toggle_cursor)
+                self.unschedule(self._dossier_toggle_cursor)
             except Exception:
                 pass
             self.phase = "menu"
@@ -1272,7 +1075,7 @@ class VaticanTerminal(Scene):
             def finish(_dt):
                 self.engine.go_to("case_lancaster")
 
-            pyglet.clock.schedule_once(finish, 0.4)
+            self.schedule_once(finish, 0.4)
 
         # QUIT
         elif cmd == "quit":
@@ -1,19 +1,6 @@
 from scene import Scene
-from pyglet.text import Label
-from pyglet import shapes
-import pyglet
+from crt import CRTFrame
 import random
-import os
-
-FONT_FILE = os.path.join(
-    os.path.dirname(__file__),
-    "assets",
-    "fonts",
-    "Glass_TTY_VT220.ttf"
-)
-
-FONT_NAME = "Glass TTY VT220"
-SCREEN_MARGIN = 80
 
 
 BODY_LINES = [
@@ -31,46 +18,55 @@ BODY_LINES = [
     "Issued under the authority of Pope John Paul II.",
 ]
 
+LATIN_FRAGMENTS = [
+    "Vade retro Satana",
+    "Libera nos a malo",
+    "In Nomine Patris",
+    "Exsurge Domine",
+    "Deus in adiutorium",
+]
+
+TITLE_COLOR = (255, 40, 40, 255)
+BULLET_COLOR = (255, 40, 40, 255)
+BODY_COLOR = (255, 170, 60, 255)
+LOADING_COLOR = (255, 50, 50, 255)
+FRAGMENT_RGB = (200, 120, 255)
+
 
 class VaticanWarning(Scene):
     """Cinematic CRT warning screen before Daemonum Index."""
 
+    # Shown once on the way to the terminal: unloaded on exit
+    unload_on_exit = True
+
     def __init__(self, engine):
         super().__init__(engine)
-        self.font_name = FONT_NAME
+        self.font_name = engine.fonts.face()
 
         self.elapsed_time = 0.0
         self.duration = 35.0  # seconds before auto-transition
         self.dot_timer = 0.0
         self.dot_state = 0  # 0-3 dots for LOADING...
 
-        self._dirty = True
+        # Background + bezel, cached per window size
+        self.crt_frame = CRTFrame(engine.screen, bg_color=(6, 6, 6), bezel_opacity=100)
 
-    def on_enter(self, **kwargs):
-        try:
-            pyglet.font.add_file(FONT_FILE)
-        except Exception:
-            pass
+        # Body runs (text, x, y, color), laid out once per window size;
+        # the renderer keeps the labels themselves
+        self.body_runs = []
+        self._layout_bounds = None
 
+    def on_enter(self, **kwargs):
         self.elapsed_time = 0.0
         self.dot_timer = 0.0
         self.dot_state = 0
-        self._dirty = True
-
-    # ----------------- GEOMETRÍA CRT -----------------
-
-    def _get_screen_bounds(self, w, h):
-        w2 = w - SCREEN_MARGIN * 2
-        h2 = h - SCREEN_MARGIN * 2
-        if w2 / h2 > 4 / 3:
-            ih = h2
-            iw = int(ih * 4 / 3)
-        else:
-            iw = w2
-            ih = int(w2 * 3 / 4)
-        x = (w - iw) // 2
-        y = (h - ih) // 2
-        return x, y, iw, ih
+        self._layout_bounds = None
+
+
+    def unload(self):
+        super().unload()
+        self.body_runs = []
+        self.crt_frame.delete()
 
     # ----------------- UPDATE -----------------
 
@@ -81,92 +77,23 @@ class VaticanWarning(Scene):
         if self.dot_timer >= 0.6:
             self.dot_timer = 0.0
             self.dot_state = (self.dot_state + 1) % 4
-        # no need to mark dirty; loading label is rebuilt every frame
+        # no relayout needed; each dot state is a text variant the renderer keeps
 
         if self.elapsed_time >= self.duration:
             self.engine.go_to("vatican_terminal")
             return
 
-    # ----------------- DRAW HELPERS -----------------
-
-    def _draw_glow_label(self, label, core_color, glow_color=None, glow_radius=1):
-        """Simple CRT glow: blurred copies around, then main text."""
-        if not label:
-            return
-
-        if glow_color is None:
-            r, g, b, a = core_color
-            glow_color = (r, g, b, int(a * 0.35))
-
-        ox, oy = label.x, label.y
-        label.color = glow_color
-
-        for dx, dy in ((glow_radius, 0), (-glow_radius, 0),
-                       (0, glow_radius), (0, -glow_radius)):
-            label.x, label.y = ox + dx, oy + dy
-            label.draw()
-
-        label.x, label.y = ox, oy
-        label.color = core_color
-        label.draw()
-
-    def _scanlines(self, x, y, w, h):
-        flick = random.uniform(-1, 1)
-        alpha = 55
-        color = (0, 30, 0)
-        for yy in range(y, y + h, 2):
-            line = shapes.Rectangle(x, yy + flick, w, 1, color=color)
-            line.opacity = alpha
-            line.draw()
-
-    # ----------------- DRAW -----------------
+    # ----------------- LAYOUT -----------------
 
-    def on_draw(self):
-        if not self.engine or not self.engine.window:
+    def _build_layout(self):
+        """Lays the body text out once per window size."""
+        bounds = self.crt_frame.bounds
+        if bounds == self._layout_bounds:
             return
+        self._layout_bounds = bounds
 
-        w = self.engine.window.width
-        h = self.engine.window.height
-        x, y, iw, ih = self._get_screen_bounds(w, h)
-
-        # Background CRT
-        bg = shapes.Rectangle(x, y, iw, ih, color=(6, 6, 6))
-        bg.draw()
-
-        # Bezel
-        opacity = 100
-        band = 20
-        for off_x, off_y, bw, bh in (
-            (x, y + ih - band, iw, band),
-            (x, y, iw, band),
-            (x, y, band, ih),
-            (x + iw - band, y, band, ih),
-        ):
-            v = shapes.Rectangle(off_x, off_y, bw, bh, color=(0, 0, 0))
-            v.opacity = opacity
-            v.draw()
-
-        # Flicker alpha for text
-        flicker = random.randint(-10, 10)
-        base_alpha = max(180, min(255, 255 + flicker))
-
-        # ---- Title (centered, red with glow) ----
-        title_text = "WARNING // DAEMONUM INDEX ROM"
-        title_label = Label(
-            title_text,
-            x=x + iw // 2,
-            y=y + ih - 70,
-            anchor_x="center",
-            anchor_y="center",
-            font_name=self.font_name,
-            font_size=18,
-            color=(255, 40, 40, base_alpha),
-        )
-        title_core = (255, 40, 40, base_alpha)
-        title_glow = (255, 40, 40, int(base_alpha * 0.4))
-        self._draw_glow_label(title_label, title_core, title_glow, glow_radius=2)
-
-        # ---- Body lines (amber text, red bullets) ----
+        x, y, iw, ih = bounds
+        runs = []
         line_height = 20
         current_y = y + ih - 120
         text_x = x + 40
@@ -178,97 +105,73 @@ class VaticanWarning(Scene):
 
             if line.startswith("•"):
                 # Bullet in red, text in amber
-                bullet_label = Label(
-                    "•",
-                    x=text_x,
-                    y=current_y,
-                    font_name=self.font_name,
-                    font_size=15,
-                    anchor_x="left",
-                    anchor_y="baseline",
-                    color=(255, 40, 40, base_alpha),
-                )
-                bullet_core = (255, 40, 40, base_alpha)
-                bullet_glow = (255, 40, 40, int(base_alpha * 0.5))
-                self._draw_glow_label(bullet_label, bullet_core, bullet_glow, glow_radius=1)
-
-                body_text = line[1:].lstrip()
-                body_label = Label(
-                    body_text,
-                    x=text_x + 20,
-                    y=current_y,
-                    font_name=self.font_name,
-                    font_size=15,
-                    anchor_x="left",
-                    anchor_y="baseline",
-                    color=(255, 170, 60, base_alpha),
-                )
-                body_core = (255, 170, 60, base_alpha)
-                body_glow = (255, 170, 60, int(base_alpha * 0.4))
-                self._draw_glow_label(body_label, body_core, body_glow, glow_radius=1)
+                runs.append(("•", text_x, current_y, BULLET_COLOR))
+                runs.append((line[1:].lstrip(), text_x + 20, current_y, BODY_COLOR))
             else:
-                body_label = Label(
-                    line,
-                    x=text_x,
-                    y=current_y,
-                    font_name=self.font_name,
-                    font_size=15,
-                    anchor_x="left",
-                    anchor_y="baseline",
-                    color=(255, 170, 60, base_alpha),
-                )
-                body_core = (255, 170, 60, base_alpha)
-                body_glow = (255, 170, 60, int(base_alpha * 0.4))
-                self._draw_glow_label(body_label, body_core, body_glow, glow_radius=1)
+                runs.append((line, text_x, current_y, BODY_COLOR))
 
             current_y -= line_height
 
-        # ---- LOADING indicator (bottom-right, red) ----
-        dots = "." * self.dot_state
-        loading_text = f"LOADING{dots}"
-        loading_label = Label(
-            loading_text,
-            x=x + iw - 180,
-            y=y + 40,
-            font_name=self.font_name,
-            font_size=14,
-            anchor_x="left",
-            anchor_y="baseline",
-            color=(255, 50, 50, base_alpha),
-        )
-        load_core = (255, 50, 50, base_alpha)
-        load_glow = (255, 50, 50, int(base_alpha * 0.4))
-        self._draw_glow_label(loading_label, load_core, load_glow, glow_radius=1)
-
-        # ---- Subtle "Audit Daemon" Latin fragments (glitch monitoring) ----
-        latin_fragments = [
-            "Vade retro Satana",
-            "Libera nos a malo",
-            "In Nomine Patris",
-            "Exsurge Domine",
-            "Deus in adiutorium",
-        ]
-        for _ in range(3):
-            frag = random.choice(latin_fragments)
-            fx = random.randint(x + iw // 2, x + iw - 40)
-            fy = random.randint(y + 60, y + ih - 100)
-            frag_alpha = random.randint(40, 90)
-            frag_label = Label(
-                frag,
-                x=fx,
-                y=fy,
+        self.body_runs = runs
+
+    # ----------------- DRAW -----------------
+
+    def on_draw(self):
+        if not self.engine or not self.engine.screen:
+            return
+
+        self._build_layout()
+        renderer = self.engine.renderer
+        x, y, iw, ih = self.crt_frame.bounds
+
+        # Background CRT + bezel
+        self.crt_frame.draw(renderer)
+
+        # Flicker alpha for text: a single opacity uniform per glow pass
+        flicker = random.randint(-10, 10)
+        base_alpha = max(180, min(255, 255 + flicker))
+        opacity = base_alpha / 255
+
+        # ---- Title (centered, red, wider GPU glow) ----
+        with renderer.glow(radius=4, opacity=opacity):
+            renderer.text(
+                self.draw_key("title"),
+                "WARNING // DAEMONUM INDEX ROM",
+                x + iw // 2,
+                y + ih - 70,
+                anchor_x="center",
+                anchor_y="center",
+                font_name=self.font_name,
+                font_size=18,
+                color=TITLE_COLOR,
+            )
+
+        # ---- Rest of the text, one shared glow pass ----
+        with renderer.glow(opacity=opacity):
+            for i, (text, tx, ty, color) in enumerate(self.body_runs):
+                renderer.text(self.draw_key("body", i), text, tx, ty,
+                              font_name=self.font_name, font_size=15, color=color)
+
+            # LOADING indicator (bottom-right, red)
+            renderer.text(
+                self.draw_key("loading"),
+                "LOADING" + "." * self.dot_state,
+                x + iw - 180,
+                y + 40,
                 font_name=self.font_name,
-                font_size=10,
-                anchor_x="left",
-                anchor_y="baseline",
-                color=(200, 120, 255, frag_alpha),
+                font_size=14,
+                color=LOADING_COLOR,
             )
-            frag_core = (200, 120, 255, frag_alpha)
-            frag_glow = (200, 120, 255, int(frag_alpha * 0.6))
-            self._draw_glow_label(frag_label, frag_core, frag_glow, glow_radius=1)
 
-        # ---- Scanlines over everything ----
-        self._scanlines(x, y, iw, ih)
+            # ---- Subtle "Audit Daemon" Latin fragments (glitch monitoring) ----
+            for i in range(3):
+                fx = random.randint(x + iw // 2, x + iw - 40)
+                fy = random.randint(y + 60, y + ih - 100)
+                # Their own faint alpha, independent of the text flicker
+                frag_alpha = min(255, random.randint(40, 90) * 255 // base_alpha)
+                renderer.text(self.draw_key("fragment", i), random.choice(LATIN_FRAGMENTS), fx, fy,
+                              font_name=self.font_name, font_size=10,
+                              color=FRAGMENT_RGB + (frag_alpha,))
 
     def on_key(self, symbol, modifiers):
         # No input on this screen; it auto-continues.